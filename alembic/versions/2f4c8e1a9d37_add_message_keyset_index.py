@@ -0,0 +1,41 @@
+"""add message keyset index
+
+Revision ID: 2f4c8e1a9d37
+Revises: 6d6d04b10243
+Create Date: 2025-06-05 11:08:17.402913
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2f4c8e1a9d37'
+down_revision: Union[str, None] = '6d6d04b10243'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Built concurrently so writes to messages are not blocked on large tables.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_messages_chat_id_timestamp_id',
+            'messages',
+            ['chat_id', 'timestamp', 'id'],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_messages_chat_id_timestamp_id',
+            table_name='messages',
+            postgresql_concurrently=True,
+        )
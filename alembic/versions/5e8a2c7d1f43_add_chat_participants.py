@@ -0,0 +1,69 @@
+"""add chat participants
+
+Revision ID: 5e8a2c7d1f43
+Revises: c41d9b7e2f60
+Create Date: 2025-06-11 10:27:44.918302
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5e8a2c7d1f43'
+down_revision: Union[str, None] = 'c41d9b7e2f60'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('chat_participants',
+    sa.Column('chat_id', sa.UUID(), nullable=False),
+    sa.Column('user_id', sa.UUID(), nullable=False),
+    sa.ForeignKeyConstraint(['chat_id'], ['chats.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('chat_id', 'user_id')
+    )
+    op.add_column('chats', sa.Column('pair_key', sa.String(), nullable=True))
+
+    # Until now a private chat's members were whoever had posted in it.
+    op.execute(
+        "INSERT INTO chat_participants (chat_id, user_id) "
+        "SELECT DISTINCT m.chat_id, m.sender_id FROM messages m "
+        "JOIN chats c ON c.id = m.chat_id WHERE c.type = 'private'"
+    )
+    # Only chats where both sides have posted identify their pair. Earlier
+    # duplicates of a pair keep no key; the most recently active chat wins.
+    op.execute(
+        """
+        UPDATE chats SET pair_key = pairs.pair_key
+        FROM (
+            SELECT DISTINCT ON (pair_key) chat_id, pair_key
+            FROM (
+                SELECT cp.chat_id,
+                       string_agg(cp.user_id::text, ':' ORDER BY cp.user_id) AS pair_key,
+                       count(*) AS participants,
+                       (SELECT max(m.timestamp) FROM messages m
+                        WHERE m.chat_id = cp.chat_id) AS last_message_at
+                FROM chat_participants cp
+                GROUP BY cp.chat_id
+            ) candidates
+            WHERE participants = 2
+            ORDER BY pair_key, last_message_at DESC NULLS LAST, chat_id
+        ) pairs
+        WHERE chats.id = pairs.chat_id
+        """
+    )
+    op.create_index('ix_chat_participants_user_id', 'chat_participants', ['user_id'], unique=False)
+    op.create_index(op.f('ix_chats_pair_key'), 'chats', ['pair_key'], unique=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_chats_pair_key'), table_name='chats')
+    op.drop_column('chats', 'pair_key')
+    op.drop_index('ix_chat_participants_user_id', table_name='chat_participants')
+    op.drop_table('chat_participants')
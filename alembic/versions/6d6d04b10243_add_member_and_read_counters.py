@@ -0,0 +1,60 @@
+"""add member and read counters
+
+Revision ID: 6d6d04b10243
+Revises: b161b2790fc2
+Create Date: 2025-06-04 16:52:41.118274
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6d6d04b10243'
+down_revision: Union[str, None] = 'b161b2790fc2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 100
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('groups', sa.Column('member_count', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('messages', sa.Column('read_count', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('messages', sa.Column('readers_needed', sa.Integer(), server_default='0', nullable=False))
+
+    op.execute(
+        "UPDATE groups g SET member_count = "
+        "(SELECT count(*) FROM group_members gm WHERE gm.group_id = g.id)"
+    )
+
+    # Counters for existing group messages are filled one batch of chats at a
+    # time; every current member except the sender is expected to read them,
+    # and only cursors of current members count towards read_count.
+    conn = op.get_bind()
+    chat_ids = conn.execute(sa.text("SELECT chat_id FROM groups ORDER BY chat_id")).scalars().all()
+    for start in range(0, len(chat_ids), BATCH_SIZE):
+        conn.execute(
+            sa.text(
+                "UPDATE messages m SET "
+                "readers_needed = GREATEST(g.member_count - 1, 0), "
+                "read_count = LEAST(GREATEST(g.member_count - 1, 0), ("
+                "  SELECT count(*) FROM chat_read_cursors c "
+                "  JOIN group_members gm ON gm.group_id = g.id AND gm.user_id = c.user_id "
+                "  WHERE c.chat_id = m.chat_id AND c.user_id <> m.sender_id "
+                "  AND (c.last_read_timestamp, c.last_read_message_id) >= (m.timestamp, m.id)"
+                ")) "
+                "FROM groups g WHERE g.chat_id = m.chat_id AND m.chat_id = ANY(:chat_ids)"
+            ),
+            {"chat_ids": chat_ids[start:start + BATCH_SIZE]},
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('messages', 'readers_needed')
+    op.drop_column('messages', 'read_count')
+    op.drop_column('groups', 'member_count')
@@ -0,0 +1,42 @@
+"""add message client_message_id
+
+Revision ID: 8b3f6d2e9a15
+Revises: 5e8a2c7d1f43
+Create Date: 2025-06-12 16:05:31.274810
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8b3f6d2e9a15'
+down_revision: Union[str, None] = '5e8a2c7d1f43'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('messages', sa.Column('client_message_id', sa.String(length=64), nullable=True))
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_messages_sender_id_client_message_id',
+            'messages',
+            ['sender_id', 'client_message_id'],
+            unique=True,
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_messages_sender_id_client_message_id',
+            table_name='messages',
+            postgresql_concurrently=True,
+        )
+    op.drop_column('messages', 'client_message_id')
@@ -0,0 +1,63 @@
+"""add missing indexes
+
+Revision ID: a7e3d5c90b12
+Revises: 2f4c8e1a9d37
+Create Date: 2025-06-06 09:41:55.213604
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7e3d5c90b12'
+down_revision: Union[str, None] = '2f4c8e1a9d37'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # group_members never had a key, so duplicate and half-empty rows have to
+    # go before (group_id, user_id) can become one.
+    op.execute("DELETE FROM group_members WHERE group_id IS NULL OR user_id IS NULL")
+    op.execute(
+        "DELETE FROM group_members a USING group_members b "
+        "WHERE a.ctid < b.ctid AND a.group_id = b.group_id AND a.user_id = b.user_id"
+    )
+    op.execute(
+        "UPDATE groups g SET member_count = "
+        "(SELECT count(*) FROM group_members gm WHERE gm.group_id = g.id)"
+    )
+    op.alter_column('group_members', 'group_id', existing_type=sa.UUID(), nullable=False)
+    op.alter_column('group_members', 'user_id', existing_type=sa.UUID(), nullable=False)
+    op.create_primary_key('group_members_pkey', 'group_members', ['group_id', 'user_id'])
+    op.create_index('ix_group_members_user_id', 'group_members', ['user_id'], unique=False)
+    op.create_index(op.f('ix_groups_chat_id'), 'groups', ['chat_id'], unique=True)
+
+    # messages is the large table; build its index without blocking writes.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_messages_sender_id_chat_id',
+            'messages',
+            ['sender_id', 'chat_id'],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_messages_sender_id_chat_id',
+            table_name='messages',
+            postgresql_concurrently=True,
+        )
+    op.drop_index(op.f('ix_groups_chat_id'), table_name='groups')
+    op.drop_index('ix_group_members_user_id', table_name='group_members')
+    op.drop_constraint('group_members_pkey', 'group_members', type_='primary')
+    op.alter_column('group_members', 'user_id', existing_type=sa.UUID(), nullable=True)
+    op.alter_column('group_members', 'group_id', existing_type=sa.UUID(), nullable=True)
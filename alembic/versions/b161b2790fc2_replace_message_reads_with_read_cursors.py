@@ -0,0 +1,88 @@
+"""replace message_reads with chat_read_cursors
+
+Revision ID: b161b2790fc2
+Revises: 9c9c9335f2ef
+Create Date: 2025-06-02 11:24:17.402815
+
+"""
+from typing import Sequence, Union
+from uuid import UUID
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b161b2790fc2'
+down_revision: Union[str, None] = '9c9c9335f2ef'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 1000
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('chat_read_cursors',
+    sa.Column('chat_id', sa.UUID(), nullable=False),
+    sa.Column('user_id', sa.UUID(), nullable=False),
+    sa.Column('last_read_message_id', sa.UUID(), nullable=False),
+    sa.Column('last_read_timestamp', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['chat_id'], ['chats.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['last_read_message_id'], ['messages.id'], ),
+    sa.PrimaryKeyConstraint('chat_id', 'user_id')
+    )
+
+    # Backfill one cursor per (chat, user) from the newest message each user
+    # has read. Batching by user bounds the sort behind each INSERT; the whole
+    # upgrade still runs in Alembic's single transaction, so message_reads is
+    # only dropped once every batch has been written.
+    conn = op.get_bind()
+    last_user_id = UUID(int=0)
+    while True:
+        user_ids = conn.execute(
+            sa.text(
+                "SELECT DISTINCT user_id FROM message_reads "
+                "WHERE user_id > :after ORDER BY user_id LIMIT :limit"
+            ),
+            {"after": last_user_id, "limit": BATCH_SIZE},
+        ).scalars().all()
+        if not user_ids:
+            break
+
+        conn.execute(
+            sa.text(
+                "INSERT INTO chat_read_cursors "
+                "(chat_id, user_id, last_read_message_id, last_read_timestamp, updated_at) "
+                "SELECT DISTINCT ON (m.chat_id, r.user_id) "
+                "m.chat_id, r.user_id, m.id, COALESCE(m.timestamp, r.timestamp), r.timestamp "
+                "FROM message_reads r JOIN messages m ON m.id = r.message_id "
+                "WHERE r.user_id = ANY(:user_ids) "
+                "ORDER BY m.chat_id, r.user_id, m.timestamp DESC NULLS LAST, m.id DESC"
+            ),
+            {"user_ids": list(user_ids)},
+        )
+        last_user_id = user_ids[-1]
+
+    op.drop_table('message_reads')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_table('message_reads',
+    sa.Column('message_id', sa.UUID(), nullable=False),
+    sa.Column('user_id', sa.UUID(), nullable=False),
+    sa.Column('timestamp', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['message_id'], ['messages.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('message_id', 'user_id')
+    )
+    op.execute(
+        "INSERT INTO message_reads (message_id, user_id, timestamp) "
+        "SELECT m.id, c.user_id, c.updated_at "
+        "FROM chat_read_cursors c JOIN messages m ON m.chat_id = c.chat_id "
+        "WHERE (m.timestamp, m.id) <= (c.last_read_timestamp, c.last_read_message_id)"
+    )
+    op.drop_table('chat_read_cursors')
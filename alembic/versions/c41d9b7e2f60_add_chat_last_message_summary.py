@@ -0,0 +1,35 @@
+"""add chat last message summary
+
+Revision ID: c41d9b7e2f60
+Revises: a7e3d5c90b12
+Create Date: 2025-06-09 14:12:08.530417
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c41d9b7e2f60'
+down_revision: Union[str, None] = 'a7e3d5c90b12'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Existing chats are filled in by scripts/backfill_chat_summaries.py.
+    op.add_column('chats', sa.Column('last_message_id', sa.UUID(), nullable=True))
+    op.add_column('chats', sa.Column('last_message_at', sa.DateTime(), nullable=True))
+    op.add_column('chats', sa.Column('last_message_sender_id', sa.UUID(), nullable=True))
+    op.add_column('chats', sa.Column('last_message_preview', sa.String(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('chats', 'last_message_preview')
+    op.drop_column('chats', 'last_message_sender_id')
+    op.drop_column('chats', 'last_message_at')
+    op.drop_column('chats', 'last_message_id')
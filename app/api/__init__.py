@@ -1,3 +1,4 @@
 from .group_router import router as group_router
 from .message_router import router as message_router
+from .metrics_router import router as metrics_router
 from .user_router import router as user_router
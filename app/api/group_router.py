@@ -1,8 +1,10 @@
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.dependencies.auth import get_current_user
+from app.dependencies.db import get_db_async
 from app.dependencies.services import get_group_service, get_socket_event_service
 from app.models import User
 from app.schemas.base_event import WebSocketEvent
@@ -21,14 +23,12 @@ async def create_group(
     group_service: GroupService = Depends(get_group_service),
     socket_event_service: SocketEventService = Depends(get_socket_event_service),
     current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db_async),
 ):
     group = await group_service.create_group(dto.name, current_user)
-
-    for member_id in dto.member_ids:
-        if member_id != current_user.id:
-            await group_service.add_member(group.id, member_id)
-
-    member_ids = await group_service.list_members_id(group.id)
+    added = await group_service.add_members(group.id, dto.member_ids)
+    await db.commit()
+    await group_service.publish_membership_changes()
 
     event = WebSocketEvent[GroupInfoDTO](
         type=WebSocketEventType.GROUP_UPDATED,
@@ -41,7 +41,9 @@ async def create_group(
         ),
     )
 
-    await socket_event_service.send_to_users(user_ids=member_ids, event=event)
+    await socket_event_service.send_to_users(
+        user_ids=[current_user.id, *added], event=event
+    )
 
     return event
 
@@ -53,13 +55,15 @@ async def add_members(
     group_service: GroupService = Depends(get_group_service),
     socket_event_service: SocketEventService = Depends(get_socket_event_service),
     current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db_async),
 ):
     group = await group_service.get_by_id(group_id)
     if not group:
         raise HTTPException(status_code=404, detail="Group not found")
 
-    for user_id in dto.user_ids:
-        await group_service.add_member(group_id, user_id)
+    added = await group_service.add_members(group_id, dto.user_ids)
+    await db.commit()
+    await group_service.publish_membership_changes()
 
     event = WebSocketEvent[GroupInfoDTO](
         type=WebSocketEventType.GROUP_UPDATED,
@@ -72,7 +76,7 @@ async def add_members(
         ),
     )
 
-    await socket_event_service.send_to_users(user_ids=dto.user_ids, event=event)
+    await socket_event_service.send_to_users(user_ids=added, event=event)
 
     return {"detail": "Members added"}
 
@@ -84,15 +88,17 @@ async def remove_members(
     group_service: GroupService = Depends(get_group_service),
     socket_event_service: SocketEventService = Depends(get_socket_event_service),
     current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db_async),
 ):
     group = await group_service.get_by_id(group_id)
     if not group:
         raise HTTPException(status_code=404, detail="Group not found")
 
-    for user_id in dto.user_ids:
-        await group_service.remove_member(group_id, user_id)
+    await group_service.remove_members(group_id, dto.user_ids)
+    await db.commit()
+    await group_service.publish_membership_changes()
 
-    remaining_members = await group_service.list_members_id(group_id)
+    remaining_members = await group_service.get_member_ids(group.chat_id)
 
     event = WebSocketEvent[GroupInfoDTO](
         type=WebSocketEventType.GROUP_UPDATED,
@@ -105,7 +111,9 @@ async def remove_members(
         ),
     )
 
-    await socket_event_service.send_to_users(user_ids=remaining_members, event=event)
+    await socket_event_service.send_to_users(
+        user_ids=list(remaining_members), event=event
+    )
 
     return {"detail": "Members removed"}
 
@@ -1,9 +1,10 @@
 from datetime import UTC, datetime
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.pagination import decode_cursor
 from app.dependencies.auth import get_current_user
 from app.dependencies.db import get_db_async
 from app.dependencies.services import (
@@ -12,10 +13,16 @@ from app.dependencies.services import (
     get_socket_event_service,
 )
 from app.models import Message, User
+from app.repositories.read_cursor_repository import ReadPosition
 from app.repositories.user_repository import UserRepository
 from app.schemas.base_event import WebSocketEvent
-from app.schemas.message import MessageDTO, SendMessageRequest, SendMessageResponse
-from app.schemas.ws_payloads import NewMessageNotificationPayload, NewMessagePayload
+from app.schemas.message import (
+    MessageDTO,
+    SendMessageRequest,
+    SendMessageResponse,
+    UnreadCount,
+)
+from app.schemas.ws_payloads import NewMessageNotificationPayload
 from app.services.chat_service import ChatService
 from app.services.message_service import MessageService
 from app.services.socket_event_service import SocketEventService
@@ -29,6 +36,9 @@ router = APIRouter(prefix="/messages", tags=["Message"])
 )
 async def send_message(
     request: SendMessageRequest,
+    idempotency_key: str | None = Header(
+        None, alias="Idempotency-Key", min_length=1, max_length=64
+    ),
     current_user: User = Depends(get_current_user),
     message_service: MessageService = Depends(get_message_service),
     chat_service: ChatService = Depends(get_chat_service),
@@ -54,29 +64,20 @@ async def send_message(
             status_code=400, detail="chat_id or target_user_id required"
         )
 
-    message = Message(
+    new_message = Message(
         chat_id=chat.id,
         sender_id=current_user.id,
         text=request.text,
         timestamp=datetime.now(UTC),
+        client_message_id=idempotency_key or request.client_message_id,
     )
 
-    message = await message_service.create_message(message)
+    message = await message_service.create_message(new_message)
+    await db.commit()
+    if message is not new_message:
+        return SendMessageResponse(message_id=message.id, chat_id=message.chat_id)
 
-    await socket_service.send_chat_event_except_sender(
-        chat_id=chat.id,
-        sender_id=current_user.id,
-        event=WebSocketEvent[NewMessagePayload](
-            type=WebSocketEventType.NEW_MESSAGE,
-            data=NewMessagePayload(
-                message_id=str(message.id),
-                chat_id=str(chat.id),
-                sender_id=str(current_user.id),
-                text=message.text,
-                timestamp=message.timestamp,
-            ),
-        ),
-    )
+    await message_service.publish_new_message(message, current_user.name)
 
     if target_user:
         await socket_service.send_notification(
@@ -84,7 +85,7 @@ async def send_message(
             event=WebSocketEvent[NewMessageNotificationPayload](
                 type=WebSocketEventType.NEW_MESSAGE,
                 data=NewMessageNotificationPayload(
-                    chat_id=str(chat.id),
+                    chat_id=chat.id,
                     sender_name=current_user.name,
                     text=message.text,
                 ),
@@ -99,10 +100,22 @@ async def get_chat_messages(
     chat_id: UUID,
     offset: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
+    before: str | None = Query(None),
+    after: str | None = Query(None),
     current_user: User = Depends(get_current_user),
     message_service: MessageService = Depends(get_message_service),
     chat_service: ChatService = Depends(get_chat_service),
 ):
+    if offset and (before or after):
+        raise HTTPException(
+            status_code=400, detail="offset cannot be combined with a cursor"
+        )
+    try:
+        before_position = ReadPosition(*decode_cursor(before)) if before else None
+        after_position = ReadPosition(*decode_cursor(after)) if after else None
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
     chat = await chat_service.get_by_id(chat_id)
     if not chat:
         raise HTTPException(status_code=404, detail="Chat not found")
@@ -111,5 +124,44 @@ async def get_chat_messages(
     if not has_access:
         raise HTTPException(status_code=403, detail="Access denied")
 
-    messages = await message_service.get_chat_messages(chat_id, offset, limit)
+    messages = await message_service.get_chat_messages(
+        chat_id, offset, limit, before_position, after_position
+    )
     return messages
+
+
+@router.get("/by-chat/{chat_id}/recent", response_model=list[MessageDTO])
+async def get_recent_chat_messages(
+    chat_id: UUID,
+    limit: int = Query(20, ge=1, le=100),
+    current_user: User = Depends(get_current_user),
+    message_service: MessageService = Depends(get_message_service),
+    chat_service: ChatService = Depends(get_chat_service),
+):
+    chat = await chat_service.get_by_id(chat_id)
+    if not chat:
+        raise HTTPException(status_code=404, detail="Chat not found")
+
+    has_access = await chat_service.has_access_to_chat(chat, current_user.id)
+    if not has_access:
+        raise HTTPException(status_code=403, detail="Access denied")
+
+    return await message_service.get_recent_messages(chat_id, limit)
+
+
+@router.get("/by-chat/{chat_id}/unread", response_model=UnreadCount)
+async def get_unread_count(
+    chat_id: UUID,
+    current_user: User = Depends(get_current_user),
+    message_service: MessageService = Depends(get_message_service),
+    chat_service: ChatService = Depends(get_chat_service),
+):
+    chat = await chat_service.get_by_id(chat_id)
+    if not chat:
+        raise HTTPException(status_code=404, detail="Chat not found")
+
+    has_access = await chat_service.has_access_to_chat(chat, current_user.id)
+    if not has_access:
+        raise HTTPException(status_code=403, detail="Access denied")
+
+    return await message_service.get_unread_count(chat_id, current_user.id)
@@ -0,0 +1,65 @@
+from fastapi import APIRouter, Depends
+
+from app.dependencies.services import (
+    get_auth_cache,
+    get_membership_cache,
+    get_password_hasher,
+    get_recent_messages_cache,
+    get_recent_sends_cache,
+)
+from app.dependencies.websockets import (
+    get_chat_manager,
+    get_event_pipeline,
+    get_heartbeat_reaper,
+    get_notification_manager,
+    get_presence_tracker,
+)
+from app.infrastructure.password_hasher import PasswordHasher
+from app.services.auth_cache import AuthCache
+from app.services.membership_cache import MembershipCache
+from app.services.recent_messages_cache import RecentMessagesCache
+from app.services.recent_sends_cache import RecentSendsCache
+from app.ws.event_pipeline import EventPipeline
+from app.ws.heartbeat import HeartbeatReaper
+from app.ws.managers.chat_manager import ChatManager
+from app.ws.managers.notification_manager import NotificationManager
+from app.ws.presence import PresenceTracker
+
+router = APIRouter(prefix="/metrics", tags=["Metrics"])
+
+
+@router.get("/ws")
+async def websocket_metrics(
+    chat_manager: ChatManager = Depends(get_chat_manager),
+    notification_manager: NotificationManager = Depends(get_notification_manager),
+    reaper: HeartbeatReaper = Depends(get_heartbeat_reaper),
+    pipeline: EventPipeline = Depends(get_event_pipeline),
+    presence: PresenceTracker = Depends(get_presence_tracker),
+):
+    return {
+        "chat": chat_manager.stats(),
+        "notifications": notification_manager.stats(),
+        "heartbeat": reaper.stats(),
+        "events": pipeline.stats(),
+        "presence": presence.stats(),
+    }
+
+
+@router.get("/cache")
+async def cache_metrics(
+    recent_messages: RecentMessagesCache = Depends(get_recent_messages_cache),
+    recent_sends: RecentSendsCache = Depends(get_recent_sends_cache),
+    membership: MembershipCache = Depends(get_membership_cache),
+    auth_cache: AuthCache = Depends(get_auth_cache),
+):
+    return {
+        "recent_messages": recent_messages.stats(),
+        "recent_sends": recent_sends.stats(),
+        "membership": membership.stats(),
+        "auth": auth_cache.stats(),
+    }
+
+
+@router.get("/auth")
+async def auth_metrics(hasher: PasswordHasher = Depends(get_password_hasher)):
+    return {"password_hasher": hasher.stats()}
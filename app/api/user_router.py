@@ -1,17 +1,39 @@
 from fastapi import APIRouter, Depends, HTTPException
-from starlette.status import HTTP_400_BAD_REQUEST, HTTP_401_UNAUTHORIZED
+from starlette.status import (
+    HTTP_400_BAD_REQUEST,
+    HTTP_401_UNAUTHORIZED,
+    HTTP_503_SERVICE_UNAVAILABLE,
+)
 
 from app.dependencies.auth import get_current_user
-from app.dependencies.db import get_db_async
 from app.dependencies.jwt import get_jwt_service
 from app.dependencies.services import get_user_service
+from app.dependencies.websockets import get_presence_tracker
 from app.infrastructure.jwt_service import JWTService, UserTokenPayload
+from app.infrastructure.password_hasher import PasswordHasherBusy
 from app.schemas.auth import LoginRequest, TokenResponse
-from app.schemas.user import UserCreate, UserRead
+from app.schemas.user import (
+    PresenceQuery,
+    UserCreate,
+    UserPresence,
+    UserRead,
+    UserUpdate,
+)
 from app.services.user_service import UserService
+from app.ws.presence import PresenceTracker
 
 router = APIRouter(prefix="/users", tags=["users"])
 
+HASHER_RETRY_AFTER = "1"
+
+
+def hasher_busy() -> HTTPException:
+    return HTTPException(
+        status_code=HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Too many login attempts, try again later",
+        headers={"Retry-After": HASHER_RETRY_AFTER},
+    )
+
 
 @router.post("/register", response_model=TokenResponse)
 async def register_user(
@@ -23,6 +45,8 @@ async def register_user(
         created_user = await user_service.register(user)
     except ValueError as e:
         raise HTTPException(status_code=HTTP_400_BAD_REQUEST, detail=str(e))
+    except PasswordHasherBusy:
+        raise hasher_busy()
 
     payload = UserTokenPayload(sub=str(created_user.id), name=created_user.name)
     token = jwt_service.create_token(payload)
@@ -32,11 +56,13 @@ async def register_user(
 @router.post("/login", response_model=TokenResponse)
 async def login_user(
     data: LoginRequest,
-    db=Depends(get_db_async),
     jwt_service: JWTService = Depends(get_jwt_service),
+    user_service: UserService = Depends(get_user_service),
 ):
-    service = UserService(db)
-    user = await service.authenticate(email=data.email, password=data.password)
+    try:
+        user = await user_service.authenticate(email=data.email, password=data.password)
+    except PasswordHasherBusy:
+        raise hasher_busy()
     if not user:
         raise HTTPException(
             status_code=HTTP_401_UNAUTHORIZED, detail="Invalid credentials"
@@ -50,3 +76,28 @@ async def login_user(
 @router.get("/me", response_model=UserRead)
 async def read_current_user(current_user=Depends(get_current_user)):
     return current_user
+
+
+@router.patch("/me", response_model=UserRead)
+async def update_current_user(
+    data: UserUpdate,
+    current_user=Depends(get_current_user),
+    user_service: UserService = Depends(get_user_service),
+):
+    try:
+        if data.password is not None:
+            await user_service.update_password(current_user.id, data.password)
+    except PasswordHasherBusy:
+        raise hasher_busy()
+    if data.name is not None:
+        await user_service.update_name(current_user.id, data.name)
+    return await user_service.get_by_id(current_user.id)
+
+
+@router.post("/presence", response_model=list[UserPresence])
+async def get_presence(
+    query: PresenceQuery,
+    current_user=Depends(get_current_user),
+    presence: PresenceTracker = Depends(get_presence_tracker),
+):
+    return presence.lookup(str(user_id) for user_id in query.user_ids)
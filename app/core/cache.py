@@ -0,0 +1,219 @@
+import sys
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Callable, Generic, Hashable, Iterable, TypeVar
+from uuid import UUID
+
+if TYPE_CHECKING:
+    from app.ws.backplane import Backplane
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+FILL_GUARDS = 256
+
+
+class LRUCache(Generic[K, V]):
+    def __init__(
+        self,
+        max_bytes: int,
+        size_of: Callable[[V], int] = sys.getsizeof,
+        ttl: float | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_bytes = max_bytes
+        self.size_of = size_of
+        self.ttl = ttl
+        self.clock = clock
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: OrderedDict[K, tuple[V, int, float | None]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: K) -> bool:
+        return self._live(key) is not None
+
+    def get(self, key: K) -> V | None:
+        entry = self._live(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return entry[0]
+
+    def peek(self, key: K) -> V | None:
+        entry = self._live(key)
+        return entry[0] if entry else None
+
+    def set(self, key: K, value: V) -> None:
+        expires_at = None if self.ttl is None else self.clock() + self.ttl
+        self._store(key, value, expires_at)
+
+    def replace(self, key: K, value: V) -> None:
+        # Updating a cached value does not make the rest of it any fresher.
+        entry = self._live(key)
+        if entry is not None:
+            self._store(key, value, entry[2])
+
+    def pop(self, key: K) -> V | None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return None
+        self.bytes -= entry[1]
+        return entry[0]
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.bytes = 0
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self.bytes,
+            "max_bytes": self.max_bytes,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+    def _live(self, key: K) -> tuple[V, int, float | None] | None:
+        entry = self._entries.get(key)
+        if entry is not None and entry[2] is not None and entry[2] <= self.clock():
+            self.pop(key)
+            return None
+        return entry
+
+    def _store(self, key: K, value: V, expires_at: float | None) -> None:
+        self.pop(key)
+        size = self.size_of(value)
+        if size > self.max_bytes:
+            return
+        self._entries[key] = (value, size, expires_at)
+        self.bytes += size
+        while self.bytes > self.max_bytes:
+            _, (_, evicted, _) = self._entries.popitem(last=False)
+            self.bytes -= evicted
+            self.evictions += 1
+
+
+class TTLCache(Generic[K, V]):
+    def __init__(
+        self,
+        ttl: float,
+        max_entries: int,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: OrderedDict[K, tuple[V, float]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: K) -> V | None:
+        self._expire()
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry[0]
+
+    def set(self, key: K, value: V) -> None:
+        self._entries.pop(key, None)
+        self._entries[key] = (value, self.clock() + self.ttl)
+        self._expire()
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def pop(self, key: K) -> V | None:
+        entry = self._entries.pop(key, None)
+        return entry[0] if entry else None
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        self._expire()
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+    def _expire(self) -> None:
+        # Every entry lives for the same ttl, so the oldest ones expire first.
+        now = self.clock()
+        while self._entries:
+            key, (_, expires_at) = next(iter(self._entries.items()))
+            if expires_at > now:
+                break
+            del self._entries[key]
+
+
+class FillGuards:
+    # Counts writes per bucket of keys, so a value loaded while a write to the
+    # same key was committed can be told apart and not cached.
+    def __init__(self, size: int = FILL_GUARDS):
+        self._writes = [0] * size
+
+    def token(self, key: Hashable) -> int:
+        return self._writes[self._bucket(key)]
+
+    def is_current(self, key: Hashable, token: int) -> bool:
+        return self._writes[self._bucket(key)] == token
+
+    def touch(self, key: Hashable) -> None:
+        self._writes[self._bucket(key)] += 1
+
+    def _bucket(self, key: Hashable) -> int:
+        return hash(key) % len(self._writes)
+
+
+class InvalidatedCache(ABC):
+    # Base for per-worker caches whose entries are dropped on every worker
+    # through the backplane once the data behind them has changed.
+    topic: str
+
+    def __init__(self, backplane: "Backplane | None" = None):
+        self.backplane = backplane
+        self.guards = FillGuards()
+
+    def subscribe_to(self, backplane: "Backplane") -> None:
+        backplane.subscribe(self.topic, self._on_invalidate)
+
+    async def invalidate(self, keys: Iterable[UUID]) -> None:
+        for key in keys:
+            if self.backplane is not None:
+                await self.backplane.publish(self.topic, {"key": key})
+            else:
+                self.apply(key)
+
+    def apply(self, key: UUID) -> None:
+        self.guards.touch(key)
+        self._drop(key)
+
+    @abstractmethod
+    def _drop(self, key: UUID) -> None: ...
+
+    async def _on_invalidate(self, message: dict) -> None:
+        self.apply(UUID(str(message["key"])))
@@ -0,0 +1,19 @@
+import os
+from typing import Iterable, Iterator, TypeVar
+
+T = TypeVar("T")
+
+# Keeps multi-row statements well under the bind parameter limits.
+DEFAULT_CHUNK_SIZE = int(os.getenv("DB_BULK_CHUNK_SIZE", "1000"))
+
+
+def chunked(items: Iterable[T], size: int | None = None) -> Iterator[list[T]]:
+    size = size or DEFAULT_CHUNK_SIZE
+    chunk: list[T] = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
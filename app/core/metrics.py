@@ -0,0 +1,22 @@
+from collections import deque
+
+
+class LatencyStats:
+    def __init__(self, window: int = 1024):
+        self.count = 0
+        self._samples: deque[float] = deque(maxlen=window)
+
+    def record(self, seconds: float) -> None:
+        self.count += 1
+        self._samples.append(seconds)
+
+    def snapshot(self) -> dict:
+        samples = sorted(self._samples)
+        if not samples:
+            return {"count": self.count, "p50_ms": 0.0, "p99_ms": 0.0, "max_ms": 0.0}
+        return {
+            "count": self.count,
+            "p50_ms": round(samples[len(samples) // 2] * 1000, 3),
+            "p99_ms": round(samples[int(len(samples) * 0.99)] * 1000, 3),
+            "max_ms": round(samples[-1] * 1000, 3),
+        }
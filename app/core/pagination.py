@@ -0,0 +1,25 @@
+import base64
+import binascii
+import struct
+from datetime import UTC, datetime
+from uuid import UUID
+
+EPOCH = datetime(1970, 1, 1)
+_CURSOR = struct.Struct(">q16s")
+
+
+def encode_cursor(timestamp: datetime, item_id: UUID) -> str:
+    if timestamp.tzinfo is not None:
+        timestamp = timestamp.astimezone(UTC).replace(tzinfo=None)
+    micros = (timestamp - EPOCH) // EPOCH.resolution
+    raw = _CURSOR.pack(micros, item_id.bytes)
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, UUID]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        micros, item_id = _CURSOR.unpack(raw)
+        return EPOCH + micros * EPOCH.resolution, UUID(bytes=item_id)
+    except (binascii.Error, struct.error, OverflowError) as e:
+        raise ValueError("Invalid cursor") from e
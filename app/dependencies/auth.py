@@ -1,10 +1,15 @@
+from uuid import UUID
+
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 
 from app.dependencies.db import get_db_async
+from app.dependencies.jwt import get_jwt_service
+from app.dependencies.services import get_auth_cache
 from app.infrastructure.jwt_service import JWTService
 from app.models import User
 from app.repositories.user_repository import UserRepository
+from app.services.auth_cache import AuthCache
 
 oauth2_scheme = HTTPBearer()
 
@@ -12,17 +17,19 @@ oauth2_scheme = HTTPBearer()
 async def get_current_user(
     token: HTTPAuthorizationCredentials = Depends(oauth2_scheme),
     db=Depends(get_db_async),
+    jwt_service: JWTService = Depends(get_jwt_service),
+    auth_cache: AuthCache = Depends(get_auth_cache),
 ) -> User:
-    jwt_service: JWTService = JWTService()
     try:
-        payload = jwt_service.verify_token(token.credentials)
+        payload = auth_cache.verify(token.credentials, jwt_service.verify_token)
+        user_id = UUID(payload.sub)
     except ValueError:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token"
         )
 
     user_repo = UserRepository(db)
-    user = await user_repo.get_by_id(payload.sub)
+    user = await auth_cache.user(user_id, user_repo.get_by_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
 
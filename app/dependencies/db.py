@@ -1,11 +1,13 @@
-from typing import AsyncGenerator
+from contextlib import asynccontextmanager
+from typing import AsyncGenerator, AsyncIterator
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db.session import async_session
 
 
-async def get_db_async() -> AsyncGenerator[AsyncSession, None]:
+@asynccontextmanager
+async def db_session_scope() -> AsyncIterator[AsyncSession]:
     async with async_session() as session:
         try:
             yield session
@@ -13,3 +15,8 @@ async def get_db_async() -> AsyncGenerator[AsyncSession, None]:
         except:
             await session.rollback()
             raise
+
+
+async def get_db_async() -> AsyncGenerator[AsyncSession, None]:
+    async with db_session_scope() as session:
+        yield session
@@ -1,37 +1,87 @@
+from functools import lru_cache
+
 from fastapi import Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.dependencies.db import get_db_async
-from app.dependencies.websockets import get_chat_manager, get_notification_manager
+from app.dependencies.websockets import (
+    get_backplane,
+    get_chat_manager,
+    get_notification_manager,
+)
+from app.infrastructure.password_hasher import PasswordHasher
+from app.services.auth_cache import AuthCache
 from app.services.chat_service import ChatService
 from app.services.group_service import GroupService
+from app.services.membership_cache import MembershipCache
 from app.services.message_service import MessageService
+from app.services.recent_messages_cache import RecentMessagesCache
+from app.services.recent_sends_cache import RecentSendsCache
 from app.services.socket_event_service import SocketEventService
 from app.services.user_service import UserService
 
 
-def get_chat_service(db: AsyncSession = Depends(get_db_async)) -> ChatService:
-    return ChatService(db)
+@lru_cache
+def get_membership_cache() -> MembershipCache:
+    return MembershipCache(backplane=get_backplane())
 
 
-def get_group_service(db: AsyncSession = Depends(get_db_async)) -> GroupService:
-    return GroupService(db)
+def get_chat_service(
+    db: AsyncSession = Depends(get_db_async),
+    membership: MembershipCache = Depends(get_membership_cache),
+) -> ChatService:
+    return ChatService(db, membership)
 
 
 def get_socket_event_service() -> SocketEventService:
     return SocketEventService(
         chat_manager=get_chat_manager(),
         notification_manager=get_notification_manager(),
+        backplane=get_backplane(),
     )
 
 
+def get_group_service(
+    db: AsyncSession = Depends(get_db_async),
+    membership: MembershipCache = Depends(get_membership_cache),
+    socket_service: SocketEventService = Depends(get_socket_event_service),
+) -> GroupService:
+    return GroupService(db, membership, socket_service)
+
+
+@lru_cache
+def get_recent_messages_cache() -> RecentMessagesCache:
+    return RecentMessagesCache(backplane=get_backplane())
+
+
+@lru_cache
+def get_recent_sends_cache() -> RecentSendsCache:
+    return RecentSendsCache()
+
+
 def get_message_service(
     db: AsyncSession = Depends(get_db_async),
     group_service: GroupService = Depends(get_group_service),
     socket_service: SocketEventService = Depends(get_socket_event_service),
+    cache: RecentMessagesCache = Depends(get_recent_messages_cache),
+    sends: RecentSendsCache = Depends(get_recent_sends_cache),
 ) -> MessageService:
-    return MessageService(db, group_service, socket_service)
+    return MessageService(db, group_service, socket_service, cache, sends)
+
+
+@lru_cache
+def get_auth_cache() -> AuthCache:
+    return AuthCache(backplane=get_backplane())
 
 
-def get_user_service(db: AsyncSession = Depends(get_db_async)) -> UserService:
-    return UserService(db)
+@lru_cache
+def get_password_hasher() -> PasswordHasher:
+    return PasswordHasher()
+
+
+def get_user_service(
+    db: AsyncSession = Depends(get_db_async),
+    auth_cache: AuthCache = Depends(get_auth_cache),
+    hasher: PasswordHasher = Depends(get_password_hasher),
+) -> UserService:
+    return UserService(db, hasher, auth_cache)
@@ -1,5 +1,12 @@
+import os
+from functools import lru_cache
+
+from app.ws.backplane import Backplane, create_backplane
+from app.ws.event_pipeline import EventPipeline
+from app.ws.heartbeat import HeartbeatReaper
 from app.ws.managers.chat_manager import ChatManager
 from app.ws.managers.notification_manager import NotificationManager
+from app.ws.presence import PresenceTracker
 
 
 def get_chat_manager() -> ChatManager:
@@ -8,3 +15,23 @@ def get_chat_manager() -> ChatManager:
 
 def get_notification_manager() -> NotificationManager:
     return NotificationManager()
+
+
+@lru_cache
+def get_backplane() -> Backplane:
+    return create_backplane(os.getenv("WS_BACKPLANE", "local"))
+
+
+@lru_cache
+def get_heartbeat_reaper() -> HeartbeatReaper:
+    return HeartbeatReaper([get_chat_manager(), get_notification_manager()])
+
+
+@lru_cache
+def get_event_pipeline() -> EventPipeline:
+    return EventPipeline()
+
+
+@lru_cache
+def get_presence_tracker() -> PresenceTracker:
+    return PresenceTracker(get_notification_manager(), backplane=get_backplane())
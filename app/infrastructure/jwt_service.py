@@ -8,6 +8,7 @@ from pydantic import BaseModel
 class UserTokenPayload(BaseModel):
     sub: str
     name: str
+    exp: int | None = None
 
 
 class JWTService:
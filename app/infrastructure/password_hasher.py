@@ -0,0 +1,81 @@
+import asyncio
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, TypeVar
+
+from passlib.context import CryptContext
+
+from app.core.metrics import LatencyStats
+
+DEFAULT_PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", "4"))
+DEFAULT_PASSWORD_HASH_QUEUE_LIMIT = int(os.getenv("PASSWORD_HASH_QUEUE_LIMIT", "64"))
+
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+T = TypeVar("T")
+
+
+class PasswordHasherBusy(Exception):
+    pass
+
+
+class PasswordHasher:
+    def __init__(
+        self,
+        workers: int = DEFAULT_PASSWORD_HASH_WORKERS,
+        queue_limit: int = DEFAULT_PASSWORD_HASH_QUEUE_LIMIT,
+    ):
+        self.workers = workers
+        self.queue_limit = queue_limit
+        self.pending = 0
+        self.rejected = 0
+        self.wait_latency = LatencyStats()
+        self.hash_latency = LatencyStats()
+        # bcrypt releases the GIL, so threads hash in parallel without
+        # blocking the event loop.
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="password-hash"
+        )
+
+    async def hash(self, password: str) -> str:
+        return await self._run(pwd_context.hash, password)
+
+    async def verify(self, plain: str, hashed: str) -> bool:
+        return await self._run(pwd_context.verify, plain, hashed)
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.workers,
+            "queue_limit": self.queue_limit,
+            "pending": self.pending,
+            "rejected": self.rejected,
+            "wait_latency": self.wait_latency.snapshot(),
+            "hash_latency": self.hash_latency.snapshot(),
+        }
+
+    async def _run(self, func: Callable[..., T], *args) -> T:
+        if self.pending >= self.workers + self.queue_limit:
+            self.rejected += 1
+            raise PasswordHasherBusy("Password hashing queue is full")
+
+        def timed() -> tuple[T, float, float]:
+            started = time.monotonic()
+            return func(*args), started, time.monotonic()
+
+        self.pending += 1
+        submitted = time.monotonic()
+        try:
+            (
+                result,
+                started,
+                finished,
+            ) = await asyncio.get_running_loop().run_in_executor(self._executor, timed)
+        finally:
+            self.pending -= 1
+        self.wait_latency.record(started - submitted)
+        self.hash_latency.record(finished - started)
+        return result
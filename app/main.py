@@ -1,19 +1,61 @@
 import logging.config
+from contextlib import asynccontextmanager
 
 from fastapi import FastAPI, HTTPException
 
-from app.api import group_router, message_router, user_router
+from app.api import group_router, message_router, metrics_router, user_router
 from app.core.error_handler import (
     ErrorLoggingMiddleware,
     http_exception_handler,
 )
 from app.core.log_config import LOGGING_CONFIG
+from app.dependencies.services import (
+    get_auth_cache,
+    get_membership_cache,
+    get_password_hasher,
+    get_recent_messages_cache,
+    get_socket_event_service,
+)
+from app.dependencies.websockets import (
+    get_backplane,
+    get_chat_manager,
+    get_event_pipeline,
+    get_heartbeat_reaper,
+    get_presence_tracker,
+)
 from app.ws.chat_ws import router as chat_ws_router
 from app.ws.notifications_ws import router as notifications_ws_router
 
 logging.config.dictConfig(LOGGING_CONFIG)
 logger = logging.getLogger("app")
-app = FastAPI()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    backplane = get_backplane()
+    get_socket_event_service().subscribe_to(backplane)
+    get_recent_messages_cache().subscribe_to(backplane)
+    get_membership_cache().subscribe_to(backplane)
+    get_auth_cache().subscribe_to(backplane)
+    presence = get_presence_tracker()
+    presence.subscribe_to(backplane)
+    presence.attach()
+    await backplane.start()
+    presence.start()
+    reaper = get_heartbeat_reaper()
+    reaper.start()
+    pipeline = get_event_pipeline()
+    pipeline.start()
+    yield
+    await pipeline.stop()
+    await reaper.stop()
+    await presence.stop()
+    await backplane.stop()
+    await get_chat_manager().stop()
+    get_password_hasher().shutdown()
+
+
+app = FastAPI(lifespan=lifespan)
 
 app.add_middleware(ErrorLoggingMiddleware)
 app.add_exception_handler(HTTPException, http_exception_handler)
@@ -21,6 +63,7 @@ app.add_exception_handler(HTTPException, http_exception_handler)
 app.include_router(user_router)
 app.include_router(message_router)
 app.include_router(group_router)
+app.include_router(metrics_router)
 app.include_router(chat_ws_router)
 app.include_router(notifications_ws_router)
 
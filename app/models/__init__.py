@@ -1,5 +1,5 @@
 from app.models.chat import Chat
+from app.models.chat_read_cursor import ChatReadCursor
 from app.models.group import Group
 from app.models.message import Message
-from app.models.message_reads import MessageRead
 from app.models.user import User
@@ -1,7 +1,7 @@
 import enum
 import uuid
 
-from sqlalchemy import Column, Enum, String
+from sqlalchemy import Column, DateTime, Enum, ForeignKey, Index, String, Table
 from sqlalchemy.dialects.postgresql import UUID
 
 from app.db.base import Base
@@ -12,9 +12,25 @@ class ChatType(str, enum.Enum):
     public = "public"
 
 
+chat_participants = Table(
+    "chat_participants",
+    Base.metadata,
+    Column("chat_id", UUID(as_uuid=True), ForeignKey("chats.id"), primary_key=True),
+    Column("user_id", UUID(as_uuid=True), ForeignKey("users.id"), primary_key=True),
+    Index("ix_chat_participants_user_id", "user_id"),
+)
+
+
 class Chat(Base):
     __tablename__ = "chats"
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     name = Column(String, nullable=False)
     type = Column(Enum(ChatType), nullable=False)
+    # Sorted "user_id:user_id" of a private chat, so each pair has one chat.
+    pair_key = Column(String, nullable=True, unique=True, index=True)
+
+    last_message_id = Column(UUID(as_uuid=True), nullable=True)
+    last_message_at = Column(DateTime, nullable=True)
+    last_message_sender_id = Column(UUID(as_uuid=True), nullable=True)
+    last_message_preview = Column(String, nullable=True)
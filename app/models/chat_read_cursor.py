@@ -0,0 +1,18 @@
+from datetime import datetime
+from uuid import UUID
+
+from sqlalchemy import ForeignKey
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class ChatReadCursor(Base):
+    __tablename__ = "chat_read_cursors"
+    chat_id: Mapped[UUID] = mapped_column(ForeignKey("chats.id"), primary_key=True)
+    user_id: Mapped[UUID] = mapped_column(ForeignKey("users.id"), primary_key=True)
+    last_read_message_id: Mapped[UUID] = mapped_column(ForeignKey("messages.id"))
+    last_read_timestamp: Mapped[datetime]
+    updated_at: Mapped[datetime] = mapped_column(
+        default=datetime.utcnow, onupdate=datetime.utcnow
+    )
@@ -1,6 +1,6 @@
 import uuid
 
-from sqlalchemy import Column, ForeignKey, String, Table
+from sqlalchemy import Column, ForeignKey, Index, Integer, String, Table
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 
@@ -9,8 +9,9 @@ from app.db.base import Base
 group_members = Table(
     "group_members",
     Base.metadata,
-    Column("group_id", UUID(as_uuid=True), ForeignKey("groups.id")),
-    Column("user_id", UUID(as_uuid=True), ForeignKey("users.id")),
+    Column("group_id", UUID(as_uuid=True), ForeignKey("groups.id"), primary_key=True),
+    Column("user_id", UUID(as_uuid=True), ForeignKey("users.id"), primary_key=True),
+    Index("ix_group_members_user_id", "user_id"),
 )
 
 
@@ -23,4 +24,11 @@ class Group(Base):
 
     owner = relationship("User", backref="owned_groups")
     members = relationship("User", secondary=group_members, backref="groups_joined")
-    chat_id = Column(UUID(as_uuid=True), ForeignKey("chats.id"), nullable=False)
+    chat_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("chats.id"),
+        nullable=False,
+        unique=True,
+        index=True,
+    )
+    member_count = Column(Integer, nullable=False, default=0, server_default="0")
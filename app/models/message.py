@@ -1,7 +1,7 @@
 import uuid
 from datetime import datetime
 
-from sqlalchemy import Boolean, Column, DateTime, ForeignKey, String
+from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Index, Integer, String
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 
@@ -10,6 +10,16 @@ from app.db.base import Base
 
 class Message(Base):
     __tablename__ = "messages"
+    __table_args__ = (
+        Index("ix_messages_chat_id_timestamp_id", "chat_id", "timestamp", "id"),
+        Index("ix_messages_sender_id_chat_id", "sender_id", "chat_id"),
+        Index(
+            "ix_messages_sender_id_client_message_id",
+            "sender_id",
+            "client_message_id",
+            unique=True,
+        ),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     chat_id = Column(UUID(as_uuid=True), ForeignKey("chats.id"), nullable=False)
@@ -17,6 +27,9 @@ class Message(Base):
     text = Column(String, nullable=False)
     timestamp = Column(DateTime, default=datetime.utcnow)
     is_readed = Column(Boolean, default=False)
+    read_count = Column(Integer, nullable=False, default=0, server_default="0")
+    readers_needed = Column(Integer, nullable=False, default=0, server_default="0")
+    client_message_id = Column(String(64), nullable=True)
 
     chat = relationship("Chat", backref="messages")
     sender = relationship("User", backref="messages_sent")
@@ -1,12 +1,21 @@
 from uuid import UUID
 
-from sqlalchemy import exists, func, select
+from sqlalchemy import exists, func, or_, select, union, update
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models.chat import Chat, ChatType
+from app.models.chat import Chat, ChatType, chat_participants
+from app.models.group import Group, group_members
 from app.models.message import Message
+from app.repositories.read_cursor_repository import ReadPosition
 from app.schemas.chat import ChatResponseDTO
 
+PREVIEW_LENGTH = 100
+
+
+def private_pair_key(user1_id: UUID, user2_id: UUID) -> str:
+    return ":".join(sorted((str(user1_id), str(user2_id))))
+
 
 class ChatRepository:
     def __init__(self, db: AsyncSession):
@@ -25,22 +34,26 @@ class ChatRepository:
         result = await self.db.execute(select(Chat).offset(offset).limit(limit))
         return result.scalars().all()
 
+    async def create_private_chat(self, chat: Chat, user_ids: set[UUID]) -> bool:
+        try:
+            async with self.db.begin_nested():
+                self.db.add(chat)
+                await self.db.flush()
+                await self.db.execute(
+                    chat_participants.insert(),
+                    [{"chat_id": chat.id, "user_id": user_id} for user_id in user_ids],
+                )
+        except IntegrityError:
+            # Someone else created the chat for this pair first.
+            return False
+        return True
+
     async def get_private_chat_between_users(
         self, user1_id: UUID, user2_id: UUID
     ) -> Chat | None:
-        stmt = (
-            select(Chat)
-            .join(Message, Message.chat_id == Chat.id)
-            .where(
-                Chat.type == ChatType.private.value,
-                Message.sender_id.in_([user1_id, user2_id]),
-            )
-            .group_by(Chat.id)
-            .having(func.count(func.distinct(Message.sender_id)) >= 1)
-            .order_by(func.count(func.distinct(Message.sender_id)).desc())
-            .limit(1)
+        result = await self.db.execute(
+            select(Chat).where(Chat.pair_key == private_pair_key(user1_id, user2_id))
         )
-        result = await self.db.execute(stmt)
         return result.scalar_one_or_none()
 
     async def get_user_private_chats(
@@ -48,9 +61,12 @@ class ChatRepository:
     ) -> list[Chat]:
         stmt = (
             select(Chat)
-            .join(Message, Message.chat_id == Chat.id)
-            .where(Chat.type == ChatType.private.value, Message.sender_id == user_id)
-            .group_by(Chat.id)
+            .join(chat_participants, chat_participants.c.chat_id == Chat.id)
+            .where(
+                chat_participants.c.user_id == user_id,
+                Chat.type == ChatType.private.value,
+            )
+            .order_by(Chat.id)
             .offset(offset)
             .limit(limit)
         )
@@ -63,25 +79,104 @@ class ChatRepository:
         result = await self.db.execute(select(Chat).where(Chat.id.in_(ids)))
         return result.scalars().all()
 
-    async def chat_to_dto(self, chat: Chat) -> ChatResponseDTO:
+    async def list_user_chats(
+        self, user_id: UUID, offset: int = 0, limit: int = 20
+    ) -> list[Chat]:
+        member_of = union(
+            select(chat_participants.c.chat_id).where(
+                chat_participants.c.user_id == user_id
+            ),
+            select(Group.chat_id)
+            .join(group_members, group_members.c.group_id == Group.id)
+            .where(group_members.c.user_id == user_id),
+        ).subquery()
+        stmt = (
+            select(Chat)
+            .join(member_of, member_of.c.chat_id == Chat.id)
+            .order_by(Chat.last_message_at.desc().nulls_last(), Chat.id.desc())
+            .offset(offset)
+            .limit(limit)
+        )
+        result = await self.db.execute(stmt)
+        return result.scalars().all()
+
+    async def record_last_message(self, message: Message) -> bool:
+        position = ReadPosition.of_message(message)
+        # Concurrent inserts may commit out of order; the summary only moves forward.
         result = await self.db.execute(
-            select(Message.timestamp)
-            .where(Message.chat_id == chat.id)
-            .order_by(Message.timestamp.desc())
-            .limit(1)
+            update(Chat)
+            .where(
+                Chat.id == message.chat_id,
+                or_(
+                    Chat.last_message_at.is_(None),
+                    position.rows_before(Chat.last_message_at, Chat.last_message_id),
+                ),
+            )
+            .values(
+                last_message_id=message.id,
+                last_message_at=position.timestamp,
+                last_message_sender_id=message.sender_id,
+                last_message_preview=message.text[:PREVIEW_LENGTH],
+            )
+            .returning(Chat)
+            .execution_options(populate_existing=True)
         )
-        last_ts = result.scalar_one_or_none()
+        return result.scalar_one_or_none() is not None
 
+    async def backfill_summaries(
+        self, after_id: UUID | None = None, limit: int = 1000
+    ) -> list[UUID]:
+        stmt = select(Chat.id).where(Chat.last_message_id.is_(None))
+        if after_id is not None:
+            stmt = stmt.where(Chat.id > after_id)
+        result = await self.db.execute(stmt.order_by(Chat.id).limit(limit))
+        chat_ids = result.scalars().all()
+        if not chat_ids:
+            return []
+
+        def latest(column):
+            return (
+                select(column)
+                .where(Message.chat_id == Chat.id)
+                .order_by(Message.timestamp.desc(), Message.id.desc())
+                .limit(1)
+                .scalar_subquery()
+            )
+
+        # Chats that got a summary from a live write in the meantime are skipped.
+        await self.db.execute(
+            update(Chat)
+            .where(Chat.id.in_(chat_ids), Chat.last_message_id.is_(None))
+            .values(
+                last_message_id=latest(Message.id),
+                last_message_at=latest(Message.timestamp),
+                last_message_sender_id=latest(Message.sender_id),
+                last_message_preview=latest(
+                    func.substr(Message.text, 1, PREVIEW_LENGTH)
+                ),
+            )
+            .execution_options(synchronize_session=False)
+        )
+        return chat_ids
+
+    @staticmethod
+    def chat_to_dto(chat: Chat) -> ChatResponseDTO:
         return ChatResponseDTO(
             id=chat.id,
             name=chat.name,
             type=chat.type.value,
-            last_message_timestamp=last_ts,
+            last_message_timestamp=chat.last_message_at,
+            last_message_id=chat.last_message_id,
+            last_message_sender_id=chat.last_message_sender_id,
+            last_message_preview=chat.last_message_preview,
         )
 
     async def is_user_in_private_chat(self, chat_id: UUID, user_id: UUID) -> bool:
         stmt = select(
-            exists().where(Message.chat_id == chat_id, Message.sender_id == user_id)
+            exists().where(
+                chat_participants.c.chat_id == chat_id,
+                chat_participants.c.user_id == user_id,
+            )
         )
         result = await self.db.execute(stmt)
         return result.scalar()
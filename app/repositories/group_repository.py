@@ -1,8 +1,10 @@
 from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import select, update
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.chunks import chunked
 from app.models.group import Group, group_members
 from app.schemas.user import UserRead
 
@@ -24,13 +26,55 @@ class GroupRepository:
         await self.db.execute(
             group_members.insert().values(group_id=group_id, user_id=user_id)
         )
+        await self._change_member_count(group_id, 1)
 
-    async def remove_member(self, group_id: UUID, user_id: UUID):
-        await self.db.execute(
+    async def remove_member(self, group_id: UUID, user_id: UUID) -> bool:
+        result = await self.db.execute(
             group_members.delete().where(
                 group_members.c.group_id == group_id, group_members.c.user_id == user_id
             )
         )
+        if not result.rowcount:
+            return False
+        await self._change_member_count(group_id, -result.rowcount)
+        return True
+
+    async def add_members(self, group_id: UUID, user_ids: list[UUID]) -> list[UUID]:
+        added = []
+        for chunk in chunked(dict.fromkeys(user_ids)):
+            result = await self.db.execute(
+                insert(group_members)
+                .values([{"group_id": group_id, "user_id": u} for u in chunk])
+                .on_conflict_do_nothing()
+                .returning(group_members.c.user_id)
+            )
+            added.extend(row[0] for row in result.all())
+        if added:
+            await self._change_member_count(group_id, len(added))
+        return added
+
+    async def remove_members(self, group_id: UUID, user_ids: list[UUID]) -> list[UUID]:
+        removed = []
+        for chunk in chunked(dict.fromkeys(user_ids)):
+            result = await self.db.execute(
+                group_members.delete()
+                .where(
+                    group_members.c.group_id == group_id,
+                    group_members.c.user_id.in_(chunk),
+                )
+                .returning(group_members.c.user_id)
+            )
+            removed.extend(row[0] for row in result.all())
+        if removed:
+            await self._change_member_count(group_id, -len(removed))
+        return removed
+
+    async def _change_member_count(self, group_id: UUID, delta: int):
+        await self.db.execute(
+            update(Group)
+            .where(Group.id == group_id)
+            .values(member_count=Group.member_count + delta)
+        )
 
     async def is_member(self, group_id: UUID, user_id: UUID) -> bool:
         result = await self.db.execute(
@@ -52,7 +96,7 @@ class GroupRepository:
         return result.all()
 
     async def list_members_id(
-        self, group_id: UUID, offset: int = 0, limit: int = 20
+        self, group_id: UUID, offset: int = 0, limit: int | None = 20
     ) -> list[UUID]:
         result = await self.db.execute(
             select(group_members.c.user_id)
@@ -74,6 +118,14 @@ class GroupRepository:
         )
         return result.scalars().all()
 
+    async def list_member_ids_by_chat(self, chat_id: UUID) -> list[UUID]:
+        result = await self.db.execute(
+            select(group_members.c.user_id)
+            .join(Group, Group.id == group_members.c.group_id)
+            .where(Group.chat_id == chat_id)
+        )
+        return [row[0] for row in result.all()]
+
     async def is_user_in_group_by_chat(self, chat_id: UUID, user_id: UUID) -> bool:
         stmt = (
             select(Group.id)
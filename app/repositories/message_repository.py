@@ -1,14 +1,16 @@
-from datetime import datetime, timedelta
 from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import case, func, or_, select, update
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import aliased
 
+from app.core.chunks import chunked
 from app.models import User
+from app.models.chat_read_cursor import ChatReadCursor
 from app.models.group import Group
 from app.models.message import Message
-from app.models.message_reads import MessageRead
+from app.repositories.read_cursor_repository import ReadPosition, ReadRange
 from app.schemas.message import MessageDTO
 
 
@@ -26,24 +28,95 @@ class MessageRepository:
         return message
 
     async def get_by_chat_id(
-        self, chat_id: UUID, offset: int = 0, limit: int = 20
+        self,
+        chat_id: UUID,
+        offset: int = 0,
+        limit: int = 20,
+        before: ReadPosition | None = None,
+        after: ReadPosition | None = None,
+    ) -> list[Message]:
+        stmt = self._page(
+            select(Message).where(Message.chat_id == chat_id),
+            offset,
+            limit,
+            before,
+            after,
+        )
+        result = await self.db.execute(stmt)
+        return self._in_order(result.scalars().all(), before, after)
+
+    async def get_latest_after(
+        self, chat_id: UUID, after: ReadPosition, limit: int
     ) -> list[Message]:
         stmt = (
             select(Message)
-            .where(Message.chat_id == chat_id)
-            .order_by(Message.timestamp)
-            .offset(offset)
+            .where(
+                Message.chat_id == chat_id,
+                after.rows_after(Message.timestamp, Message.id),
+            )
+            .order_by(Message.timestamp.desc(), Message.id.desc())
             .limit(limit)
         )
         result = await self.db.execute(stmt)
-        return result.scalars().all()
+        return list(reversed(result.scalars().all()))
 
     async def get_dtos_by_chat_id(
-        self, chat_id: UUID, offset=0, limit=20
+        self,
+        chat_id: UUID,
+        offset=0,
+        limit=20,
+        before: ReadPosition | None = None,
+        after: ReadPosition | None = None,
     ) -> list[MessageDTO]:
-        u = aliased(User)
+        stmt = self._page(self._dto_query(chat_id), offset, limit, before, after)
+
+        result = await self.db.execute(stmt)
+        rows = self._in_order(result.mappings().all(), before, after)
+
+        return [MessageDTO.model_validate(row) for row in rows]
 
+    async def get_recent_dtos(self, chat_id: UUID, limit: int) -> list[MessageDTO]:
         stmt = (
+            self._dto_query(chat_id)
+            .order_by(Message.timestamp.desc(), Message.id.desc())
+            .limit(limit)
+        )
+
+        result = await self.db.execute(stmt)
+        rows = result.mappings().all()
+
+        return [MessageDTO.model_validate(row) for row in reversed(rows)]
+
+    def _page(
+        self,
+        stmt,
+        offset: int,
+        limit: int,
+        before: ReadPosition | None,
+        after: ReadPosition | None,
+    ):
+        if before is None and after is None:
+            return (
+                stmt.order_by(Message.timestamp, Message.id).offset(offset).limit(limit)
+            )
+        if after is not None:
+            stmt = stmt.where(after.rows_after(Message.timestamp, Message.id))
+        if before is not None:
+            stmt = stmt.where(before.rows_before(Message.timestamp, Message.id))
+        if after is None:
+            # Scrolling back: the page closest to the cursor, read backwards.
+            return stmt.order_by(Message.timestamp.desc(), Message.id.desc()).limit(
+                limit
+            )
+        return stmt.order_by(Message.timestamp, Message.id).limit(limit)
+
+    def _in_order(self, rows, before: ReadPosition | None, after: ReadPosition | None):
+        return list(reversed(rows)) if before is not None and after is None else rows
+
+    def _dto_query(self, chat_id: UUID):
+        u = aliased(User)
+
+        return (
             select(
                 Message.id.label("id"),
                 Message.chat_id.label("chat_id"),
@@ -54,61 +127,136 @@ class MessageRepository:
             )
             .join(u, u.id == Message.sender_id)
             .where(Message.chat_id == chat_id)
-            .order_by(Message.timestamp)
-            .offset(offset)
-            .limit(limit)
         )
 
-        result = await self.db.execute(stmt)
-        rows = result.mappings().all()
-
-        return [MessageDTO.model_validate(row) for row in rows]
-
     async def get_by_group_id(
         self, group_id: UUID, offset: int = 0, limit: int = 20
-    ) -> list[Message]:
+    ) -> list[tuple[UUID, UUID]]:
         result = await self.db.execute(select(Group).where(Group.id == group_id))
         group = result.scalar_one_or_none()
         if not group:
             return []
         return await self.get_by_chat_id(group.chat_id, offset, limit)
 
-    async def has_user_read(self, message_id: UUID, user_id: UUID) -> bool:
+    async def add_reader(
+        self, chat_id: UUID, reader_id: UUID, read_range: ReadRange
+    ) -> list[tuple[UUID, UUID]]:
         result = await self.db.execute(
-            select(MessageRead).where(
-                MessageRead.message_id == message_id, MessageRead.user_id == user_id
+            update(Message)
+            .where(
+                Message.chat_id == chat_id,
+                Message.sender_id != reader_id,
+                Message.read_count < Message.readers_needed,
+                read_range.contains(Message.timestamp, Message.id),
+            )
+            .values(read_count=Message.read_count + 1)
+            .returning(
+                Message.id,
+                Message.sender_id,
+                Message.read_count,
+                Message.readers_needed,
             )
+            .execution_options(synchronize_session=False)
         )
-        return result.scalar_one_or_none() is not None
+        return [
+            (row.id, row.sender_id)
+            for row in result.all()
+            if row.read_count == row.readers_needed
+        ]
 
-    async def save_read_status(self, message_id: UUID, user_id: UUID):
-        self.db.add(MessageRead(message_id=message_id, user_id=user_id))
-        await self.db.commit()
-
-    async def get_readers(self, message_id: UUID) -> list[UUID]:
-        result = await self.db.execute(
-            select(MessageRead.user_id).where(MessageRead.message_id == message_id)
+    async def release_reader(
+        self, chat_id: UUID, reader_id: UUID, read_up_to: ReadPosition | None
+    ):
+        stmt = (
+            update(Message)
+            .where(
+                Message.chat_id == chat_id,
+                Message.sender_id != reader_id,
+                Message.read_count < Message.readers_needed,
+            )
+            .values(readers_needed=Message.readers_needed - 1)
+            .execution_options(synchronize_session=False)
         )
-        return [row[0] for row in result.all()]
+        if read_up_to is not None:
+            stmt = stmt.where(read_up_to.rows_after(Message.timestamp, Message.id))
+        await self.db.execute(stmt)
 
-    async def is_duplicate_message(
-        self,
-        chat_id: UUID,
-        sender_id: UUID,
-        text: str,
-        timestamp: datetime,
-        threshold_seconds: int = 2,
-    ) -> bool:
-        result = await self.db.execute(
-            select(Message)
-            .where(Message.chat_id == chat_id)
-            .where(Message.sender_id == sender_id)
-            .where(Message.text == text)
-            .where(
-                Message.timestamp.between(
-                    timestamp - timedelta(seconds=threshold_seconds),
-                    timestamp + timedelta(seconds=threshold_seconds),
+    async def release_readers(
+        self, chat_id: UUID, reader_ids: list[UUID]
+    ) -> list[tuple[UUID, UUID]]:
+        # Bulk release_reader: each message loses the readers in the chunk that
+        # did not send it and had not read it yet. Returns the messages that
+        # are now read by everyone left, like add_reader does.
+        read_by_all = []
+        for chunk in chunked(reader_ids):
+            already_read = (
+                select(func.count())
+                .select_from(ChatReadCursor)
+                .where(
+                    ChatReadCursor.chat_id == chat_id,
+                    ChatReadCursor.user_id.in_(chunk),
+                    ChatReadCursor.user_id != Message.sender_id,
+                    ChatReadCursor.last_read_timestamp >= Message.timestamp,
+                    or_(
+                        ChatReadCursor.last_read_timestamp > Message.timestamp,
+                        ChatReadCursor.last_read_message_id >= Message.id,
+                    ),
                 )
+                .scalar_subquery()
+            )
+            released = (
+                len(chunk)
+                - case((Message.sender_id.in_(chunk), 1), else_=0)
+                - already_read
+            )
+            remaining = Message.readers_needed - released
+            result = await self.db.execute(
+                update(Message)
+                .where(
+                    Message.chat_id == chat_id,
+                    Message.read_count < Message.readers_needed,
+                    released > 0,
+                )
+                .values(
+                    readers_needed=case(
+                        (remaining < Message.read_count, Message.read_count),
+                        else_=remaining,
+                    )
+                )
+                .returning(
+                    Message.id,
+                    Message.sender_id,
+                    Message.read_count,
+                    Message.readers_needed,
+                )
+                .execution_options(synchronize_session=False)
+            )
+            # A message nobody has read is not read by all, even when the last
+            # reader it was waiting for leaves.
+            read_by_all.extend(
+                (row.id, row.sender_id)
+                for row in result.all()
+                if 0 < row.read_count == row.readers_needed
+            )
+        return read_by_all
+
+    async def get_by_client_message_id(
+        self, sender_id: UUID, client_message_id: str
+    ) -> Message | None:
+        result = await self.db.execute(
+            select(Message).where(
+                Message.sender_id == sender_id,
+                Message.client_message_id == client_message_id,
             )
         )
-        return result.scalar_one_or_none() is not None
+        return result.scalar_one_or_none()
+
+    async def create_once(self, message: Message) -> bool:
+        try:
+            async with self.db.begin_nested():
+                self.db.add(message)
+                await self.db.flush()
+        except IntegrityError:
+            # The sender already used this client_message_id.
+            return False
+        return True
@@ -0,0 +1,194 @@
+from datetime import UTC, datetime
+from typing import NamedTuple
+from uuid import UUID
+
+from sqlalchemy import and_, func, or_, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.chunks import chunked
+from app.models.chat_read_cursor import ChatReadCursor
+from app.models.message import Message
+
+
+class ReadPosition(NamedTuple):
+    timestamp: datetime
+    message_id: UUID
+
+    @classmethod
+    def of_message(cls, message: Message) -> "ReadPosition":
+        timestamp = message.timestamp
+        if timestamp.tzinfo is not None:
+            timestamp = timestamp.astimezone(UTC).replace(tzinfo=None)
+        return cls(timestamp, message.id)
+
+    @classmethod
+    def of_cursor(cls, cursor: ChatReadCursor) -> "ReadPosition":
+        return cls(cursor.last_read_timestamp, cursor.last_read_message_id)
+
+    def rows_after(self, timestamp_column, id_column, inclusive: bool = False):
+        same_timestamp = (
+            id_column >= self.message_id if inclusive else id_column > self.message_id
+        )
+        # The leading range bound lets the (timestamp, id) index drive the scan.
+        return and_(
+            timestamp_column >= self.timestamp,
+            or_(timestamp_column > self.timestamp, same_timestamp),
+        )
+
+    def rows_before(self, timestamp_column, id_column, inclusive: bool = False):
+        same_timestamp = (
+            id_column <= self.message_id if inclusive else id_column < self.message_id
+        )
+        return and_(
+            timestamp_column <= self.timestamp,
+            or_(timestamp_column < self.timestamp, same_timestamp),
+        )
+
+
+class ReadRange(NamedTuple):
+    after: ReadPosition | None
+    up_to: ReadPosition
+
+    def contains(self, timestamp_column, id_column):
+        clause = self.up_to.rows_before(timestamp_column, id_column, inclusive=True)
+        if self.after is not None:
+            clause = and_(self.after.rows_after(timestamp_column, id_column), clause)
+        return clause
+
+
+class ReadCursorRepository:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get(
+        self, chat_id: UUID, user_id: UUID, for_update: bool = False
+    ) -> ChatReadCursor | None:
+        stmt = (
+            select(ChatReadCursor)
+            .where(ChatReadCursor.chat_id == chat_id, ChatReadCursor.user_id == user_id)
+            .execution_options(populate_existing=True)
+        )
+        if for_update:
+            stmt = stmt.with_for_update()
+        result = await self.db.execute(stmt)
+        return result.scalar_one_or_none()
+
+    async def advance(self, user_id: UUID, message: Message) -> ReadRange | None:
+        target = ReadPosition.of_message(message)
+        cursor = await self.get(message.chat_id, user_id, for_update=True)
+        if cursor is None:
+            if await self._create(message.chat_id, user_id, target):
+                return ReadRange(None, target)
+            # A concurrent read created the cursor first; move on from there.
+            cursor = await self.get(message.chat_id, user_id, for_update=True)
+
+        previous = ReadPosition.of_cursor(cursor)
+        if previous >= target:
+            return None
+
+        await self._move(cursor, target)
+        return ReadRange(previous, target)
+
+    async def move_to_latest(self, chat_id: UUID, user_id: UUID) -> None:
+        latest = await self._latest_message(chat_id)
+        if not latest:
+            return
+        position = ReadPosition.of_message(latest)
+        cursor = await self.get(chat_id, user_id, for_update=True)
+        if cursor is None:
+            if await self._create(chat_id, user_id, position):
+                return
+            cursor = await self.get(chat_id, user_id, for_update=True)
+        await self._move(cursor, position)
+
+    async def move_all_to_latest(self, chat_id: UUID, user_ids: list[UUID]) -> None:
+        latest = await self._latest_message(chat_id)
+        if not latest:
+            return
+        position = ReadPosition.of_message(latest)
+        now = datetime.utcnow()
+        for chunk in chunked(user_ids):
+            stmt = insert(ChatReadCursor).values(
+                [
+                    {
+                        "chat_id": chat_id,
+                        "user_id": user_id,
+                        "last_read_message_id": position.message_id,
+                        "last_read_timestamp": position.timestamp,
+                        "updated_at": now,
+                    }
+                    for user_id in chunk
+                ]
+            )
+            await self.db.execute(
+                stmt.on_conflict_do_update(
+                    index_elements=[ChatReadCursor.chat_id, ChatReadCursor.user_id],
+                    set_={
+                        "last_read_message_id": stmt.excluded.last_read_message_id,
+                        "last_read_timestamp": stmt.excluded.last_read_timestamp,
+                        "updated_at": stmt.excluded.updated_at,
+                    },
+                )
+            )
+
+    async def _latest_message(self, chat_id: UUID) -> Message | None:
+        result = await self.db.execute(
+            select(Message)
+            .where(Message.chat_id == chat_id)
+            .order_by(Message.timestamp.desc(), Message.id.desc())
+            .limit(1)
+        )
+        return result.scalar_one_or_none()
+
+    async def get_reader_ids(self, message: Message) -> list[UUID]:
+        position = ReadPosition.of_message(message)
+        result = await self.db.execute(
+            select(ChatReadCursor.user_id).where(
+                ChatReadCursor.chat_id == message.chat_id,
+                position.rows_after(
+                    ChatReadCursor.last_read_timestamp,
+                    ChatReadCursor.last_read_message_id,
+                    inclusive=True,
+                ),
+            )
+        )
+        return [row[0] for row in result.all()]
+
+    async def count_unread(self, chat_id: UUID, user_id: UUID) -> int:
+        stmt = (
+            select(func.count())
+            .select_from(Message)
+            .where(Message.chat_id == chat_id, Message.sender_id != user_id)
+        )
+        cursor = await self.get(chat_id, user_id)
+        if cursor:
+            stmt = stmt.where(
+                ReadPosition.of_cursor(cursor).rows_after(Message.timestamp, Message.id)
+            )
+        result = await self.db.execute(stmt)
+        return result.scalar_one()
+
+    async def _create(
+        self, chat_id: UUID, user_id: UUID, position: ReadPosition
+    ) -> bool:
+        result = await self.db.execute(
+            insert(ChatReadCursor)
+            .values(
+                chat_id=chat_id,
+                user_id=user_id,
+                last_read_message_id=position.message_id,
+                last_read_timestamp=position.timestamp,
+                updated_at=datetime.utcnow(),
+            )
+            .on_conflict_do_nothing(
+                index_elements=[ChatReadCursor.chat_id, ChatReadCursor.user_id]
+            )
+            .returning(ChatReadCursor.user_id)
+        )
+        return result.scalar_one_or_none() is not None
+
+    async def _move(self, cursor: ChatReadCursor, position: ReadPosition) -> None:
+        cursor.last_read_timestamp = position.timestamp
+        cursor.last_read_message_id = position.message_id
+        await self.db.flush()
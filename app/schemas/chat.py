@@ -10,6 +10,9 @@ class ChatResponseDTO(BaseModel):
     name: str
     type: Literal["private", "public"]
     last_message_timestamp: datetime | None = None
+    last_message_id: UUID | None = None
+    last_message_sender_id: UUID | None = None
+    last_message_preview: str | None = None
 
 
 class StartPrivateChatRequest(BaseModel):
@@ -2,13 +2,16 @@ from datetime import datetime
 from typing import Optional
 from uuid import UUID
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, computed_field
+
+from app.core.pagination import encode_cursor
 
 
 class SendMessageRequest(BaseModel):
     chat_id: Optional[UUID] = None
     target_user_id: Optional[UUID] = None
     text: str = Field(..., min_length=1)
+    client_message_id: Optional[str] = Field(None, min_length=1, max_length=64)
 
 
 class SendMessageResponse(BaseModel):
@@ -24,6 +27,17 @@ class MessageDTO(BaseModel):
     timestamp: datetime
     is_readed: bool
 
+    @computed_field
+    @property
+    def cursor(self) -> str:
+        return encode_cursor(self.timestamp, self.id)
+
 
 class MessageReadStatusPayload(BaseModel):
     message_id: UUID
+
+
+class UnreadCount(BaseModel):
+    chat_id: UUID
+    unread_count: int
+    last_read_message_id: Optional[UUID] = None
@@ -1,6 +1,8 @@
 import uuid
 
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, Field
+
+MAX_PRESENCE_USERS = 1000
 
 
 class UserCreate(BaseModel):
@@ -9,6 +11,11 @@ class UserCreate(BaseModel):
     password: str
 
 
+class UserUpdate(BaseModel):
+    name: str | None = None
+    password: str | None = None
+
+
 class UserRead(BaseModel):
     id: uuid.UUID
     name: str
@@ -16,3 +23,12 @@ class UserRead(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+class UserPresence(BaseModel):
+    user_id: uuid.UUID
+    online: bool
+
+
+class PresenceQuery(BaseModel):
+    user_ids: list[uuid.UUID] = Field(..., max_length=MAX_PRESENCE_USERS)
@@ -1,32 +1,69 @@
 from datetime import datetime
 from uuid import UUID
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
+
+from app.schemas.user import MAX_PRESENCE_USERS, UserPresence
 
 
 class ChatCreatedPayload(BaseModel):
-    chat_id: str
+    chat_id: UUID
     inviter_name: str
 
 
 class NewMessageNotificationPayload(BaseModel):
-    chat_id: str
+    chat_id: UUID
     sender_name: str
     text: str
 
 
 class NewMessagePayload(BaseModel):
-    message_id: str
-    chat_id: str
-    sender_id: str
+    message_id: UUID
+    chat_id: UUID
+    sender_id: UUID
     text: str
     timestamp: datetime
 
 
+class SendMessageEventPayload(BaseModel):
+    text: str = Field(..., min_length=1)
+    client_message_id: str | None = Field(None, min_length=1, max_length=64)
+
+
+class MessageAckPayload(BaseModel):
+    message_id: UUID
+    chat_id: UUID
+    timestamp: datetime
+
+
+class ErrorPayload(BaseModel):
+    detail: str
+
+
 class MessageReadRequest(BaseModel):
     message_id: UUID
 
 
 class TypingEventPayload(BaseModel):
+    chat_id: UUID | None = None
+    is_typing: bool
+
+
+class UserTypingPayload(BaseModel):
     chat_id: UUID
+    user_id: UUID
     is_typing: bool
+
+
+class ReplayTruncatedPayload(BaseModel):
+    chat_id: UUID
+    last_seen: UUID
+    first_replayed_message_id: UUID
+
+
+class PresencePayload(BaseModel):
+    users: list[UserPresence]
+
+
+class PresenceSubscribePayload(BaseModel):
+    user_ids: list[UUID] = Field(..., max_length=MAX_PRESENCE_USERS)
@@ -0,0 +1,77 @@
+import hashlib
+import os
+import time
+from typing import Awaitable, Callable
+from uuid import UUID
+
+from sqlalchemy import inspect
+from sqlalchemy.orm import make_transient_to_detached
+
+from app.core.cache import InvalidatedCache, TTLCache
+from app.infrastructure.jwt_service import UserTokenPayload
+from app.models.user import User
+from app.ws.backplane import Backplane
+
+DEFAULT_AUTH_USER_CACHE_TTL = float(os.getenv("AUTH_USER_CACHE_TTL", "60"))
+DEFAULT_AUTH_TOKEN_CACHE_TTL = float(os.getenv("AUTH_TOKEN_CACHE_TTL", "300"))
+DEFAULT_AUTH_CACHE_MAX_ENTRIES = int(os.getenv("AUTH_CACHE_MAX_ENTRIES", "50000"))
+USERS_TOPIC = "users"
+
+
+class AuthCache(InvalidatedCache):
+    topic = USERS_TOPIC
+
+    def __init__(
+        self,
+        user_ttl: float = DEFAULT_AUTH_USER_CACHE_TTL,
+        token_ttl: float = DEFAULT_AUTH_TOKEN_CACHE_TTL,
+        max_entries: int = DEFAULT_AUTH_CACHE_MAX_ENTRIES,
+        backplane: Backplane | None = None,
+        clock: Callable[[], float] = time.monotonic,
+        wall_clock: Callable[[], float] = time.time,
+    ):
+        super().__init__(backplane)
+        self.wall_clock = wall_clock
+        self.users: TTLCache[UUID, dict] = TTLCache(user_ttl, max_entries, clock)
+        self.tokens: TTLCache[bytes, UserTokenPayload] = TTLCache(
+            token_ttl, max_entries, clock
+        )
+
+    def verify(
+        self, token: str, verify: Callable[[str], UserTokenPayload]
+    ) -> UserTokenPayload:
+        key = hashlib.sha256(token.encode()).digest()
+        payload = self.tokens.get(key)
+        if payload is not None:
+            if payload.exp is None or payload.exp > self.wall_clock():
+                return payload
+            self.tokens.pop(key)
+        payload = verify(token)
+        self.tokens.set(key, payload)
+        return payload
+
+    async def user(
+        self, user_id: UUID, load: Callable[[UUID], Awaitable[User | None]]
+    ) -> User | None:
+        values = self.users.get(user_id)
+        if values is None:
+            token = self.guards.token(user_id)
+            user = await load(user_id)
+            if user is None:
+                return None
+            values = {
+                attr.key: getattr(user, attr.key) for attr in inspect(User).column_attrs
+            }
+            if self.guards.is_current(user_id, token):
+                self.users.set(user_id, values)
+        # Every request gets its own instance, detached so that adding it to a
+        # session does not try to insert it again.
+        user = User(**values)
+        make_transient_to_detached(user)
+        return user
+
+    def stats(self) -> dict:
+        return {"users": self.users.stats(), "tokens": self.tokens.stats()}
+
+    def _drop(self, user_id: UUID) -> None:
+        self.users.pop(user_id)
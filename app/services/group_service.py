@@ -7,13 +7,31 @@ from app.models.chat import ChatType
 from app.models.group import Group
 from app.repositories.chat_repository import ChatRepository
 from app.repositories.group_repository import GroupRepository
+from app.repositories.message_repository import MessageRepository
+from app.repositories.read_cursor_repository import ReadCursorRepository
+from app.schemas.base_event import WebSocketEvent
+from app.schemas.message import MessageReadStatusPayload
 from app.schemas.user import UserRead
+from app.services.membership_cache import MembershipCache
+from app.services.socket_event_service import SocketEventService
+from app.ws.enums import WebSocketEventType
 
 
 class GroupService:
-    def __init__(self, db: AsyncSession):
+    def __init__(
+        self,
+        db: AsyncSession,
+        membership: MembershipCache | None = None,
+        socket_service: SocketEventService | None = None,
+    ):
         self.repo = GroupRepository(db)
         self.chat_repo = ChatRepository(db)
+        self.message_repo = MessageRepository(db)
+        self.read_cursors = ReadCursorRepository(db)
+        self.membership = membership
+        self.socket_service = socket_service
+        self._changed_chats: set[UUID] = set()
+        self._read_by_all: list[tuple[UUID, UUID]] = []
 
     async def get_by_id(self, group_id: UUID) -> Group | None:
         return await self.repo.get_by_id(group_id)
@@ -30,9 +48,16 @@ class GroupService:
         return group
 
     async def add_member(self, group_id: UUID, user_id: UUID) -> None:
-        if await self.repo.is_member(group_id, user_id):
-            return
-        await self.repo.add_member(group_id, user_id)
+        await self.add_members(group_id, [user_id])
+
+    async def add_members(self, group_id: UUID, user_ids: list[UUID]) -> list[UUID]:
+        added = await self.repo.add_members(group_id, user_ids)
+        if added:
+            group = await self.repo.get_by_id(group_id)
+            if group:
+                self._changed_chats.add(group.chat_id)
+                await self.read_cursors.move_all_to_latest(group.chat_id, added)
+        return added
 
     async def remove_member(self, group_id: UUID, user_id: UUID) -> None:
         group = await self.repo.get_by_id(group_id)
@@ -40,7 +65,45 @@ class GroupService:
             raise ValueError("Group not found")
         if group.owner_id == user_id:
             raise ValueError("Owner cannot be removed from group")
-        await self.repo.remove_member(group_id, user_id)
+        await self._remove_members(group, [user_id])
+
+    async def remove_members(self, group_id: UUID, user_ids: list[UUID]) -> list[UUID]:
+        group = await self.repo.get_by_id(group_id)
+        if not group:
+            raise ValueError("Group not found")
+        return await self._remove_members(
+            group, [user_id for user_id in user_ids if user_id != group.owner_id]
+        )
+
+    async def _remove_members(self, group: Group, user_ids: list[UUID]) -> list[UUID]:
+        removed = await self.repo.remove_members(group.id, user_ids)
+        if removed:
+            self._changed_chats.add(group.chat_id)
+            self._read_by_all.extend(
+                await self.message_repo.release_readers(group.chat_id, removed)
+            )
+        return removed
+
+    async def publish_membership_changes(self) -> None:
+        changed, self._changed_chats = self._changed_chats, set()
+        read_by_all, self._read_by_all = self._read_by_all, []
+        if self.membership is not None and changed:
+            await self.membership.invalidate(changed)
+        if self.socket_service is None:
+            return
+        for message_id, sender_id in read_by_all:
+            await self.socket_service.send_notification(
+                user_id=sender_id,
+                event=WebSocketEvent[MessageReadStatusPayload](
+                    type=WebSocketEventType.MESSAGE_READ_BY_ALL,
+                    data=MessageReadStatusPayload(message_id=message_id),
+                ),
+            )
+
+    async def get_member_ids(self, chat_id: UUID) -> frozenset[UUID]:
+        if self.membership is None:
+            return frozenset(await self.repo.list_member_ids_by_chat(chat_id))
+        return await self.membership.members(chat_id, self.repo.list_member_ids_by_chat)
 
     async def list_members(
         self, group_id: UUID, offset: int = 0, limit: int = 20
@@ -48,7 +111,7 @@ class GroupService:
         return await self.repo.list_members(group_id, offset=offset, limit=limit)
 
     async def list_members_id(
-        self, group_id: UUID, offset: int = 0, limit: int = 20
+        self, group_id: UUID, offset: int = 0, limit: int | None = 20
     ) -> list[UUID]:
         return await self.repo.list_members_id(group_id, offset=offset, limit=limit)
 
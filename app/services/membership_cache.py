@@ -0,0 +1,54 @@
+import os
+import time
+from typing import Awaitable, Callable, Iterable
+from uuid import UUID
+
+from app.core.cache import InvalidatedCache, LRUCache
+from app.ws.backplane import Backplane
+
+DEFAULT_MEMBERSHIP_CACHE_MAX_BYTES = int(
+    os.getenv("MEMBERSHIP_CACHE_MAX_BYTES", str(32 * 1024 * 1024))
+)
+# Backstop for invalidations lost while a worker's backplane was reconnecting.
+DEFAULT_MEMBERSHIP_CACHE_TTL = float(os.getenv("MEMBERSHIP_CACHE_TTL", "300"))
+MEMBERSHIP_TOPIC = "membership"
+MEMBER_OVERHEAD = 100
+
+
+def _members_size(members: frozenset[UUID]) -> int:
+    return MEMBER_OVERHEAD * (len(members) + 1)
+
+
+class MembershipCache(InvalidatedCache):
+    topic = MEMBERSHIP_TOPIC
+
+    def __init__(
+        self,
+        max_bytes: int = DEFAULT_MEMBERSHIP_CACHE_MAX_BYTES,
+        ttl: float = DEFAULT_MEMBERSHIP_CACHE_TTL,
+        backplane: Backplane | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        super().__init__(backplane)
+        self._chats: LRUCache[UUID, frozenset[UUID]] = LRUCache(
+            max_bytes, _members_size, ttl, clock
+        )
+
+    async def members(
+        self, chat_id: UUID, load: Callable[[UUID], Awaitable[Iterable[UUID]]]
+    ) -> frozenset[UUID]:
+        members = self._chats.get(chat_id)
+        if members is not None:
+            return members
+        token = self.guards.token(chat_id)
+        members = frozenset(await load(chat_id))
+        # A membership change committed while loading may be missing from it.
+        if self.guards.is_current(chat_id, token):
+            self._chats.set(chat_id, members)
+        return members
+
+    def stats(self) -> dict:
+        return self._chats.stats()
+
+    def _drop(self, chat_id: UUID) -> None:
+        self._chats.pop(chat_id)
@@ -5,10 +5,18 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from starlette.status import HTTP_429_TOO_MANY_REQUESTS
 
 from app.models.message import Message
+from app.repositories.chat_repository import ChatRepository
 from app.repositories.message_repository import MessageRepository
+from app.repositories.read_cursor_repository import (
+    ReadCursorRepository,
+    ReadPosition,
+)
 from app.schemas.base_event import WebSocketEvent
-from app.schemas.message import MessageDTO, MessageReadStatusPayload
+from app.schemas.message import MessageDTO, MessageReadStatusPayload, UnreadCount
+from app.schemas.ws_payloads import NewMessagePayload
 from app.services.group_service import GroupService
+from app.services.recent_messages_cache import CachedChat, RecentMessagesCache
+from app.services.recent_sends_cache import RecentSendsCache
 from app.services.socket_event_service import SocketEventService
 from app.ws.enums import WebSocketEventType
 
@@ -19,62 +27,154 @@ class MessageService:
         db: AsyncSession,
         group_service: GroupService,
         socket_service: SocketEventService,
+        cache: RecentMessagesCache | None = None,
+        sends: RecentSendsCache | None = None,
     ):
         self.repo = MessageRepository(db)
+        self.chat_repo = ChatRepository(db)
+        self.read_cursors = ReadCursorRepository(db)
         self.group_service = group_service
         self.socket_service = socket_service
+        self.cache = cache
+        self.sends = sends
 
     async def get_by_id(self, message_id: UUID) -> Message | None:
         return await self.repo.get_by_id(message_id)
 
     async def create_message(self, message: Message) -> Message:
-        if await self.repo.is_duplicate_message(
-            chat_id=message.chat_id,
-            sender_id=message.sender_id,
-            text=message.text,
-            timestamp=message.timestamp,
+        # A retried send gets back the message stored by the first attempt;
+        # callers can tell by the returned object not being the one passed in.
+        original = await self._find_original(message)
+        if original is not None:
+            return original
+        if (
+            message.client_message_id is None
+            and self.sends is not None
+            and self.sends.is_duplicate_text(message)
         ):
             raise HTTPException(
                 status_code=HTTP_429_TOO_MANY_REQUESTS,
                 detail="Duplicate message detected",
             )
-        return await self.repo.create(message)
+        group = await self.group_service.get_by_chat_id(message.chat_id)
+        if group:
+            message.readers_needed = max(group.member_count - 1, 0)
+        if message.client_message_id is None:
+            await self.repo.create(message)
+        elif not await self.repo.create_once(message):
+            return await self.repo.get_by_client_message_id(
+                message.sender_id, message.client_message_id
+            )
+        await self.chat_repo.record_last_message(message)
+        return message
+
+    async def _find_original(self, message: Message) -> Message | None:
+        if self.sends is None:
+            return None
+        original_id = self.sends.original_id(message)
+        if original_id is None:
+            return None
+        return await self.repo.get_by_id(original_id)
+
+    async def publish_new_message(
+        self, message: Message, sender_name: str | None = None
+    ) -> None:
+        if self.sends is not None:
+            self.sends.record(message)
+        if self.cache is not None and sender_name is not None:
+            await self.cache.add(
+                MessageDTO(
+                    id=message.id,
+                    chat_id=message.chat_id,
+                    sender_name=sender_name,
+                    text=message.text,
+                    timestamp=ReadPosition.of_message(message).timestamp,
+                    is_readed=bool(message.is_readed),
+                )
+            )
+        await self.socket_service.send_chat_event_except_sender(
+            chat_id=message.chat_id,
+            sender_id=message.sender_id,
+            event=WebSocketEvent[NewMessagePayload](
+                type=WebSocketEventType.NEW_MESSAGE,
+                data=NewMessagePayload(
+                    message_id=message.id,
+                    chat_id=message.chat_id,
+                    sender_id=message.sender_id,
+                    text=message.text,
+                    timestamp=message.timestamp,
+                ),
+            ),
+        )
 
     async def get_chat_messages(
-        self, chat_id: UUID, offset: int = 0, limit: int = 20
+        self,
+        chat_id: UUID,
+        offset: int = 0,
+        limit: int = 20,
+        before: ReadPosition | None = None,
+        after: ReadPosition | None = None,
     ) -> list[MessageDTO]:
+        if before is not None or after is not None:
+            return await self.repo.get_dtos_by_chat_id(
+                chat_id, limit=limit, before=before, after=after
+            )
+        if self.cache is not None:
+            cached = await self._cached_chat(chat_id)
+            if cached.complete:
+                return list(cached.messages[offset : offset + limit])
         return await self.repo.get_dtos_by_chat_id(chat_id, offset, limit)
 
+    async def get_recent_messages(
+        self, chat_id: UUID, limit: int = 20
+    ) -> list[MessageDTO]:
+        if self.cache is None or limit > self.cache.size:
+            return await self.repo.get_recent_dtos(chat_id, limit)
+        cached = await self._cached_chat(chat_id)
+        return list(cached.messages[-limit:])
+
+    async def _cached_chat(self, chat_id: UUID) -> CachedChat:
+        cached = self.cache.get(chat_id)
+        if cached is None:
+            token = self.cache.fill_token(chat_id)
+            messages = await self.repo.get_recent_dtos(chat_id, self.cache.size + 1)
+            cached = CachedChat(
+                tuple(messages[-self.cache.size :]), len(messages) <= self.cache.size
+            )
+            self.cache.fill(chat_id, cached, token)
+        return cached
+
     async def get_group_messages(
         self, group_id: UUID, offset: int = 0, limit: int = 20
     ) -> list[Message]:
         return await self.repo.get_by_group_id(group_id, offset, limit)
 
     async def mark_as_read(self, message_id: UUID, user_id: UUID):
-        if await self.repo.has_user_read(message_id, user_id):
-            return
-
-        await self.repo.save_read_status(message_id, user_id)
-
         message = await self.repo.get_by_id(message_id)
         if not message:
             return
 
         group = await self.group_service.get_by_chat_id(message.chat_id)
+        # readers_needed only counts current members, so nobody else may read.
+        if group and user_id not in await self.group_service.get_member_ids(
+            message.chat_id
+        ):
+            return
 
-        if group:
-            member_ids = await self.group_service.list_members_id(group.id)
-            readers = await self.repo.get_readers(message_id)
-
-            member_ids = [UUID(m) if isinstance(m, str) else m for m in member_ids]
-            readers = [UUID(r) if isinstance(r, str) else r for r in readers]
+        read_range = await self.read_cursors.advance(user_id, message)
+        if not read_range:
+            return
 
-            if set(member_ids).issubset(set(readers)):
+        if group:
+            read_by_all = await self.repo.add_reader(
+                message.chat_id, user_id, read_range
+            )
+            for read_message_id, sender_id in read_by_all:
                 await self.socket_service.send_notification(
-                    user_id=message.sender_id,
+                    user_id=sender_id,
                     event=WebSocketEvent[MessageReadStatusPayload](
                         type=WebSocketEventType.MESSAGE_READ_BY_ALL,
-                        data=MessageReadStatusPayload(message_id=message.id),
+                        data=MessageReadStatusPayload(message_id=read_message_id),
                     ),
                 )
         else:
@@ -85,3 +185,11 @@ class MessageService:
                     data=MessageReadStatusPayload(message_id=message.id),
                 ),
             )
+
+    async def get_unread_count(self, chat_id: UUID, user_id: UUID) -> UnreadCount:
+        cursor = await self.read_cursors.get(chat_id, user_id)
+        return UnreadCount(
+            chat_id=chat_id,
+            unread_count=await self.read_cursors.count_unread(chat_id, user_id),
+            last_read_message_id=cursor.last_read_message_id if cursor else None,
+        )
@@ -0,0 +1,96 @@
+import os
+import sys
+import time
+from typing import Callable, NamedTuple
+from uuid import UUID
+
+from app.core.cache import InvalidatedCache, LRUCache
+from app.schemas.message import MessageDTO
+from app.ws.backplane import Backplane
+
+DEFAULT_MESSAGE_CACHE_SIZE = int(os.getenv("MESSAGE_CACHE_SIZE", "50"))
+DEFAULT_MESSAGE_CACHE_MAX_BYTES = int(
+    os.getenv("MESSAGE_CACHE_MAX_BYTES", str(64 * 1024 * 1024))
+)
+# Backstop for updates lost while a worker's backplane was reconnecting.
+DEFAULT_MESSAGE_CACHE_TTL = float(os.getenv("MESSAGE_CACHE_TTL", "300"))
+MESSAGE_CACHE_TOPIC = "message_cache"
+MESSAGE_CACHE_INVALIDATE_TOPIC = "message_cache_invalidate"
+MESSAGE_OVERHEAD = 1024
+
+
+class CachedChat(NamedTuple):
+    messages: tuple[MessageDTO, ...]
+    complete: bool
+
+
+def _chat_size(chat: CachedChat) -> int:
+    return sum(
+        MESSAGE_OVERHEAD + sys.getsizeof(m.text) + sys.getsizeof(m.sender_name)
+        for m in chat.messages
+    )
+
+
+class RecentMessagesCache(InvalidatedCache):
+    topic = MESSAGE_CACHE_INVALIDATE_TOPIC
+
+    def __init__(
+        self,
+        size: int = DEFAULT_MESSAGE_CACHE_SIZE,
+        max_bytes: int = DEFAULT_MESSAGE_CACHE_MAX_BYTES,
+        backplane: Backplane | None = None,
+        ttl: float = DEFAULT_MESSAGE_CACHE_TTL,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        super().__init__(backplane)
+        self.size = size
+        self._chats: LRUCache[UUID, CachedChat] = LRUCache(
+            max_bytes, _chat_size, ttl, clock
+        )
+
+    def subscribe_to(self, backplane: Backplane) -> None:
+        super().subscribe_to(backplane)
+        backplane.subscribe(MESSAGE_CACHE_TOPIC, self._on_message)
+
+    def get(self, chat_id: UUID) -> CachedChat | None:
+        return self._chats.get(chat_id)
+
+    def fill_token(self, chat_id: UUID) -> int:
+        return self.guards.token(chat_id)
+
+    def fill(self, chat_id: UUID, chat: CachedChat, token: int) -> None:
+        # A message written while the page was loading may be missing from it.
+        if not self.guards.is_current(chat_id, token):
+            return
+        self._chats.set(chat_id, chat)
+
+    async def add(self, message: MessageDTO) -> None:
+        if self.backplane is not None:
+            await self.backplane.publish(
+                MESSAGE_CACHE_TOPIC, {"message": message.model_dump()}
+            )
+        else:
+            self.append(message)
+
+    def append(self, message: MessageDTO) -> None:
+        self.guards.touch(message.chat_id)
+        cached = self._chats.peek(message.chat_id)
+        if cached is None or any(m.id == message.id for m in cached.messages):
+            return
+        messages = sorted((*cached.messages, message), key=lambda m: m.timestamp)
+        self._chats.replace(
+            message.chat_id,
+            CachedChat(
+                tuple(messages[-self.size :]),
+                cached.complete and len(messages) <= self.size,
+            ),
+        )
+
+    def stats(self) -> dict:
+        return {"messages_per_chat": self.size, **self._chats.stats()}
+
+    def _drop(self, chat_id: UUID) -> None:
+        self._chats.pop(chat_id)
+
+    async def _on_message(self, message: dict) -> None:
+        self.append(MessageDTO.model_validate(message["message"]))
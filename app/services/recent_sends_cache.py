@@ -0,0 +1,44 @@
+import hashlib
+import os
+from uuid import UUID
+
+from app.core.cache import TTLCache
+from app.models.message import Message
+
+DEFAULT_IDEMPOTENCY_TTL = float(os.getenv("MESSAGE_IDEMPOTENCY_TTL", "86400"))
+DEFAULT_IDEMPOTENCY_MAX_KEYS = int(os.getenv("MESSAGE_IDEMPOTENCY_MAX_KEYS", "100000"))
+DEFAULT_DUPLICATE_WINDOW = float(os.getenv("MESSAGE_DUPLICATE_WINDOW", "2"))
+
+
+def _text_key(message: Message) -> tuple[UUID, UUID, bytes]:
+    digest = hashlib.blake2b(message.text.encode(), digest_size=16).digest()
+    return message.sender_id, message.chat_id, digest
+
+
+class RecentSendsCache:
+    def __init__(
+        self,
+        ttl: float = DEFAULT_IDEMPOTENCY_TTL,
+        max_keys: int = DEFAULT_IDEMPOTENCY_MAX_KEYS,
+        duplicate_window: float = DEFAULT_DUPLICATE_WINDOW,
+    ):
+        self.keys: TTLCache[tuple[UUID, str], UUID] = TTLCache(ttl, max_keys)
+        self.texts: TTLCache[tuple[UUID, UUID, bytes], UUID] = TTLCache(
+            duplicate_window, max_keys
+        )
+
+    def original_id(self, message: Message) -> UUID | None:
+        if message.client_message_id is None:
+            return None
+        return self.keys.get((message.sender_id, message.client_message_id))
+
+    def is_duplicate_text(self, message: Message) -> bool:
+        return self.texts.get(_text_key(message)) is not None
+
+    def record(self, message: Message) -> None:
+        if message.client_message_id is not None:
+            self.keys.set((message.sender_id, message.client_message_id), message.id)
+        self.texts.set(_text_key(message), message.id)
+
+    def stats(self) -> dict:
+        return {"keys": self.keys.stats(), "texts": self.texts.stats()}
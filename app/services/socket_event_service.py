@@ -1,40 +1,93 @@
+import asyncio
 import logging
 from uuid import UUID
 
-from fastapi.encoders import jsonable_encoder
-
+from app.core.chunks import chunked
 from app.schemas.base_event import WebSocketEvent
+from app.ws.backplane import Backplane
+from app.ws.frames import EventFrame
 from app.ws.managers.chat_manager import ChatManager
 from app.ws.managers.notification_manager import NotificationManager
 
 logger = logging.getLogger("app")
 
+CHAT_TOPIC = "chat"
+NOTIFICATION_TOPIC = "notification"
+# About 40 bytes per id keeps a batch inside a single Postgres NOTIFY.
+NOTIFY_BATCH_SIZE = 100
+
 
 class SocketEventService:
     def __init__(
         self,
         chat_manager: ChatManager,
         notification_manager: NotificationManager,
+        backplane: Backplane | None = None,
     ):
         self.chat_manager = chat_manager
         self.notification_manager = notification_manager
+        self.backplane = backplane
+
+    def subscribe_to(self, backplane: Backplane) -> None:
+        backplane.subscribe(CHAT_TOPIC, self.deliver_chat_event)
+        backplane.subscribe(NOTIFICATION_TOPIC, self.deliver_notification)
 
     async def send_chat_event(self, chat_id: UUID, event: WebSocketEvent):
-        await self.chat_manager.send_to_chat(str(chat_id), event.model_dump())
+        await self._publish(
+            CHAT_TOPIC,
+            {"chat_id": str(chat_id), "exclude": None, "event": event.model_dump()},
+        )
 
     async def send_chat_event_except_sender(
         self, chat_id: UUID, sender_id: UUID, event: WebSocketEvent
     ):
         try:
-            await self.chat_manager.send_to_others(
-                str(chat_id), str(sender_id), jsonable_encoder(event)
+            await self._publish(
+                CHAT_TOPIC,
+                {
+                    "chat_id": str(chat_id),
+                    "exclude": str(sender_id),
+                    "event": event.model_dump(),
+                },
             )
         except Exception as e:
             logger.exception(e)
 
     async def send_notification(self, user_id: UUID, event: WebSocketEvent):
-        await self.notification_manager.send_to_user(str(user_id), event.model_dump())
+        await self.send_to_users([user_id], event)
 
     async def send_to_users(self, user_ids: list[UUID], event: WebSocketEvent):
-        for user_id in user_ids:
-            await self.send_notification(user_id, event)
+        if not user_ids:
+            return
+        payload = event.model_dump()
+        await asyncio.gather(
+            *(
+                self._publish(
+                    NOTIFICATION_TOPIC,
+                    {"user_ids": [str(user_id) for user_id in batch], "event": payload},
+                )
+                for batch in chunked(user_ids, NOTIFY_BATCH_SIZE)
+            )
+        )
+
+    async def deliver_chat_event(self, message: dict):
+        frame = EventFrame(message["event"])
+        if message["exclude"]:
+            await self.chat_manager.send_to_others(
+                message["chat_id"], message["exclude"], frame
+            )
+        else:
+            await self.chat_manager.send_to_chat(message["chat_id"], frame)
+
+    async def deliver_notification(self, message: dict):
+        frame = EventFrame(message["event"])
+        for user_id in message["user_ids"]:
+            await self.notification_manager.send_to_user(user_id, frame)
+
+    async def _publish(self, topic: str, message: dict):
+        if self.backplane is not None:
+            await self.backplane.publish(topic, message)
+        elif topic == CHAT_TOPIC:
+            await self.deliver_chat_event(message)
+        else:
+            await self.deliver_notification(message)
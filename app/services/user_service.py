@@ -1,16 +1,24 @@
-from passlib.context import CryptContext
+from uuid import UUID
+
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.infrastructure.password_hasher import PasswordHasher
 from app.models.user import User
 from app.repositories.user_repository import UserRepository
 from app.schemas.user import UserCreate
-
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+from app.services.auth_cache import AuthCache
 
 
 class UserService:
-    def __init__(self, db: AsyncSession):
+    def __init__(
+        self,
+        db: AsyncSession,
+        hasher: PasswordHasher,
+        auth_cache: AuthCache | None = None,
+    ):
         self.repo = UserRepository(db)
+        self.hasher = hasher
+        self.auth_cache = auth_cache
 
     async def register(self, user_data: UserCreate) -> User:
         user_data.email = user_data.email.lower()
@@ -18,7 +26,7 @@ class UserService:
         if existing:
             raise ValueError("Email already in use")
 
-        hashed_pw = self._hash_password(user_data.password)
+        hashed_pw = await self._hash_password(user_data.password)
         user_data.password = hashed_pw
         return await self.repo.create(user_data)
 
@@ -28,7 +36,7 @@ class UserService:
         if not user:
             return None
 
-        if not self._verify_password(password, user.password):
+        if not await self._verify_password(password, user.password):
             return None
 
         return user
@@ -36,8 +44,26 @@ class UserService:
     async def get_by_id(self, user_id) -> User | None:
         return await self.repo.get_by_id(user_id)
 
-    def _hash_password(self, password: str) -> str:
-        return pwd_context.hash(password)
+    async def update_name(self, user_id: UUID, new_name: str) -> bool:
+        updated = await self.repo.update_name(user_id, new_name)
+        if updated:
+            await self._invalidate(user_id)
+        return updated
+
+    async def update_password(self, user_id: UUID, new_password: str) -> bool:
+        hashed_pw = await self._hash_password(new_password)
+        updated = await self.repo.update_password(user_id, hashed_pw)
+        if updated:
+            await self._invalidate(user_id)
+        return updated
+
+    async def _invalidate(self, user_id: UUID) -> None:
+        # The repository has already committed the change.
+        if self.auth_cache is not None:
+            await self.auth_cache.invalidate([user_id])
+
+    async def _hash_password(self, password: str) -> str:
+        return await self.hasher.hash(password)
 
-    def _verify_password(self, plain: str, hashed: str) -> bool:
-        return pwd_context.verify(plain, hashed)
+    async def _verify_password(self, plain: str, hashed: str) -> bool:
+        return await self.hasher.verify(plain, hashed)
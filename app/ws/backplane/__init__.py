@@ -0,0 +1,14 @@
+from app.ws.backplane.base import Backplane
+from app.ws.backplane.local import LocalBackplane
+
+
+def create_backplane(kind: str) -> Backplane:
+    if kind == "local":
+        return LocalBackplane()
+    if kind == "postgres":
+        from app.db.session import get_settings
+        from app.ws.backplane.postgres import PostgresBackplane
+
+        dsn = get_settings().database_url.replace("+asyncpg", "")
+        return PostgresBackplane(dsn)
+    raise ValueError(f"Unknown backplane: {kind}")
@@ -0,0 +1,31 @@
+import logging
+from abc import ABC, abstractmethod
+from typing import Awaitable, Callable
+
+logger = logging.getLogger("app")
+
+BackplaneHandler = Callable[[dict], Awaitable[None]]
+
+
+class Backplane(ABC):
+    def __init__(self):
+        self._handlers: dict[str, list[BackplaneHandler]] = {}
+
+    def subscribe(self, topic: str, handler: BackplaneHandler) -> None:
+        self._handlers.setdefault(topic, []).append(handler)
+
+    @abstractmethod
+    async def publish(self, topic: str, message: dict) -> None: ...
+
+    async def start(self) -> None:
+        pass
+
+    async def stop(self) -> None:
+        pass
+
+    async def _dispatch(self, topic: str, message: dict) -> None:
+        for handler in self._handlers.get(topic, []):
+            try:
+                await handler(message)
+            except Exception as e:
+                logger.exception(f"Backplane handler failed: topic={topic}, error={e}")
@@ -0,0 +1,7 @@
+from app.ws.backplane.base import Backplane
+from app.ws.backplane.serialization import dumps, loads
+
+
+class LocalBackplane(Backplane):
+    async def publish(self, topic: str, message: dict) -> None:
+        await self._dispatch(topic, loads(dumps(message)))
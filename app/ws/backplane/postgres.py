@@ -0,0 +1,120 @@
+import asyncio
+import logging
+import time
+from uuid import uuid4
+
+import asyncpg
+
+from app.ws.backplane.base import Backplane
+from app.ws.backplane.serialization import dumps, loads
+
+logger = logging.getLogger("app")
+
+MAX_NOTIFY_PAYLOAD = 7999
+RECONNECT_DELAY = 1.0
+CHUNK_PREFIX = "#chunk:"
+# At most 4 UTF-8 bytes per character keeps a chunk and its header under the
+# NOTIFY limit.
+CHUNK_CHARS = 1900
+CHUNK_TIMEOUT = 30.0
+
+
+def split_payload(payload: str) -> list[str]:
+    chunk_id = uuid4().hex
+    pieces = [payload[i : i + CHUNK_CHARS] for i in range(0, len(payload), CHUNK_CHARS)]
+    return [
+        f"{CHUNK_PREFIX}{chunk_id}:{index}:{len(pieces)}:{piece}"
+        for index, piece in enumerate(pieces)
+    ]
+
+
+class PostgresBackplane(Backplane):
+    def __init__(self, dsn: str, channel: str = "ws_backplane"):
+        super().__init__()
+        self.dsn = dsn
+        self.channel = channel
+        self._pool: asyncpg.Pool | None = None
+        self._listener: asyncpg.Connection | None = None
+        self._inbox: asyncio.Queue = asyncio.Queue()
+        self._consumer: asyncio.Task | None = None
+        self._reconnect: asyncio.Task | None = None
+        self._stopping = False
+        self._chunks: dict[str, tuple[float, dict[int, str]]] = {}
+
+    async def start(self) -> None:
+        self._stopping = False
+        self._pool = await asyncpg.create_pool(self.dsn, min_size=1, max_size=4)
+        await self._listen()
+        self._consumer = asyncio.create_task(self._consume())
+
+    async def stop(self) -> None:
+        self._stopping = True
+        for task in (self._reconnect, self._consumer):
+            if task:
+                task.cancel()
+        if self._listener and not self._listener.is_closed():
+            await self._listener.close()
+        if self._pool:
+            await self._pool.close()
+
+    async def publish(self, topic: str, message: dict) -> None:
+        payload = dumps({"topic": topic, "message": message})
+        if len(payload.encode()) <= MAX_NOTIFY_PAYLOAD:
+            await self._pool.execute("SELECT pg_notify($1, $2)", self.channel, payload)
+            return
+        # Notifications of one transaction are delivered together and in order.
+        async with self._pool.acquire() as conn:
+            async with conn.transaction():
+                for chunk in split_payload(payload):
+                    await conn.execute("SELECT pg_notify($1, $2)", self.channel, chunk)
+
+    async def _listen(self) -> None:
+        self._listener = await asyncpg.connect(self.dsn)
+        self._listener.add_termination_listener(self._on_terminate)
+        await self._listener.add_listener(self.channel, self._on_notify)
+
+    def _on_notify(self, connection, pid: int, channel: str, payload: str) -> None:
+        self._inbox.put_nowait(payload)
+
+    def _on_terminate(self, connection) -> None:
+        if not self._stopping:
+            logger.warning("Backplane listener connection lost, reconnecting")
+            self._reconnect = asyncio.create_task(self._reconnect_loop())
+
+    async def _reconnect_loop(self) -> None:
+        while not self._stopping:
+            try:
+                await self._listen()
+                return
+            except Exception as e:
+                logger.warning(f"Backplane reconnect failed: {e}")
+                await asyncio.sleep(RECONNECT_DELAY)
+
+    async def _consume(self) -> None:
+        while True:
+            payload = await self._inbox.get()
+            if payload.startswith(CHUNK_PREFIX):
+                payload = self._assemble(payload)
+                if payload is None:
+                    continue
+            try:
+                envelope = loads(payload)
+            except ValueError as e:
+                logger.warning(f"Backplane received malformed payload: {e}")
+                continue
+            await self._dispatch(envelope["topic"], envelope["message"])
+
+    def _assemble(self, chunk: str) -> str | None:
+        chunk_id, index, total, piece = chunk[len(CHUNK_PREFIX) :].split(":", 3)
+        now = time.monotonic()
+        # Chunks lost while the listener was reconnecting never complete.
+        for stale_id, (started, _) in list(self._chunks.items()):
+            if now - started > CHUNK_TIMEOUT:
+                logger.warning(f"Backplane dropped incomplete payload: {stale_id}")
+                del self._chunks[stale_id]
+        _, pieces = self._chunks.setdefault(chunk_id, (now, {}))
+        pieces[int(index)] = piece
+        if len(pieces) < int(total):
+            return None
+        del self._chunks[chunk_id]
+        return "".join(pieces[i] for i in range(int(total)))
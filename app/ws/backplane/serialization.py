@@ -0,0 +1,34 @@
+import json
+from datetime import datetime
+from enum import Enum
+from typing import Any
+from uuid import UUID
+
+
+def _encode(value: Any) -> Any:
+    if isinstance(value, UUID):
+        return {"$uuid": str(value)}
+    if isinstance(value, datetime):
+        return {"$datetime": value.isoformat()}
+    if isinstance(value, Enum):
+        return value.value
+    raise TypeError(f"Object of type {type(value).__name__} is not serializable")
+
+
+def _decode(obj: dict) -> Any:
+    if len(obj) == 1:
+        if "$uuid" in obj:
+            return UUID(obj["$uuid"])
+        if "$datetime" in obj:
+            return datetime.fromisoformat(obj["$datetime"])
+    return obj
+
+
+def dumps(message: dict) -> str:
+    return json.dumps(
+        message, default=_encode, ensure_ascii=False, separators=(",", ":")
+    )
+
+
+def loads(data: str | bytes) -> dict:
+    return json.loads(data, object_hook=_decode)
@@ -1,52 +1,85 @@
 import logging
+from functools import partial
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, WebSocket, WebSocketDisconnect
+from pydantic import ValidationError
 
 from app.dependencies.jwt import get_jwt_service
-from app.dependencies.websockets import get_chat_manager
+from app.dependencies.websockets import get_chat_manager, get_event_pipeline
 from app.infrastructure.jwt_service import JWTService, UserTokenPayload
 from app.schemas.base_event import WebSocketEvent
-from app.ws.handlers import event_handlers
+from app.ws.enums import WebSocketEventType
+from app.ws.event_pipeline import EventPipeline
+from app.ws.handlers import SocketHandler, event_handlers
+from app.ws.handlers.context import ChatSocketContext
+from app.ws.handlers.socket_event_handlers import reply_error
 from app.ws.managers.chat_manager import ChatManager
+from app.ws.managers.connection import Connection
+from app.ws.replay import replay_missed_messages
 
 router = APIRouter()
 logger = logging.getLogger("app")
 
 
+async def run_handler(handler: SocketHandler, raw: dict, context: ChatSocketContext):
+    try:
+        await handler(raw, context)
+    except ValidationError as e:
+        reply_error(context, f"Invalid {raw.get('type')} event")
+        logger.info(f"Rejected WebSocket event: {e}")
+
+
 @router.websocket("/ws/chat/{chat_id}")
 async def websocket_chat(
     chat_id: UUID,
     websocket: WebSocket,
+    last_seen: UUID | None = None,
     jwt_service: JWTService = Depends(get_jwt_service),
     manager: ChatManager = Depends(get_chat_manager),
+    pipeline: EventPipeline = Depends(get_event_pipeline),
 ):
     token = websocket.query_params.get("token")
     user_id: str | None = None
+    connection: Connection | None = None
 
     try:
         user_data: UserTokenPayload = jwt_service.verify_token(token)
         user_id = user_data.sub
-        await manager.connect(str(chat_id), user_id, websocket)
+        connection = await manager.connect(
+            str(chat_id), user_id, websocket, hold=last_seen is not None
+        )
+        if last_seen is not None:
+            await replay_missed_messages(
+                manager, chat_id, user_id, connection, last_seen
+            )
+        context = ChatSocketContext(
+            chat_id=chat_id, user=user_data, connection=connection
+        )
 
         while True:
-            raw = await websocket.receive_json()
+            raw = await connection.receive()
             base_event = WebSocketEvent[dict](**raw)
+            if base_event.type == WebSocketEventType.PONG:
+                continue
 
-            handler = event_handlers.get(base_event.type)
-            if handler:
-                await handler(
-                    raw,
-                    user_data,
+            spec = event_handlers.get(base_event.type)
+            if spec:
+                await pipeline.submit(
+                    partial(run_handler, spec.handler, raw, context),
+                    lane=connection if spec.ordered else None,
+                    source=connection,
                 )
             else:
                 logger.warning(f"Unknown WebSocket event type: {base_event.type}")
 
     except WebSocketDisconnect:
-        if user_id:
-            manager.disconnect(str(chat_id), user_id)
+        if connection:
+            connection.close()
             logger.info(f"WebSocket disconnected: chat_id={chat_id}, user_id={user_id}")
 
     except Exception as e:
         logger.exception(f"WebSocket error: chat_id={chat_id}, error={e}")
+        if connection:
+            connection.close()
         await websocket.close(code=1008)
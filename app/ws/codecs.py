@@ -0,0 +1,104 @@
+import json
+from abc import ABC, abstractmethod
+from datetime import UTC, date, datetime
+from enum import Enum
+from typing import Any
+from uuid import UUID
+
+import msgpack
+from fastapi import WebSocket, WebSocketDisconnect
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, UUID):
+        return str(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _msgpack_default(value: Any) -> Any:
+    if isinstance(value, UUID):
+        return value.bytes
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=UTC)
+        return int(value.timestamp() * 1000)
+    if isinstance(value, Enum):
+        return value.value
+    raise TypeError(f"Object of type {type(value).__name__} is not serializable")
+
+
+class Codec(ABC):
+    name: str
+
+    @abstractmethod
+    def encode(self, payload: dict) -> str | bytes: ...
+
+    @abstractmethod
+    def decode(self, data: str | bytes) -> dict: ...
+
+    @abstractmethod
+    def encode_batch(self, encoded: list[str | bytes]) -> str | bytes: ...
+
+    @abstractmethod
+    async def send(self, websocket: WebSocket, data: str | bytes) -> None: ...
+
+    async def receive(self, websocket: WebSocket) -> dict:
+        message = await websocket.receive()
+        if message["type"] == "websocket.disconnect":
+            raise WebSocketDisconnect(message.get("code", 1000), message.get("reason"))
+        data = message.get("bytes")
+        return self.decode(data if data is not None else message.get("text", ""))
+
+
+class JsonCodec(Codec):
+    name = "json"
+
+    def encode(self, payload: dict) -> str:
+        return json.dumps(
+            payload, default=_json_default, ensure_ascii=False, separators=(",", ":")
+        )
+
+    def decode(self, data: str | bytes) -> dict:
+        return json.loads(data)
+
+    def encode_batch(self, encoded: list[str]) -> str:
+        return "[" + ",".join(encoded) + "]"
+
+    async def send(self, websocket: WebSocket, data: str) -> None:
+        await websocket.send_text(data)
+
+
+class MsgPackCodec(Codec):
+    name = "msgpack"
+
+    def encode(self, payload: dict) -> bytes:
+        return msgpack.packb(payload, default=_msgpack_default)
+
+    def decode(self, data: str | bytes) -> dict:
+        if isinstance(data, str):
+            data = data.encode()
+        return msgpack.unpackb(data)
+
+    def encode_batch(self, encoded: list[bytes]) -> bytes:
+        return msgpack.Packer().pack_array_header(len(encoded)) + b"".join(encoded)
+
+    async def send(self, websocket: WebSocket, data: bytes) -> None:
+        await websocket.send_bytes(data)
+
+
+json_codec = JsonCodec()
+msgpack_codec = MsgPackCodec()
+
+codecs: dict[str, Codec] = {codec.name: codec for codec in (json_codec, msgpack_codec)}
+
+
+def negotiate_codec(websocket: WebSocket) -> tuple[Codec, str | None]:
+    for subprotocol in websocket.scope.get("subprotocols", []):
+        codec = codecs.get(subprotocol)
+        if codec:
+            return codec, subprotocol
+    return json_codec, None
@@ -3,6 +3,7 @@ from enum import Enum
 
 class WebSocketEventType(str, Enum):
     READ = "READ"
+    READ_UP_TO = "READ_UP_TO"
     MESSAGE_READ_BY_ALL = "MESSAGE_READ_BY_ALL"
     GROUP_UPDATED = "GROUP_UPDATED"
     CHAT_CREATED = "CHAT_CREATED"
@@ -10,3 +11,12 @@ class WebSocketEventType(str, Enum):
     USER_TYPING = "USER_TYPING"
     USER_ADDED = "USER_ADDED"
     MESSAGE_READ = "MESSAGE_READ"
+    SEND_MESSAGE = "SEND_MESSAGE"
+    MESSAGE_ACK = "MESSAGE_ACK"
+    ERROR = "ERROR"
+    PING = "PING"
+    PONG = "PONG"
+    REPLAY_TRUNCATED = "REPLAY_TRUNCATED"
+    PRESENCE = "PRESENCE"
+    PRESENCE_SUBSCRIBE = "PRESENCE_SUBSCRIBE"
+    PRESENCE_UNSUBSCRIBE = "PRESENCE_UNSUBSCRIBE"
@@ -0,0 +1,152 @@
+import asyncio
+import logging
+import os
+from collections import deque
+from typing import Awaitable, Callable, Hashable
+
+logger = logging.getLogger("app")
+
+DEFAULT_EVENT_WORKERS = int(os.getenv("WS_EVENT_WORKERS", "32"))
+DEFAULT_EVENT_QUEUE_SIZE = int(os.getenv("WS_EVENT_QUEUE_SIZE", "1024"))
+DEFAULT_EVENT_PER_CONNECTION = int(os.getenv("WS_EVENT_PER_CONNECTION", "16"))
+
+Job = Callable[[], Awaitable[None]]
+
+
+class _SourceLimit:
+    def __init__(self, size: int):
+        self.slots = asyncio.Semaphore(size)
+        self.holders = 0
+
+
+class EventPipeline:
+    def __init__(
+        self,
+        workers: int = DEFAULT_EVENT_WORKERS,
+        queue_size: int = DEFAULT_EVENT_QUEUE_SIZE,
+        per_source: int = DEFAULT_EVENT_PER_CONNECTION,
+    ):
+        self.workers = workers
+        self.queue_size = queue_size
+        self.per_source = per_source
+        self.processed = 0
+        self.failed = 0
+        self._admitted = 0
+        self._in_flight = 0
+        self._lanes: dict[Hashable, deque[Job]] = {}
+        self._sources: dict[Hashable, _SourceLimit] = {}
+        self._queue: asyncio.Queue | None = None
+        self._slots: asyncio.Semaphore | None = None
+        self._tasks: list[asyncio.Task] = []
+
+    def start(self) -> None:
+        if self._tasks:
+            return
+        self._queue = asyncio.Queue()
+        self._slots = asyncio.Semaphore(self.queue_size)
+        self._tasks = [asyncio.create_task(self._work()) for _ in range(self.workers)]
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._lanes.clear()
+        self._sources.clear()
+        self._admitted = 0
+        self._in_flight = 0
+
+    async def submit(
+        self, job: Job, lane: Hashable | None = None, source: Hashable | None = None
+    ) -> None:
+        self.start()
+        if source is not None:
+            # A source that floods the pipeline waits on its own slots before
+            # it can take the shared ones away from everybody else.
+            await self._acquire_source(source)
+            job = self._releasing_source(job, source)
+        try:
+            await self._slots.acquire()
+        except BaseException:
+            if source is not None:
+                self._release_source(source)
+            raise
+        self._admitted += 1
+        if lane is not None:
+            pending = self._lanes.get(lane)
+            if pending is not None:
+                pending.append(job)
+                return
+            self._lanes[lane] = deque()
+        self._queue.put_nowait((job, lane))
+
+    async def drain(self) -> None:
+        if self._queue is not None:
+            await self._queue.join()
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.workers,
+            "queue_size": self.queue_size,
+            "per_source": self.per_source,
+            "queued": self._admitted - self._in_flight,
+            "in_flight": self._in_flight,
+            "processed": self.processed,
+            "failed": self.failed,
+        }
+
+    async def _work(self) -> None:
+        while True:
+            job, lane = await self._queue.get()
+            self._in_flight += 1
+            try:
+                await job()
+            except Exception as e:
+                self.failed += 1
+                logger.exception(f"WebSocket event handler failed: {e}")
+            finally:
+                self._in_flight -= 1
+                self._admitted -= 1
+                self.processed += 1
+                self._slots.release()
+                if lane is not None:
+                    self._next_in_lane(lane)
+                self._queue.task_done()
+
+    async def _acquire_source(self, source: Hashable) -> None:
+        limit = self._sources.get(source)
+        if limit is None:
+            limit = self._sources[source] = _SourceLimit(self.per_source)
+        limit.holders += 1
+        try:
+            await limit.slots.acquire()
+        except BaseException:
+            limit.holders -= 1
+            if not limit.holders:
+                self._sources.pop(source, None)
+            raise
+
+    def _release_source(self, source: Hashable) -> None:
+        limit = self._sources.get(source)
+        if limit is None:
+            return
+        limit.slots.release()
+        limit.holders -= 1
+        if not limit.holders:
+            del self._sources[source]
+
+    def _releasing_source(self, job: Job, source: Hashable) -> Job:
+        async def run() -> None:
+            try:
+                await job()
+            finally:
+                self._release_source(source)
+
+        return run
+
+    def _next_in_lane(self, lane: Hashable) -> None:
+        pending = self._lanes.get(lane)
+        if pending:
+            self._queue.put_nowait((pending.popleft(), lane))
+        else:
+            self._lanes.pop(lane, None)
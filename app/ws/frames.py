@@ -0,0 +1,31 @@
+from app.schemas.base_event import WebSocketEvent
+from app.ws.codecs import Codec, json_codec
+
+
+class EventFrame:
+    __slots__ = ("payload", "_encoded")
+
+    def __init__(self, payload: dict):
+        self.payload = payload
+        self._encoded: dict[str, str | bytes] = {}
+
+    @classmethod
+    def from_event(cls, event: WebSocketEvent) -> "EventFrame":
+        return cls(event.model_dump())
+
+    def encode(self, codec: Codec) -> str | bytes:
+        data = self._encoded.get(codec.name)
+        if data is None:
+            data = self._encoded[codec.name] = codec.encode(self.payload)
+        return data
+
+    @property
+    def message_id(self) -> str | None:
+        data = self.payload.get("data")
+        if isinstance(data, dict) and data.get("message_id") is not None:
+            return str(data["message_id"])
+        return None
+
+    @property
+    def text(self) -> str:
+        return self.encode(json_codec)
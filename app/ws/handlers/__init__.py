@@ -1,11 +1,28 @@
+from dataclasses import dataclass
 from typing import Awaitable, Callable
 
-from app.infrastructure.jwt_service import UserTokenPayload
-from app.schemas.base_event import WebSocketEvent
 from app.ws.enums import WebSocketEventType
-from app.ws.handlers.socket_event_handlers import handle_read
+from app.ws.handlers.context import ChatSocketContext
+from app.ws.handlers.socket_event_handlers import (
+    handle_read,
+    handle_send_message,
+    handle_typing,
+)
 
-SocketHandler = Callable[[WebSocketEvent, UserTokenPayload], Awaitable[None]]
-event_handlers: dict[WebSocketEventType, SocketHandler] = {
-    WebSocketEventType.READ: handle_read,
+SocketHandler = Callable[[dict, ChatSocketContext], Awaitable[None]]
+
+
+@dataclass(frozen=True)
+class SocketHandlerSpec:
+    handler: SocketHandler
+    ordered: bool = False
+
+
+event_handlers: dict[WebSocketEventType, SocketHandlerSpec] = {
+    WebSocketEventType.READ: SocketHandlerSpec(handle_read),
+    WebSocketEventType.READ_UP_TO: SocketHandlerSpec(handle_read),
+    WebSocketEventType.USER_TYPING: SocketHandlerSpec(handle_typing, ordered=True),
+    WebSocketEventType.SEND_MESSAGE: SocketHandlerSpec(
+        handle_send_message, ordered=True
+    ),
 }
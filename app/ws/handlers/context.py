@@ -0,0 +1,14 @@
+from dataclasses import dataclass
+from uuid import UUID
+
+from app.infrastructure.jwt_service import UserTokenPayload
+from app.models.chat import ChatType
+from app.ws.managers.connection import Connection
+
+
+@dataclass
+class ChatSocketContext:
+    chat_id: UUID
+    user: UserTokenPayload
+    connection: Connection
+    chat_type: ChatType | None = None
@@ -1,19 +1,156 @@
+import logging
+from datetime import UTC, datetime
 from uuid import UUID
 
-from app.dependencies.services import get_message_service
-from app.infrastructure.jwt_service import UserTokenPayload
+from fastapi import HTTPException
+
+from app.dependencies.db import db_session_scope
+from app.dependencies.services import (
+    get_membership_cache,
+    get_recent_messages_cache,
+    get_recent_sends_cache,
+    get_socket_event_service,
+)
+from app.models.chat import ChatType
+from app.models.message import Message
 from app.schemas.base_event import WebSocketEvent
-from app.schemas.ws_payloads import MessageReadRequest
+from app.schemas.ws_payloads import (
+    ErrorPayload,
+    MessageAckPayload,
+    MessageReadRequest,
+    SendMessageEventPayload,
+    TypingEventPayload,
+    UserTypingPayload,
+)
+from app.services.chat_service import ChatService
+from app.services.group_service import GroupService
+from app.services.message_service import MessageService
+from app.ws.enums import WebSocketEventType
+from app.ws.frames import EventFrame
+from app.ws.handlers.context import ChatSocketContext
+from app.ws.typing_indicator import TypingThrottler
 
-message_service = get_message_service()
+logger = logging.getLogger("app")
 
 
 async def handle_read(
-    raw_event: WebSocketEvent,
-    user: UserTokenPayload,
+    raw_event: dict,
+    context: ChatSocketContext,
+):
+    event = WebSocketEvent[MessageReadRequest](**raw_event)
+
+    async with db_session_scope() as db:
+        message_service = MessageService(
+            db, GroupService(db, get_membership_cache()), get_socket_event_service()
+        )
+        await message_service.mark_as_read(
+            message_id=event.data.message_id, user_id=UUID(context.user.sub)
+        )
+
+
+async def broadcast_typing(chat_id: str, user_id: str, is_typing: bool):
+    await get_socket_event_service().send_chat_event_except_sender(
+        chat_id=UUID(chat_id),
+        sender_id=UUID(user_id),
+        event=WebSocketEvent[UserTypingPayload](
+            type=WebSocketEventType.USER_TYPING,
+            data=UserTypingPayload(
+                chat_id=chat_id, user_id=user_id, is_typing=is_typing
+            ),
+        ),
+    )
+
+
+typing_throttler = TypingThrottler(emit=broadcast_typing)
+
+
+async def handle_typing(
+    raw_event: dict,
+    context: ChatSocketContext,
+):
+    event = WebSocketEvent[TypingEventPayload](**raw_event)
+
+    await typing_throttler.submit(
+        str(context.chat_id), context.user.sub, event.data.is_typing
+    )
+
+
+def reply(context: ChatSocketContext, event: WebSocketEvent) -> None:
+    context.connection.send(EventFrame.from_event(event))
+
+
+def reply_error(context: ChatSocketContext, detail: str) -> None:
+    reply(
+        context,
+        WebSocketEvent[ErrorPayload](
+            type=WebSocketEventType.ERROR, data=ErrorPayload(detail=detail)
+        ),
+    )
+
+
+async def handle_send_message(
+    raw_event: dict,
+    context: ChatSocketContext,
 ):
-    event = WebSocketEvent[MessageReadRequest](**raw_event.dict())
+    event = WebSocketEvent[SendMessageEventPayload](**raw_event)
+    socket_service = get_socket_event_service()
+    user_id = UUID(context.user.sub)
+
+    try:
+        async with db_session_scope() as db:
+            group_service = GroupService(db, get_membership_cache())
+            if context.chat_type is None:
+                chat_service = ChatService(db, get_membership_cache())
+                chat = await chat_service.get_by_id(context.chat_id)
+                if not chat:
+                    reply_error(context, "Chat not found")
+                    return
+                if not await chat_service.has_access_to_chat(chat, user_id):
+                    reply_error(context, "Access denied")
+                    return
+                context.chat_type = chat.type
+            # Private chat participants never change, group members can leave.
+            elif context.chat_type == ChatType.public:
+                if user_id not in await group_service.get_member_ids(context.chat_id):
+                    reply_error(context, "Access denied")
+                    return
+
+            message_service = MessageService(
+                db,
+                group_service,
+                socket_service,
+                get_recent_messages_cache(),
+                get_recent_sends_cache(),
+            )
+            new_message = Message(
+                chat_id=context.chat_id,
+                sender_id=user_id,
+                text=event.data.text,
+                timestamp=datetime.now(UTC),
+                client_message_id=event.data.client_message_id,
+            )
+            message = await message_service.create_message(new_message)
+    except HTTPException as e:
+        reply_error(context, e.detail)
+        return
+    except Exception as e:
+        logger.exception(
+            f"Failed to send message: chat_id={context.chat_id}, "
+            f"user_id={context.user.sub}, error={e}"
+        )
+        reply_error(context, "Message could not be sent")
+        return
 
-    await message_service.mark_as_read(
-        message_id=event.data.message_id, user_id=UUID(user.sub)
+    reply(
+        context,
+        WebSocketEvent[MessageAckPayload](
+            type=WebSocketEventType.MESSAGE_ACK,
+            data=MessageAckPayload(
+                message_id=message.id,
+                chat_id=message.chat_id,
+                timestamp=message.timestamp,
+            ),
+        ),
     )
+    if message is new_message:
+        await message_service.publish_new_message(message, context.user.name)
@@ -0,0 +1,76 @@
+import asyncio
+import logging
+import os
+import time
+from typing import Iterable
+
+from starlette.status import WS_1001_GOING_AWAY
+
+from app.ws.enums import WebSocketEventType
+from app.ws.frames import EventFrame
+from app.ws.managers.chat_manager import ChatManager
+from app.ws.managers.connection import Connection
+from app.ws.managers.notification_manager import NotificationManager
+
+logger = logging.getLogger("app")
+
+DEFAULT_HEARTBEAT_INTERVAL = float(os.getenv("WS_HEARTBEAT_INTERVAL", "20"))
+DEFAULT_HEARTBEAT_TIMEOUT = float(os.getenv("WS_HEARTBEAT_TIMEOUT", "60"))
+
+
+class HeartbeatReaper:
+    def __init__(
+        self,
+        managers: Iterable[ChatManager | NotificationManager],
+        interval: float = DEFAULT_HEARTBEAT_INTERVAL,
+        timeout: float = DEFAULT_HEARTBEAT_TIMEOUT,
+    ):
+        self.managers = list(managers)
+        self.interval = interval
+        self.timeout = timeout
+        self.evicted = 0
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            self._task = None
+
+    def run_once(self) -> int:
+        deadline = time.monotonic() - self.timeout
+        ping = EventFrame({"type": WebSocketEventType.PING, "data": {}})
+        stale: list[Connection] = []
+
+        for manager in self.managers:
+            for connection in list(manager.connections()):
+                if connection.last_seen < deadline:
+                    stale.append(connection)
+                else:
+                    connection.send(ping)
+
+        for connection in stale:
+            connection.close(code=WS_1001_GOING_AWAY)
+
+        if stale:
+            logger.info(f"Heartbeat reaper evicted {len(stale)} idle connections")
+        self.evicted += len(stale)
+        return len(stale)
+
+    def stats(self) -> dict:
+        return {
+            "interval": self.interval,
+            "timeout": self.timeout,
+            "evicted": self.evicted,
+        }
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                self.run_once()
+            except Exception as e:
+                logger.exception(f"Heartbeat reaper failed: {e}")
@@ -1,34 +1,191 @@
-from typing import Dict
+import asyncio
+import logging
+import os
+import time
+import zlib
+from collections import ChainMap
+from typing import Dict, Iterator
 
 from fastapi import WebSocket
+from starlette.status import WS_1013_TRY_AGAIN_LATER
 
+from app.core.metrics import LatencyStats
+from app.ws.codecs import negotiate_codec
+from app.ws.frames import EventFrame
 from app.ws.managers.base_singleton import SingletonMeta
+from app.ws.managers.connection import Connection, batch_window_for
+from app.ws.replay_buffer import ReplayBuffer
+
+logger = logging.getLogger("app")
+
+DEFAULT_CHAT_SHARDS = int(os.getenv("WS_CHAT_SHARDS", "16"))
+DEFAULT_SHARD_QUEUE_SIZE = int(os.getenv("WS_CHAT_SHARD_QUEUE_SIZE", "1024"))
+FANOUT_CHUNK = 256
+
+
+class ChatShard:
+    def __init__(self, queue_size: int = DEFAULT_SHARD_QUEUE_SIZE):
+        self.connections: Dict[str, Dict[str, Connection]] = {}
+        self.queue_size = queue_size
+        self.latency = LatencyStats()
+        self.replay = ReplayBuffer()
+        self.dropped = 0
+        self._queue: asyncio.Queue | None = None
+        self._task: asyncio.Task | None = None
+
+    @property
+    def queue_depth(self) -> int:
+        return self._queue.qsize() if self._queue else 0
+
+    async def enqueue(
+        self, chat_id: str, exclude: str | None, frame: EventFrame
+    ) -> None:
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=self.queue_size)
+        if self._task is None:
+            self._task = asyncio.create_task(self._dispatch())
+        try:
+            self._queue.put_nowait((chat_id, exclude, frame, time.monotonic()))
+        except asyncio.QueueFull:
+            # Waiting here would stall the publisher behind every chat on the
+            # shard. The chat's sockets are closed instead, and its replay
+            # buffer now has a gap, so reconnects replay from the database.
+            self.dropped += 1
+            logger.warning(
+                f"Chat shard queue full ({self.queue_size}), "
+                f"dropping frame for chat {chat_id}"
+            )
+            self.replay.discard(chat_id)
+            for connection in list(self.connections.get(chat_id, {}).values()):
+                connection.close(code=WS_1013_TRY_AGAIN_LATER)
+
+    async def flush(self) -> None:
+        if self._queue is not None:
+            await self._queue.join()
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        self._queue = None
+
+    def stats(self) -> dict:
+        connections = [c for conns in self.connections.values() for c in conns.values()]
+        return {
+            "chats": len(self.connections),
+            "connections": len(connections),
+            "queue_depth": self.queue_depth,
+            "dropped_frames": self.dropped,
+            "queued_frames": sum(conn.queue_depth for conn in connections),
+            "send_latency": self.latency.snapshot(),
+        }
+
+    async def _dispatch(self) -> None:
+        while True:
+            chat_id, exclude, frame, enqueued_at = await self._queue.get()
+            try:
+                await self._fan_out(chat_id, exclude, frame)
+                self.latency.record(time.monotonic() - enqueued_at)
+            except Exception as e:
+                logger.exception(f"Chat shard dispatch failed: {e}")
+            finally:
+                self._queue.task_done()
+
+    async def _fan_out(self, chat_id: str, exclude: str | None, frame: EventFrame):
+        self.replay.record(chat_id, frame)
+        chat_conns = self.connections.get(chat_id)
+        if not chat_conns:
+            return
+        for i, (uid, connection) in enumerate(list(chat_conns.items()), 1):
+            if uid != exclude:
+                connection.send(frame)
+            if i % FANOUT_CHUNK == 0:
+                await asyncio.sleep(0)
 
 
 class ChatManager(metaclass=SingletonMeta):
-    def __init__(self):
-        self.active_connections: Dict[str, Dict[str, WebSocket]] = {}
+    def __init__(self, shards: int = DEFAULT_CHAT_SHARDS):
+        self.shards = [ChatShard() for _ in range(shards)]
 
-    async def connect(self, chat_id: str, user_id: str, websocket: WebSocket):
-        await websocket.accept()
-        if chat_id not in self.active_connections:
-            self.active_connections[chat_id] = {}
-        self.active_connections[chat_id][user_id] = websocket
+    @property
+    def active_connections(self) -> ChainMap:
+        return ChainMap(*(shard.connections for shard in self.shards))
+
+    def shard_for(self, chat_id: str) -> ChatShard:
+        return self.shards[zlib.crc32(chat_id.encode()) % len(self.shards)]
+
+    async def resize(self, shards: int) -> None:
+        await self.flush()
+        await self.stop()
+        previous = self.shards
+        self.shards = [ChatShard() for _ in range(shards)]
+        for shard in previous:
+            for chat_id, chat_conns in shard.connections.items():
+                self.shard_for(chat_id).connections[chat_id] = chat_conns
+            for chat_id, frames in shard.replay.chats():
+                self.shard_for(chat_id).replay.restore(chat_id, frames)
+
+    async def connect(
+        self, chat_id: str, user_id: str, websocket: WebSocket, hold: bool = False
+    ) -> Connection:
+        codec, subprotocol = negotiate_codec(websocket)
+        await websocket.accept(subprotocol=subprotocol)
+        connection = Connection(
+            websocket,
+            codec=codec,
+            on_close=lambda conn: self._remove(chat_id, user_id, conn),
+            batch_window=batch_window_for(websocket),
+        )
+        if hold:
+            connection.hold()
+        chat_conns = self.shard_for(chat_id).connections.setdefault(chat_id, {})
+        previous = chat_conns.get(user_id)
+        chat_conns[user_id] = connection
+        if previous:
+            previous.close()
+        return connection
 
     def disconnect(self, chat_id: str, user_id: str):
-        chat_conns = self.active_connections.get(chat_id)
+        chat_conns = self.shard_for(chat_id).connections.get(chat_id)
         if chat_conns and user_id in chat_conns:
+            chat_conns[user_id].close()
+
+    def _remove(self, chat_id: str, user_id: str, connection: Connection):
+        shard = self.shard_for(chat_id)
+        chat_conns = shard.connections.get(chat_id)
+        if chat_conns and chat_conns.get(user_id) is connection:
             chat_conns.pop(user_id, None)
             if not chat_conns:
-                self.active_connections.pop(chat_id)
-
-    async def send_to_chat(self, chat_id: str, message: dict):
-        chat_conns = self.active_connections.get(chat_id, {})
-        for ws in chat_conns.values():
-            await ws.send_json(message)
-
-    async def send_to_others(self, chat_id: str, sender_id: str, message: dict):
-        chat_conns = self.active_connections.get(chat_id, {})
-        for uid, ws in chat_conns.items():
-            if uid != sender_id:
-                await ws.send_json(message)
+                shard.connections.pop(chat_id)
+
+    def replay_since(self, chat_id: str, message_id: str) -> list[EventFrame] | None:
+        return self.shard_for(chat_id).replay.since(chat_id, message_id)
+
+    def connections(self) -> Iterator[Connection]:
+        for shard in self.shards:
+            for chat_conns in shard.connections.values():
+                yield from chat_conns.values()
+
+    def stats(self) -> dict:
+        shards = [shard.stats() for shard in self.shards]
+        return {
+            "chats": sum(s["chats"] for s in shards),
+            "connections": sum(s["connections"] for s in shards),
+            "queued_frames": sum(s["queued_frames"] for s in shards),
+            "shards": shards,
+        }
+
+    async def send_to_chat(self, chat_id: str, frame: EventFrame):
+        await self.shard_for(chat_id).enqueue(chat_id, None, frame)
+
+    async def send_to_others(self, chat_id: str, sender_id: str, frame: EventFrame):
+        await self.shard_for(chat_id).enqueue(chat_id, sender_id, frame)
+
+    async def flush(self) -> None:
+        for shard in self.shards:
+            await shard.flush()
+
+    async def stop(self) -> None:
+        for shard in self.shards:
+            await shard.stop()
@@ -0,0 +1,179 @@
+import asyncio
+import logging
+import os
+import time
+from collections import deque
+from itertools import islice
+from typing import Callable
+
+from fastapi import WebSocket
+from starlette.status import WS_1013_TRY_AGAIN_LATER
+
+from app.ws.codecs import Codec, json_codec
+from app.ws.frames import EventFrame
+
+logger = logging.getLogger("app")
+
+DEFAULT_SEND_QUEUE_SIZE = int(os.getenv("WS_SEND_QUEUE_SIZE", "256"))
+DEFAULT_BATCH_WINDOW = int(os.getenv("WS_BATCH_WINDOW_MS", "15")) / 1000
+DEFAULT_BATCH_MAX_EVENTS = int(os.getenv("WS_BATCH_MAX_EVENTS", "50"))
+DEFAULT_REPLAY_DEDUPE_WINDOW = 5.0
+
+
+def batch_window_for(websocket: WebSocket) -> float:
+    if websocket.query_params.get("batch") in ("1", "true"):
+        return DEFAULT_BATCH_WINDOW
+    return 0
+
+
+class Connection:
+    __slots__ = (
+        "websocket",
+        "codec",
+        "max_queue_size",
+        "batch_window",
+        "batch_max_events",
+        "on_close",
+        "closed",
+        "last_seen",
+        "_held",
+        "_skip",
+        "_pending",
+        "_writer",
+    )
+
+    def __init__(
+        self,
+        websocket: WebSocket,
+        codec: Codec = json_codec,
+        max_queue_size: int = DEFAULT_SEND_QUEUE_SIZE,
+        on_close: Callable[["Connection"], None] | None = None,
+        batch_window: float = 0,
+        batch_max_events: int = DEFAULT_BATCH_MAX_EVENTS,
+    ):
+        self.websocket = websocket
+        self.codec = codec
+        self.max_queue_size = max_queue_size
+        self.batch_window = batch_window
+        self.batch_max_events = batch_max_events
+        self.on_close = on_close
+        self.closed = False
+        self.last_seen = time.monotonic()
+        self._held = False
+        self._skip: set[str] | None = None
+        self._pending: deque[EventFrame] | None = None
+        self._writer: asyncio.Task | None = None
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._pending) if self._pending else 0
+
+    async def receive(self) -> dict:
+        message = await self.codec.receive(self.websocket)
+        self.last_seen = time.monotonic()
+        return message
+
+    def touch(self) -> None:
+        self.last_seen = time.monotonic()
+
+    def hold(self) -> None:
+        self._held = True
+
+    def release(
+        self,
+        replay: list[EventFrame],
+        skip: set[str] | None = None,
+        skip_for: float = DEFAULT_REPLAY_DEDUPE_WINDOW,
+    ) -> None:
+        self._held = False
+        if self.closed:
+            return
+        if self._pending is None:
+            self._pending = deque()
+        queued = {frame.message_id for frame in self._pending}
+        self._pending.extendleft(
+            reversed([frame for frame in replay if frame.message_id not in queued])
+        )
+        if skip:
+            self._skip = skip - queued
+            asyncio.get_running_loop().call_later(skip_for, self._clear_skip)
+        if self._pending and self._writer is None:
+            self._writer = asyncio.create_task(self._write_pending())
+
+    def _clear_skip(self) -> None:
+        self._skip = None
+
+    def send(self, frame: EventFrame) -> bool:
+        if self.closed:
+            return False
+        if self._skip and frame.message_id in self._skip:
+            self._skip.discard(frame.message_id)
+            return True
+        if self._pending is None:
+            self._pending = deque()
+        elif len(self._pending) >= self.max_queue_size:
+            logger.warning(
+                f"WebSocket send queue full ({self.max_queue_size}), "
+                "dropping slow consumer"
+            )
+            self.close(code=WS_1013_TRY_AGAIN_LATER)
+            return False
+        self._pending.append(frame)
+        if self._writer is None and not self._held:
+            self._writer = asyncio.create_task(self._write_pending())
+        return True
+
+    async def flush(self) -> None:
+        while self._writer is not None and not self.closed:
+            await asyncio.wait({self._writer})
+
+    def close(self, code: int | None = None) -> None:
+        if self.closed:
+            return
+        self.closed = True
+        self._pending = None
+        if self._writer is not None and self._writer is not asyncio.current_task():
+            self._writer.cancel()
+        if self.on_close:
+            self.on_close(self)
+        if code is not None:
+            asyncio.create_task(self._close_socket(code))
+
+    async def _close_socket(self, code: int) -> None:
+        try:
+            await self.websocket.close(code=code)
+        except Exception as e:
+            logger.debug(f"WebSocket close failed: {e}")
+
+    async def _write_pending(self) -> None:
+        try:
+            while self._pending:
+                if self.batch_window:
+                    await self._write_batch()
+                    continue
+                data = self._pending[0].encode(self.codec)
+                await self.codec.send(self.websocket, data)
+                if self._pending:
+                    self._pending.popleft()
+        except Exception as e:
+            logger.info(f"WebSocket send failed, closing connection: {e}")
+            self.close()
+        finally:
+            self._writer = None
+            if not self._pending:
+                self._pending = None
+
+    async def _write_batch(self) -> None:
+        if len(self._pending) < self.batch_max_events:
+            await asyncio.sleep(self.batch_window)
+            if not self._pending:
+                return
+        count = min(len(self._pending), self.batch_max_events)
+        data = self.codec.encode_batch(
+            [frame.encode(self.codec) for frame in islice(self._pending, count)]
+        )
+        await self.codec.send(self.websocket, data)
+        for _ in range(count):
+            if not self._pending:
+                break
+            self._pending.popleft()
@@ -1,21 +1,65 @@
-from typing import Dict
+from typing import Callable, Dict, Iterator, Set
 
 from fastapi import WebSocket
 
+from app.ws.codecs import negotiate_codec
+from app.ws.frames import EventFrame
 from app.ws.managers.base_singleton import SingletonMeta
+from app.ws.managers.connection import Connection, batch_window_for
 
 
 class NotificationManager(metaclass=SingletonMeta):
     def __init__(self):
-        self.active_connections: Dict[str, WebSocket] = {}
+        self.active_connections: Dict[str, Set[Connection]] = {}
+        self.listeners: list[Callable[[str, bool], None]] = []
 
-    async def connect(self, user_id: str, websocket: WebSocket):
-        await websocket.accept()
-        self.active_connections[user_id] = websocket
+    async def connect(self, user_id: str, websocket: WebSocket) -> Connection:
+        codec, subprotocol = negotiate_codec(websocket)
+        await websocket.accept(subprotocol=subprotocol)
+        connection = Connection(
+            websocket,
+            codec=codec,
+            on_close=lambda conn: self._remove(user_id, conn),
+            batch_window=batch_window_for(websocket),
+        )
+        connections = self.active_connections.setdefault(user_id, set())
+        connections.add(connection)
+        if len(connections) == 1:
+            self._notify(user_id, True)
+        return connection
 
-    def disconnect(self, user_id: str):
-        self.active_connections.pop(user_id, None)
+    def disconnect(self, user_id: str, connection: Connection | None = None):
+        connections = self.active_connections.get(user_id)
+        if not connections:
+            return
+        for conn in [connection] if connection else list(connections):
+            conn.close()
 
-    async def send_to_user(self, user_id: str, message: dict):
-        if user_id in self.active_connections:
-            await self.active_connections[user_id].send_json(message)
+    def _remove(self, user_id: str, connection: Connection):
+        connections = self.active_connections.get(user_id)
+        if connections is None:
+            return
+        connections.discard(connection)
+        if not connections:
+            self.active_connections.pop(user_id, None)
+            self._notify(user_id, False)
+
+    def _notify(self, user_id: str, online: bool):
+        for listener in self.listeners:
+            listener(user_id, online)
+
+    def connections(self) -> Iterator[Connection]:
+        for connections in self.active_connections.values():
+            yield from connections
+
+    def stats(self) -> dict:
+        connections = list(self.connections())
+        return {
+            "users": len(self.active_connections),
+            "connections": len(connections),
+            "queued_frames": sum(conn.queue_depth for conn in connections),
+        }
+
+    async def send_to_user(self, user_id: str, frame: EventFrame):
+        for connection in list(self.active_connections.get(user_id, ())):
+            connection.send(frame)
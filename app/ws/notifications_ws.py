@@ -1,37 +1,80 @@
 import logging
 
 from fastapi import APIRouter, Depends, WebSocket, WebSocketDisconnect
+from pydantic import ValidationError
 
 from app.dependencies.jwt import get_jwt_service
-from app.dependencies.websockets import get_notification_manager
+from app.dependencies.websockets import get_notification_manager, get_presence_tracker
 from app.infrastructure.jwt_service import JWTService, UserTokenPayload
+from app.schemas.base_event import WebSocketEvent
+from app.schemas.ws_payloads import ErrorPayload, PresenceSubscribePayload
+from app.ws.enums import WebSocketEventType
+from app.ws.frames import EventFrame
+from app.ws.managers.connection import Connection
 from app.ws.managers.notification_manager import NotificationManager
+from app.ws.presence import PresenceTracker, presence_frame
 
 router = APIRouter()
 logger = logging.getLogger("app")
 
 
+def handle_presence_event(
+    raw: dict, user_id: str, connection: Connection, presence: PresenceTracker
+):
+    try:
+        event = WebSocketEvent[PresenceSubscribePayload](**raw)
+    except ValidationError as e:
+        connection.send(
+            EventFrame.from_event(
+                WebSocketEvent[ErrorPayload](
+                    type=WebSocketEventType.ERROR,
+                    data=ErrorPayload(detail=f"Invalid {raw.get('type')} event"),
+                )
+            )
+        )
+        logger.info(f"Rejected WebSocket event: {e}")
+        return
+
+    user_ids = [str(uid) for uid in event.data.user_ids]
+    if event.type == WebSocketEventType.PRESENCE_UNSUBSCRIBE:
+        presence.unwatch(user_id, user_ids)
+        return
+    added = presence.watch(user_id, user_ids)
+    if added:
+        connection.send(presence_frame(presence.lookup(added)))
+
+
 @router.websocket("/ws/notifications")
 async def websocket_notifications(
     websocket: WebSocket,
     jwt_service: JWTService = Depends(get_jwt_service),
     manager: NotificationManager = Depends(get_notification_manager),
+    presence: PresenceTracker = Depends(get_presence_tracker),
 ):
     token = websocket.query_params.get("token")
     user_id: str | None = None
+    connection: Connection | None = None
 
     try:
         user_data: UserTokenPayload = jwt_service.verify_token(token)
-        await manager.connect(user_data.sub, websocket)
+        user_id = user_data.sub
+        connection = await manager.connect(user_id, websocket)
 
         while True:
-            await websocket.receive_text()
+            raw = await connection.receive()
+            if raw.get("type") in (
+                WebSocketEventType.PRESENCE_SUBSCRIBE,
+                WebSocketEventType.PRESENCE_UNSUBSCRIBE,
+            ):
+                handle_presence_event(raw, user_id, connection, presence)
     except WebSocketDisconnect:
-        if user_id:
-            manager.disconnect(user_id)
+        if connection:
+            manager.disconnect(user_id, connection)
             logger.info(f"WebSocket disconnected: user_id={user_id}")
 
     except Exception as e:
         logger.exception(f"WebSocket error : {e}")
+        if connection:
+            manager.disconnect(user_id, connection)
 
         await websocket.close(code=1008)
@@ -0,0 +1,273 @@
+import asyncio
+import logging
+import os
+import time
+from typing import Callable, Iterable
+from uuid import uuid4
+
+from app.schemas.base_event import WebSocketEvent
+from app.schemas.user import MAX_PRESENCE_USERS, UserPresence
+from app.schemas.ws_payloads import PresencePayload
+from app.ws.backplane import Backplane
+from app.ws.enums import WebSocketEventType
+from app.ws.frames import EventFrame
+from app.ws.managers.notification_manager import NotificationManager
+
+logger = logging.getLogger("app")
+
+DEFAULT_PRESENCE_OFFLINE_GRACE = float(os.getenv("WS_PRESENCE_OFFLINE_GRACE", "5"))
+DEFAULT_PRESENCE_HEARTBEAT_INTERVAL = float(
+    os.getenv("WS_PRESENCE_HEARTBEAT_INTERVAL", "10")
+)
+DEFAULT_PRESENCE_WORKER_TIMEOUT = float(os.getenv("WS_PRESENCE_WORKER_TIMEOUT", "30"))
+PRESENCE_TOPIC = "presence"
+HEARTBEAT = "heartbeat"
+SYNC = "sync"
+SNAPSHOT = "snapshot"
+
+
+class PresenceTracker:
+    def __init__(
+        self,
+        notification_manager: NotificationManager,
+        backplane: Backplane | None = None,
+        offline_grace: float = DEFAULT_PRESENCE_OFFLINE_GRACE,
+        heartbeat_interval: float = DEFAULT_PRESENCE_HEARTBEAT_INTERVAL,
+        worker_timeout: float = DEFAULT_PRESENCE_WORKER_TIMEOUT,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.notification_manager = notification_manager
+        self.backplane = backplane
+        self.offline_grace = offline_grace
+        self.heartbeat_interval = heartbeat_interval
+        self.worker_timeout = worker_timeout
+        self.clock = clock
+        self.worker_id = uuid4().hex
+        self.published = 0
+        self._announced: set[str] = set()
+        self._online: dict[str, set[str]] = {}
+        self._workers: dict[str, set[str]] = {}
+        self._last_seen: dict[str, float] = {}
+        self._pending_offline: dict[str, asyncio.TimerHandle] = {}
+        self._watchers: dict[str, set[str]] = {}
+        self._watching: dict[str, set[str]] = {}
+        self._outbox: asyncio.Queue | None = None
+        self._task: asyncio.Task | None = None
+        self._heartbeat: asyncio.Task | None = None
+
+    def attach(self) -> None:
+        self.notification_manager.listeners.append(self._on_local_change)
+
+    def subscribe_to(self, backplane: Backplane) -> None:
+        backplane.subscribe(PRESENCE_TOPIC, self.apply)
+
+    def start(self) -> None:
+        if self._heartbeat is None:
+            self._heartbeat = asyncio.create_task(self._run())
+        # A worker that starts late asks the others which users they hold.
+        self._send({"kind": SYNC, "worker_id": self.worker_id, "target": None})
+
+    async def stop(self) -> None:
+        if self._heartbeat:
+            self._heartbeat.cancel()
+            await asyncio.gather(self._heartbeat, return_exceptions=True)
+            self._heartbeat = None
+        for handle in self._pending_offline.values():
+            handle.cancel()
+        self._pending_offline.clear()
+        for user_id in list(self._announced):
+            self._announce(user_id, False)
+        await self.flush()
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        self._outbox = None
+
+    async def flush(self) -> None:
+        if self._outbox is not None:
+            await self._outbox.join()
+
+    def lookup(self, user_ids: Iterable[str]) -> list[UserPresence]:
+        return [
+            UserPresence(user_id=user_id, online=user_id in self._online)
+            for user_id in user_ids
+        ]
+
+    def watch(self, subscriber_id: str, user_ids: Iterable[str]) -> list[str]:
+        watching = self._watching.setdefault(subscriber_id, set())
+        added = [
+            user_id for user_id in dict.fromkeys(user_ids) if user_id not in watching
+        ][: max(MAX_PRESENCE_USERS - len(watching), 0)]
+        for user_id in added:
+            watching.add(user_id)
+            self._watchers.setdefault(user_id, set()).add(subscriber_id)
+        if not watching:
+            self._watching.pop(subscriber_id)
+        return added
+
+    def unwatch(self, subscriber_id: str, user_ids: Iterable[str] | None = None):
+        watching = self._watching.get(subscriber_id)
+        if not watching:
+            return
+        for user_id in list(watching if user_ids is None else user_ids):
+            watching.discard(user_id)
+            watchers = self._watchers.get(user_id)
+            if watchers is not None:
+                watchers.discard(subscriber_id)
+                if not watchers:
+                    self._watchers.pop(user_id)
+        if not watching:
+            self._watching.pop(subscriber_id)
+
+    def stats(self) -> dict:
+        return {
+            "online_users": len(self._online),
+            "local_users": len(self._announced),
+            "workers": len(self._workers),
+            "pending_offline": len(self._pending_offline),
+            "subscribers": len(self._watching),
+            "watched_users": len(self._watchers),
+            "published": self.published,
+        }
+
+    async def apply(self, message: dict) -> None:
+        kind, worker_id = message.get("kind"), message["worker_id"]
+        if kind == SYNC:
+            if message["target"] == self.worker_id or (
+                message["target"] is None and worker_id != self.worker_id
+            ):
+                self._send_snapshot()
+            return
+
+        self._last_seen[worker_id] = self.clock()
+        if kind == HEARTBEAT:
+            # A count that does not add up means announcements were lost.
+            if len(self._workers.get(worker_id, ())) != message["users"]:
+                self._send(
+                    {"kind": SYNC, "worker_id": self.worker_id, "target": worker_id}
+                )
+        elif kind == SNAPSHOT:
+            await self._replace(worker_id, set(message["users"]))
+        else:
+            await self._set(worker_id, message["user_id"], message["online"])
+
+    async def run_once(self) -> None:
+        self._send(
+            {
+                "kind": HEARTBEAT,
+                "worker_id": self.worker_id,
+                "users": len(self._announced),
+            }
+        )
+        deadline = self.clock() - self.worker_timeout
+        for worker_id, seen in list(self._last_seen.items()):
+            if worker_id != self.worker_id and seen < deadline:
+                logger.warning(f"Presence worker {worker_id} stopped heartbeating")
+                self._last_seen.pop(worker_id)
+                await self._replace(worker_id, set())
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.heartbeat_interval)
+            try:
+                await self.run_once()
+            except Exception as e:
+                logger.exception(f"Presence heartbeat failed: {e}")
+
+    async def _replace(self, worker_id: str, users: set[str]) -> None:
+        for user_id in self._workers.get(worker_id, set()) ^ users:
+            await self._set(worker_id, user_id, user_id in users)
+
+    async def _set(self, worker_id: str, user_id: str, online: bool) -> None:
+        was_online = user_id in self._online
+        if online:
+            self._online.setdefault(user_id, set()).add(worker_id)
+            self._workers.setdefault(worker_id, set()).add(user_id)
+        else:
+            holders = self._online.get(user_id)
+            if holders is not None:
+                holders.discard(worker_id)
+                if not holders:
+                    self._online.pop(user_id)
+            users = self._workers.get(worker_id)
+            if users is not None:
+                users.discard(user_id)
+                if not users:
+                    self._workers.pop(worker_id)
+        if was_online != (user_id in self._online):
+            await self._notify_watchers(user_id)
+
+    def _on_local_change(self, user_id: str, online: bool) -> None:
+        if online:
+            handle = self._pending_offline.pop(user_id, None)
+            if handle is not None:
+                handle.cancel()
+            elif user_id not in self._announced:
+                self._announce(user_id, True)
+            return
+
+        self.unwatch(user_id)
+        if user_id in self._announced and user_id not in self._pending_offline:
+            self._pending_offline[user_id] = asyncio.get_running_loop().call_later(
+                self.offline_grace, self._expire, user_id
+            )
+
+    def _expire(self, user_id: str) -> None:
+        self._pending_offline.pop(user_id, None)
+        if user_id not in self.notification_manager.active_connections:
+            self._announce(user_id, False)
+
+    def _announce(self, user_id: str, online: bool) -> None:
+        if online:
+            self._announced.add(user_id)
+        else:
+            self._announced.discard(user_id)
+        self._send({"user_id": user_id, "worker_id": self.worker_id, "online": online})
+
+    def _send_snapshot(self) -> None:
+        self._send(
+            {
+                "kind": SNAPSHOT,
+                "worker_id": self.worker_id,
+                "users": sorted(self._announced),
+            }
+        )
+
+    def _send(self, message: dict) -> None:
+        # One outbox keeps this worker's messages in the order they were made.
+        if self._outbox is None:
+            self._outbox = asyncio.Queue()
+        if self._task is None:
+            self._task = asyncio.create_task(self._publish())
+        self._outbox.put_nowait(message)
+
+    async def _publish(self) -> None:
+        while True:
+            message = await self._outbox.get()
+            try:
+                self.published += 1
+                if self.backplane is not None:
+                    await self.backplane.publish(PRESENCE_TOPIC, message)
+                else:
+                    await self.apply(message)
+            except Exception as e:
+                logger.exception(f"Presence publish failed: {e}")
+            finally:
+                self._outbox.task_done()
+
+    async def _notify_watchers(self, user_id: str) -> None:
+        watchers = self._watchers.get(user_id)
+        if not watchers:
+            return
+        frame = presence_frame(self.lookup([user_id]))
+        for subscriber_id in list(watchers):
+            await self.notification_manager.send_to_user(subscriber_id, frame)
+
+
+def presence_frame(users: list[UserPresence]) -> EventFrame:
+    return EventFrame.from_event(
+        WebSocketEvent[PresencePayload](
+            type=WebSocketEventType.PRESENCE, data=PresencePayload(users=users)
+        )
+    )
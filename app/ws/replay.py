@@ -0,0 +1,114 @@
+import logging
+import os
+from uuid import UUID
+
+from app.dependencies.db import db_session_scope
+from app.dependencies.services import get_membership_cache
+from app.models.message import Message
+from app.repositories.message_repository import MessageRepository
+from app.repositories.read_cursor_repository import ReadPosition
+from app.schemas.base_event import WebSocketEvent
+from app.schemas.ws_payloads import (
+    ErrorPayload,
+    NewMessagePayload,
+    ReplayTruncatedPayload,
+)
+from app.services.chat_service import ChatService
+from app.ws.enums import WebSocketEventType
+from app.ws.frames import EventFrame
+from app.ws.managers.chat_manager import ChatManager
+from app.ws.managers.connection import Connection
+
+logger = logging.getLogger("app")
+
+DEFAULT_REPLAY_MAX_MESSAGES = int(os.getenv("WS_REPLAY_MAX_MESSAGES", "500"))
+
+
+def _new_message_frame(message: Message) -> EventFrame:
+    return EventFrame.from_event(
+        WebSocketEvent[NewMessagePayload](
+            type=WebSocketEventType.NEW_MESSAGE,
+            data=NewMessagePayload(
+                message_id=message.id,
+                chat_id=message.chat_id,
+                sender_id=message.sender_id,
+                text=message.text,
+                timestamp=message.timestamp,
+            ),
+        )
+    )
+
+
+def _sent_by(frame: EventFrame, user_id: str) -> bool:
+    return str(frame.payload["data"].get("sender_id")) == user_id
+
+
+async def replay_missed_messages(
+    manager: ChatManager,
+    chat_id: UUID,
+    user_id: str,
+    connection: Connection,
+    last_seen: UUID,
+    max_messages: int = DEFAULT_REPLAY_MAX_MESSAGES,
+) -> None:
+    frames: list[EventFrame] = []
+    skip: set[str] | None = None
+    try:
+        if not await _has_access(chat_id, user_id):
+            return
+        buffered = manager.replay_since(str(chat_id), str(last_seen))
+        if buffered is not None:
+            frames = buffered
+        else:
+            frames = await _load_missed(chat_id, last_seen, max_messages)
+            skip = {frame.message_id for frame in frames if frame.message_id}
+    except Exception as e:
+        logger.exception(f"Replay failed: chat_id={chat_id}, error={e}")
+    finally:
+        connection.release(
+            [frame for frame in frames if not _sent_by(frame, user_id)], skip
+        )
+
+
+async def _has_access(chat_id: UUID, user_id: str) -> bool:
+    async with db_session_scope() as db:
+        chat_service = ChatService(db, get_membership_cache())
+        chat = await chat_service.get_by_id(chat_id)
+        return chat is not None and await chat_service.has_access_to_chat(chat, user_id)
+
+
+async def _load_missed(
+    chat_id: UUID, last_seen: UUID, max_messages: int
+) -> list[EventFrame]:
+    async with db_session_scope() as db:
+        repo = MessageRepository(db)
+        anchor = await repo.get_by_id(last_seen)
+        if anchor is None or anchor.chat_id != chat_id:
+            return [
+                EventFrame.from_event(
+                    WebSocketEvent[ErrorPayload](
+                        type=WebSocketEventType.ERROR,
+                        data=ErrorPayload(detail="Unknown last_seen message"),
+                    )
+                )
+            ]
+        messages = await repo.get_latest_after(
+            chat_id, ReadPosition.of_message(anchor), max_messages + 1
+        )
+
+    frames = [_new_message_frame(message) for message in messages[-max_messages:]]
+    if len(messages) > max_messages:
+        frames.insert(
+            0,
+            EventFrame.from_event(
+                WebSocketEvent[ReplayTruncatedPayload](
+                    type=WebSocketEventType.REPLAY_TRUNCATED,
+                    data=ReplayTruncatedPayload(
+                        chat_id=chat_id,
+                        last_seen=last_seen,
+                        first_replayed_message_id=messages[-max_messages].id,
+                    ),
+                )
+            ),
+        )
+    return frames
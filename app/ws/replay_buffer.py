@@ -0,0 +1,55 @@
+import os
+from collections import OrderedDict, deque
+from typing import Iterator
+
+from app.ws.enums import WebSocketEventType
+from app.ws.frames import EventFrame
+
+DEFAULT_REPLAY_BUFFER_SIZE = int(os.getenv("WS_REPLAY_BUFFER_SIZE", "256"))
+DEFAULT_REPLAY_MAX_CHATS = int(os.getenv("WS_REPLAY_MAX_CHATS", "1024"))
+
+
+class ReplayBuffer:
+    def __init__(
+        self,
+        size: int = DEFAULT_REPLAY_BUFFER_SIZE,
+        max_chats: int = DEFAULT_REPLAY_MAX_CHATS,
+    ):
+        self.size = size
+        self.max_chats = max_chats
+        self._chats: OrderedDict[str, deque[EventFrame]] = OrderedDict()
+
+    def record(self, chat_id: str, frame: EventFrame) -> None:
+        if frame.payload.get("type") != WebSocketEventType.NEW_MESSAGE:
+            return
+        frames = self._chats.get(chat_id)
+        if frames is None:
+            frames = self._chats[chat_id] = deque(maxlen=self.size)
+            if len(self._chats) > self.max_chats:
+                self._chats.popitem(last=False)
+        else:
+            self._chats.move_to_end(chat_id)
+        frames.append(frame)
+
+    def chats(self) -> Iterator[tuple[str, deque[EventFrame]]]:
+        return iter(self._chats.items())
+
+    def restore(self, chat_id: str, frames: deque[EventFrame]) -> None:
+        self._chats[chat_id] = deque(frames, maxlen=self.size)
+        if len(self._chats) > self.max_chats:
+            self._chats.popitem(last=False)
+
+    def discard(self, chat_id: str) -> None:
+        self._chats.pop(chat_id, None)
+
+    def since(self, chat_id: str, message_id: str) -> list[EventFrame] | None:
+        frames = self._chats.get(chat_id)
+        if not frames:
+            return None
+        for newer, frame in enumerate(reversed(frames)):
+            if frame.message_id == message_id:
+                return list(frames)[len(frames) - newer :]
+        return None
+
+    def recent(self, chat_id: str) -> list[EventFrame]:
+        return list(self._chats.get(chat_id, ()))
@@ -0,0 +1,58 @@
+import asyncio
+import os
+from typing import Awaitable, Callable
+
+DEFAULT_TYPING_WINDOW = float(os.getenv("WS_TYPING_WINDOW", "0.5"))
+PRUNE_THRESHOLD = 10_000
+
+TypingKey = tuple[str, str]
+TypingEmitter = Callable[[str, str, bool], Awaitable[None]]
+
+
+class TypingThrottler:
+    def __init__(self, emit: TypingEmitter, window: float = DEFAULT_TYPING_WINDOW):
+        self.emit = emit
+        self.window = window
+        self._last_sent: dict[TypingKey, float] = {}
+        self._pending: dict[TypingKey, bool] = {}
+        self._timers: dict[TypingKey, asyncio.TimerHandle] = {}
+
+    async def submit(self, chat_id: str, user_id: str, is_typing: bool) -> None:
+        key = (chat_id, user_id)
+        if key in self._timers:
+            self._pending[key] = is_typing
+            return
+
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        last = self._last_sent.get(key)
+        if last is None or now - last >= self.window:
+            await self._emit(key, is_typing)
+            return
+
+        self._pending[key] = is_typing
+        self._timers[key] = loop.call_later(
+            self.window - (now - last), self._flush, key
+        )
+
+    def _flush(self, key: TypingKey) -> None:
+        self._timers.pop(key, None)
+        is_typing = self._pending.pop(key, None)
+        if is_typing is not None:
+            asyncio.create_task(self._emit(key, is_typing))
+
+    async def _emit(self, key: TypingKey, is_typing: bool) -> None:
+        now = asyncio.get_running_loop().time()
+        self._last_sent[key] = now
+        if len(self._last_sent) > PRUNE_THRESHOLD:
+            self._prune(now)
+        await self.emit(key[0], key[1], is_typing)
+
+    def _prune(self, now: float) -> None:
+        expired = [
+            key
+            for key, last in self._last_sent.items()
+            if now - last >= self.window and key not in self._timers
+        ]
+        for key in expired:
+            del self._last_sent[key]
@@ -0,0 +1,31 @@
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import asyncio
+
+from app.db.session import async_session
+from app.repositories.chat_repository import ChatRepository
+
+BATCH_SIZE = 1000
+
+
+async def backfill(batch_size: int):
+    after_id, total = None, 0
+    while True:
+        # One short transaction per batch keeps row locks away from live writes.
+        async with async_session() as session:
+            chat_ids = await ChatRepository(session).backfill_summaries(
+                after_id, batch_size
+            )
+            await session.commit()
+        if not chat_ids:
+            break
+        after_id, total = chat_ids[-1], total + len(chat_ids)
+        print(f"Backfilled {total} chats (last id {after_id})")
+    print(f"Done, {total} chats checked")
+
+
+if __name__ == "__main__":
+    asyncio.run(backfill(int(sys.argv[1]) if len(sys.argv) > 1 else BATCH_SIZE))
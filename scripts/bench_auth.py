@@ -0,0 +1,91 @@
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import asyncio
+import tempfile
+import time
+from uuid import UUID, uuid4
+
+import httpx
+from fastapi import Depends, HTTPException
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.db.base import Base
+from app.dependencies.auth import get_current_user, oauth2_scheme
+from app.dependencies.db import get_db_async
+from app.infrastructure.jwt_service import JWTService, UserTokenPayload
+from app.main import app
+from app.models import User
+from app.repositories.user_repository import UserRepository
+
+REQUESTS = 5_000
+CONCURRENCY = 50
+
+
+async def uncached_current_user(token=Depends(oauth2_scheme), db=Depends(get_db_async)):
+    # The previous dependency: decode the token and load the user every time.
+    try:
+        payload = JWTService().verify_token(token.credentials)
+    except ValueError:
+        raise HTTPException(status_code=401, detail="Invalid token")
+    user = await UserRepository(db).get_by_id(UUID(payload.sub))
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+    return user
+
+
+async def requests_per_second(client: httpx.AsyncClient, token: str) -> float:
+    headers = {"Authorization": f"Bearer {token}"}
+    remaining = iter(range(REQUESTS))
+
+    async def worker():
+        for _ in remaining:
+            response = await client.get("/users/me", headers=headers)
+            response.raise_for_status()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(CONCURRENCY)))
+    return REQUESTS / (time.perf_counter() - start)
+
+
+async def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp}/bench.db")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        session_factory = async_sessionmaker(engine, expire_on_commit=False)
+
+        async def bench_db():
+            async with session_factory() as session:
+                yield session
+
+        user = User(id=uuid4(), name="bench", email="bench@example.com", password="x")
+        async with session_factory() as session:
+            session.add(user)
+            await session.commit()
+        token = JWTService().create_token(
+            UserTokenPayload(sub=str(user.id), name=user.name)
+        )
+
+        app.dependency_overrides[get_db_async] = bench_db
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://bench"
+        ) as client:
+            app.dependency_overrides[get_current_user] = uncached_current_user
+            before = await requests_per_second(client, token)
+            del app.dependency_overrides[get_current_user]
+            after = await requests_per_second(client, token)
+        app.dependency_overrides.clear()
+        await engine.dispose()
+
+    print(f"{'GET /users/me':<16} {'req/s':>10}")
+    print(f"{'uncached':<16} {before:>10.0f}")
+    print(f"{'cached':<16} {after:>10.0f}")
+    print(f"speedup: {after / before:.2f}x (SQLite in-process; no network round trip)")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
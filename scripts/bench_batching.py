@@ -0,0 +1,55 @@
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import asyncio
+import time
+
+from app.ws.frames import EventFrame
+from app.ws.managers.connection import Connection
+
+CONNECTIONS = 1_000
+EVENTS = 50
+BATCH_WINDOW = 0.015
+
+
+class FakeWebSocket:
+    def __init__(self):
+        self.frames = 0
+
+    async def send_text(self, data: str):
+        self.frames += 1
+        await asyncio.sleep(0)
+
+    async def close(self, code: int = 1000):
+        pass
+
+
+async def fan_out(batch_window: float) -> tuple[float, int]:
+    sockets = [FakeWebSocket() for _ in range(CONNECTIONS)]
+    connections = [
+        Connection(ws, max_queue_size=EVENTS, batch_window=batch_window)
+        for ws in sockets
+    ]
+    start = time.perf_counter()
+    for i in range(EVENTS):
+        frame = EventFrame({"type": "NEW_MESSAGE", "data": {"n": i}})
+        for connection in connections:
+            connection.send(frame)
+    await asyncio.gather(*(connection.flush() for connection in connections))
+    elapsed = (time.perf_counter() - start) * 1000
+    for connection in connections:
+        connection.close()
+    return elapsed, sum(ws.frames for ws in sockets)
+
+
+async def main():
+    print(f"{'mode':>10} {'elapsed ms':>12} {'frames':>10}")
+    for mode, window in (("single", 0), ("batched", BATCH_WINDOW)):
+        elapsed, frames = await fan_out(window)
+        print(f"{mode:>10} {elapsed:>12.1f} {frames:>10}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
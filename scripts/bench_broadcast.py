@@ -0,0 +1,65 @@
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import json
+import time
+from datetime import UTC, datetime
+from uuid import uuid4
+
+from fastapi.encoders import jsonable_encoder
+
+from app.schemas.base_event import WebSocketEvent
+from app.schemas.ws_payloads import NewMessagePayload
+from app.ws.enums import WebSocketEventType
+from app.ws.frames import EventFrame
+
+RECIPIENTS = [1, 100, 10_000]
+ROUNDS = 20
+
+
+def make_event() -> WebSocketEvent:
+    return WebSocketEvent[NewMessagePayload](
+        type=WebSocketEventType.NEW_MESSAGE,
+        data=NewMessagePayload(
+            message_id=str(uuid4()),
+            chat_id=str(uuid4()),
+            sender_id=str(uuid4()),
+            text="The quick brown fox jumps over the lazy dog " * 3,
+            timestamp=datetime.now(UTC),
+        ),
+    )
+
+
+def broadcast_per_recipient(event: WebSocketEvent, recipients: int):
+    # What starlette's send_json does for every socket on the old path.
+    message = jsonable_encoder(event)
+    for _ in range(recipients):
+        json.dumps(message, separators=(",", ":"), ensure_ascii=False)
+
+
+def broadcast_encoded_once(event: WebSocketEvent, recipients: int):
+    frame = EventFrame.from_event(event)
+    for _ in range(recipients):
+        frame.text
+
+
+def measure(fn, recipients: int) -> float:
+    event = make_event()
+    start = time.process_time()
+    for _ in range(ROUNDS):
+        fn(event, recipients)
+    return (time.process_time() - start) / ROUNDS * 1000
+
+
+def main():
+    print(f"{'recipients':>10} {'per-recipient ms':>18} {'encode-once ms':>16}")
+    for recipients in RECIPIENTS:
+        before = measure(broadcast_per_recipient, recipients)
+        after = measure(broadcast_encoded_once, recipients)
+        print(f"{recipients:>10} {before:>18.3f} {after:>16.3f}")
+
+
+if __name__ == "__main__":
+    main()
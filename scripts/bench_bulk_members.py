@@ -0,0 +1,117 @@
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import asyncio
+import tempfile
+import time
+from datetime import datetime
+from uuid import uuid4
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.db.base import Base
+from app.models import Message, User
+from app.repositories.read_cursor_repository import ReadPosition
+from app.services.group_service import GroupService
+
+GROUP_SIZES = [100, 1_000, 5_000]
+
+
+async def add_one_by_one(service: GroupService, group_id, user_ids):
+    # The previous approach: a membership check and an insert per user.
+    group = await service.repo.get_by_id(group_id)
+    for user_id in user_ids:
+        if await service.repo.is_member(group_id, user_id):
+            continue
+        await service.repo.add_member(group_id, user_id)
+        await service.read_cursors.move_to_latest(group.chat_id, user_id)
+
+
+async def remove_one_by_one(service: GroupService, group_id, user_ids):
+    group = await service.repo.get_by_id(group_id)
+    for user_id in user_ids:
+        if not await service.repo.remove_member(group_id, user_id):
+            continue
+        cursor = await service.read_cursors.get(group.chat_id, user_id)
+        await service.message_repo.release_reader(
+            group.chat_id, user_id, ReadPosition.of_cursor(cursor) if cursor else None
+        )
+
+
+async def timed(statements: list, operation) -> tuple[float, int]:
+    statements.clear()
+    start = time.perf_counter()
+    await operation
+    return (time.perf_counter() - start) * 1000, len(statements)
+
+
+async def measure(size: int) -> list[tuple[str, float, int, float, int]]:
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp}/bench.db")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        statements = []
+        event.listen(
+            engine.sync_engine,
+            "before_cursor_execute",
+            lambda *args: statements.append(args[2]),
+        )
+        session_factory = async_sessionmaker(engine, expire_on_commit=False)
+
+        results = []
+        async with session_factory() as db:
+            service = GroupService(db)
+            owner = User(id=uuid4(), name="owner", email="o@b.com", password="x")
+            db.add(owner)
+            old = await service.create_group("one by one", owner)
+            new = await service.create_group("bulk", owner)
+            for group in (old, new):
+                db.add(
+                    Message(
+                        chat_id=group.chat_id,
+                        sender_id=owner.id,
+                        text="hello",
+                        timestamp=datetime.utcnow(),
+                    )
+                )
+            await db.commit()
+            user_ids = [uuid4() for _ in range(size)]
+
+            loop_ms, loop_sql = await timed(
+                statements, add_one_by_one(service, old.id, user_ids)
+            )
+            bulk_ms, bulk_sql = await timed(
+                statements, service.add_members(new.id, user_ids)
+            )
+            results.append(("add", loop_ms, loop_sql, bulk_ms, bulk_sql))
+
+            loop_ms, loop_sql = await timed(
+                statements, remove_one_by_one(service, old.id, user_ids)
+            )
+            bulk_ms, bulk_sql = await timed(
+                statements, service.remove_members(new.id, user_ids)
+            )
+            results.append(("remove", loop_ms, loop_sql, bulk_ms, bulk_sql))
+
+        await engine.dispose()
+    return results
+
+
+async def main():
+    print(
+        f"{'members':>8} {'op':>7} {'loop ms':>10} {'loop sql':>9} "
+        f"{'bulk ms':>9} {'bulk sql':>9}"
+    )
+    for size in GROUP_SIZES:
+        for op, loop_ms, loop_sql, bulk_ms, bulk_sql in await measure(size):
+            print(
+                f"{size:>8} {op:>7} {loop_ms:>10.1f} {loop_sql:>9} "
+                f"{bulk_ms:>9.1f} {bulk_sql:>9}"
+            )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
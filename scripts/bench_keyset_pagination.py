@@ -0,0 +1,92 @@
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import asyncio
+import tempfile
+import time
+from uuid import uuid4
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.db.base import Base
+from app.models import User
+from app.repositories.message_repository import MessageRepository
+from app.repositories.read_cursor_repository import ReadPosition
+
+CHAT_SIZES = [1_000, 100_000, 10_000_000]
+PAGE_SIZE = 50
+ROUNDS = 20
+
+# Messages one second apart, generated inside SQLite so 10M rows stay cheap.
+FILL_CHAT = """
+WITH RECURSIVE n(i) AS (SELECT 0 UNION ALL SELECT i + 1 FROM n WHERE i + 1 < :size)
+INSERT INTO messages (id, chat_id, sender_id, text, timestamp, is_readed,
+                      read_count, readers_needed)
+SELECT printf('f%031x', i), :chat_id, :sender_id, 'message ' || i,
+       datetime('2024-01-01', '+' || i || ' seconds') || '.000000', 0, 0, 0
+FROM n
+"""
+
+
+async def measure(size: int) -> list[tuple[str, float, float]]:
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp}/bench.db")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        session_factory = async_sessionmaker(engine, expire_on_commit=False)
+
+        async with session_factory() as db:
+            sender = User(id=uuid4(), name="bench", email="b@b.com", password="x")
+            db.add(sender)
+            chat_id = uuid4()
+            await db.execute(
+                text(FILL_CHAT),
+                {"size": size, "chat_id": chat_id.hex, "sender_id": sender.id.hex},
+            )
+            await db.commit()
+            repo = MessageRepository(db)
+
+            results = []
+            for label, offset in (
+                ("newest", size - PAGE_SIZE),
+                ("middle", size // 2),
+                ("oldest", PAGE_SIZE),
+            ):
+                # The keyset page ends right where the offset page ends.
+                anchor = (await repo.get_by_chat_id(chat_id, offset, 1))[0]
+                before = ReadPosition.of_message(anchor)
+
+                start = time.perf_counter()
+                for _ in range(ROUNDS):
+                    by_offset = await repo.get_dtos_by_chat_id(
+                        chat_id, offset - PAGE_SIZE, PAGE_SIZE
+                    )
+                offset_ms = (time.perf_counter() - start) / ROUNDS * 1000
+
+                start = time.perf_counter()
+                for _ in range(ROUNDS):
+                    by_keyset = await repo.get_dtos_by_chat_id(
+                        chat_id, limit=PAGE_SIZE, before=before
+                    )
+                keyset_ms = (time.perf_counter() - start) / ROUNDS * 1000
+
+                assert [m.id for m in by_offset] == [m.id for m in by_keyset]
+                results.append((label, offset_ms, keyset_ms))
+
+        await engine.dispose()
+    return results
+
+
+async def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or CHAT_SIZES
+    print(f"{'messages':>10} {'page':>7} {'offset ms':>10} {'keyset ms':>10}")
+    for size in sizes:
+        for label, offset_ms, keyset_ms in await measure(size):
+            print(f"{size:>10} {label:>7} {offset_ms:>10.2f} {keyset_ms:>10.2f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,73 @@
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import asyncio
+import random
+import time
+import tracemalloc
+from uuid import uuid4
+
+from app.ws.frames import EventFrame
+from app.ws.managers.notification_manager import NotificationManager
+
+USERS = 100_000
+DEVICES = 3
+SENDS = 200_000
+
+
+class FakeWebSocket:
+    __slots__ = ("sent",)
+    scope = {}
+    query_params = {}
+
+    def __init__(self):
+        self.sent = 0
+
+    async def accept(self, subprotocol: str | None = None):
+        pass
+
+    async def send_text(self, data: str):
+        self.sent += 1
+
+
+async def main():
+    manager = NotificationManager()
+    user_ids = [str(uuid4()) for _ in range(USERS)]
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    for user_id in user_ids:
+        for _ in range(DEVICES):
+            await manager.connect(user_id, FakeWebSocket())
+    connect_time = time.perf_counter() - start
+    memory, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    connections = USERS * DEVICES
+    print(f"connections:          {connections}")
+    print(f"connect time:         {connect_time:.2f} s")
+    print(f"registry memory:      {memory / 1024 / 1024:.1f} MiB")
+    print(f"memory / connection:  {memory / connections:.0f} B")
+
+    frame = EventFrame({"type": "NEW_MESSAGE", "data": {"text": "hello"}})
+    frame.text
+    targets = [random.choice(user_ids) for _ in range(SENDS)]
+
+    start = time.perf_counter()
+    for user_id in targets:
+        await manager.send_to_user(user_id, frame)
+    enqueue_time = time.perf_counter() - start
+    for connections_ in manager.active_connections.values():
+        for connection in connections_:
+            await connection.flush()
+    total_time = time.perf_counter() - start
+
+    print(f"send_to_user calls:   {SENDS}")
+    print(f"enqueue throughput:   {SENDS / enqueue_time:,.0f} users/s")
+    print(f"delivered frames/s:   {SENDS * DEVICES / total_time:,.0f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,120 @@
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import asyncio
+import time
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.db.base import Base
+from app.models import Chat, ChatReadCursor, Group, Message
+from app.models.chat import ChatType
+from app.models.group import group_members
+from app.repositories.read_cursor_repository import ReadCursorRepository
+from app.services.group_service import GroupService
+from app.services.message_service import MessageService
+from app.services.socket_event_service import SocketEventService
+
+GROUP_SIZES = [10, 1_000, 50_000]
+READS = 50
+
+
+class NullSocketService(SocketEventService):
+    def __init__(self):
+        pass
+
+    async def send_notification(self, user_id, event):
+        pass
+
+
+async def setup_group(db: AsyncSession, size: int):
+    chat = Chat(name="bench", type=ChatType.public)
+    db.add(chat)
+    await db.flush()
+    group = Group(name="bench", owner_id=uuid4(), chat_id=chat.id, member_count=size)
+    db.add(group)
+    await db.flush()
+
+    member_ids = [uuid4() for _ in range(size)]
+    await db.execute(
+        insert(group_members),
+        [{"group_id": group.id, "user_id": uid} for uid in member_ids],
+    )
+    service = MessageService(db, GroupService(db), NullSocketService())
+    message = await service.create_message(
+        Message(
+            chat_id=chat.id,
+            sender_id=member_ids[0],
+            text="hello",
+            timestamp=datetime.utcnow() - timedelta(minutes=1),
+        )
+    )
+
+    # Half of the group has already read the message.
+    readers = member_ids[1 : size // 2]
+    if readers:
+        await db.execute(
+            insert(ChatReadCursor),
+            [
+                {
+                    "chat_id": chat.id,
+                    "user_id": uid,
+                    "last_read_message_id": message.id,
+                    "last_read_timestamp": message.timestamp,
+                    "updated_at": datetime.utcnow(),
+                }
+                for uid in readers
+            ],
+        )
+    message.read_count = len(readers)
+    await db.flush()
+    return group, message, member_ids[size // 2 :]
+
+
+async def read_with_member_scan(db: AsyncSession, group: Group, message: Message):
+    # The previous approach: load every member and every reader on each read.
+    members = await db.execute(
+        select(group_members.c.user_id).where(group_members.c.group_id == group.id)
+    )
+    readers = await ReadCursorRepository(db).get_reader_ids(message)
+    return {row[0] for row in members.all()}.issubset(set(readers))
+
+
+async def measure(size: int) -> tuple[float, float]:
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+
+    async with session_factory() as db:
+        group, message, unread = await setup_group(db, size)
+        service = MessageService(db, GroupService(db), NullSocketService())
+
+        start = time.perf_counter()
+        for _ in range(READS):
+            await read_with_member_scan(db, group, message)
+        scan = (time.perf_counter() - start) / READS * 1000
+
+        start = time.perf_counter()
+        for user_id in unread[:READS]:
+            await service.mark_as_read(message.id, user_id)
+        counter = (time.perf_counter() - start) / min(READS, len(unread)) * 1000
+
+    await engine.dispose()
+    return scan, counter
+
+
+async def main():
+    print(f"{'members':>8} {'member scan ms':>16} {'counter ms':>12}")
+    for size in GROUP_SIZES:
+        scan, counter = await measure(size)
+        print(f"{size:>8} {scan:>16.2f} {counter:>12.2f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
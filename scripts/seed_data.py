@@ -13,6 +13,7 @@ from app.db.session import async_session
 from app.models import Chat, Group, Message, User
 from app.models.chat import ChatType
 from app.models.group import group_members
+from app.repositories.chat_repository import ChatRepository, private_pair_key
 
 faker = Faker()
 
@@ -33,9 +34,14 @@ async def seed():
             print(f"👤 {u.name} ({u.email}) — ID: {u.id}")
 
         print("💬 Creating private chat...")
-        private_chat = Chat(name="PrivateChat", type=ChatType.private)
-        session.add(private_chat)
-        await session.flush()
+        private_chat = Chat(
+            name="PrivateChat",
+            type=ChatType.private,
+            pair_key=private_pair_key(users[0].id, users[1].id),
+        )
+        await ChatRepository(session).create_private_chat(
+            private_chat, {users[0].id, users[1].id}
+        )
         print(f"🔗 Private chat ID: {private_chat.id}")
 
         session.add_all(
@@ -4,6 +4,7 @@ import pytest
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
 from app.db.base import Base
+from app.infrastructure.password_hasher import PasswordHasher
 from app.models import *
 
 DATABASE_URL = "sqlite+aiosqlite:///:memory:"
@@ -34,3 +35,38 @@ async def db_session():
     async with AsyncSessionLocal() as session:
         yield session
         await session.rollback()
+
+
+@pytest.fixture(scope="session")
+def password_hasher():
+    hasher = PasswordHasher(workers=2)
+    yield hasher
+    hasher.shutdown()
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+class CountingLoader:
+    def __init__(self, result):
+        self.result = result
+        self.calls = 0
+
+    async def __call__(self, key):
+        self.calls += 1
+        return self.result
+
+
+@pytest.fixture
+def make_loader():
+    return CountingLoader
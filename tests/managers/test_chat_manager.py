@@ -1,21 +1,29 @@
+import asyncio
 from unittest.mock import AsyncMock, MagicMock
+from uuid import uuid4
 
 import pytest
 
-from app.ws.managers.chat_manager import ChatManager
+from app.ws.frames import EventFrame
+from app.ws.managers.chat_manager import ChatManager, ChatShard
 
 
 @pytest.fixture
-def manager():
+async def manager():
     ChatManager._instances.clear()
-    return ChatManager()
+    manager = ChatManager()
+    yield manager
+    for connection in list(manager.connections()):
+        connection.close()
+    await manager.stop()
+    await asyncio.sleep(0)
 
 
 @pytest.fixture
 def mock_websocket():
     ws = MagicMock()
     ws.accept = AsyncMock()
-    ws.send_json = AsyncMock()
+    ws.send_text = AsyncMock()
     return ws
 
 
@@ -41,10 +49,13 @@ async def test_send_to_chat(manager, mock_websocket):
     await manager.connect("chat1", "user1", mock_websocket)
     await manager.connect("chat1", "user2", mock_websocket)
 
-    msg = {"type": "test", "data": "hello"}
+    msg = EventFrame({"type": "test", "data": "hello"})
     await manager.send_to_chat("chat1", msg)
+    await manager.flush()
+    for connection in manager.active_connections["chat1"].values():
+        await connection.flush()
 
-    assert mock_websocket.send_json.await_count == 2
+    assert mock_websocket.send_text.await_count == 2
 
 
 @pytest.mark.asyncio
@@ -52,7 +63,140 @@ async def test_send_to_others(manager, mock_websocket):
     await manager.connect("chat1", "user1", mock_websocket)
     await manager.connect("chat1", "user2", mock_websocket)
 
-    msg = {"type": "test", "data": "secret"}
+    msg = EventFrame({"type": "test", "data": "secret"})
     await manager.send_to_others("chat1", "user1", msg)
+    await manager.flush()
+    for connection in manager.active_connections["chat1"].values():
+        await connection.flush()
 
-    assert mock_websocket.send_json.await_count == 1
+    assert mock_websocket.send_text.await_count == 1
+
+
+@pytest.mark.asyncio
+async def test_reconnect_replaces_previous_connection(manager, mock_websocket):
+    first = await manager.connect("chat1", "user1", mock_websocket)
+    second = await manager.connect("chat1", "user1", mock_websocket)
+
+    assert first.closed
+    assert manager.active_connections["chat1"]["user1"] is second
+
+    first.close()
+    assert manager.active_connections["chat1"]["user1"] is second
+
+
+@pytest.mark.asyncio
+async def test_slow_consumer_does_not_block_others(manager):
+    blocked = asyncio.Event()
+    slow_started = asyncio.Event()
+
+    async def block(_):
+        slow_started.set()
+        await blocked.wait()
+
+    slow_ws = MagicMock()
+    slow_ws.accept = AsyncMock()
+    slow_ws.close = AsyncMock()
+    slow_ws.send_text = AsyncMock(side_effect=block)
+
+    fast_ws = MagicMock()
+    fast_ws.accept = AsyncMock()
+    fast_ws.send_text = AsyncMock()
+
+    slow = await manager.connect("chat1", "slow", slow_ws)
+    fast = await manager.connect("chat1", "fast", fast_ws)
+
+    await manager.send_to_chat("chat1", EventFrame({"type": "test"}))
+    await manager.flush()
+    await fast.flush()
+    await asyncio.wait_for(slow_started.wait(), 1)
+
+    assert fast_ws.send_text.await_count == 1
+    assert slow_ws.send_text.await_count == 1
+    assert slow._writer is not None and not slow._writer.done()
+
+    blocked.set()
+    await slow.flush()
+    assert slow._writer is None
+
+
+@pytest.mark.asyncio
+async def test_chats_are_spread_across_shards(manager, mock_websocket):
+    for i in range(64):
+        await manager.connect(f"chat{i}", "user1", mock_websocket)
+
+    stats = manager.stats()
+    assert stats["connections"] == 64
+    assert len(stats["shards"]) == len(manager.shards)
+    assert sum(1 for shard in stats["shards"] if shard["chats"]) > 1
+
+
+@pytest.mark.asyncio
+async def test_hot_chat_does_not_starve_other_shards(manager):
+    hot_ws, quiet_ws = MagicMock(), MagicMock()
+    for ws in (hot_ws, quiet_ws):
+        ws.accept = AsyncMock()
+        ws.send_text = AsyncMock()
+    hot_chat = "hot"
+    quiet_chat = next(
+        f"quiet{i}"
+        for i in range(100)
+        if manager.shard_for(f"quiet{i}") is not manager.shard_for(hot_chat)
+    )
+    for i in range(2000):
+        await manager.connect(hot_chat, f"user{i}", hot_ws)
+    quiet = await manager.connect(quiet_chat, "user1", quiet_ws)
+
+    await manager.send_to_chat(hot_chat, EventFrame({"type": "hot"}))
+    await manager.send_to_chat(quiet_chat, EventFrame({"type": "quiet"}))
+    await manager.shard_for(quiet_chat).flush()
+    await quiet.flush()
+
+    assert quiet_ws.send_text.await_count == 1
+    assert manager.shard_for(hot_chat).latency.count == 0
+    await manager.flush()
+    assert manager.shard_for(hot_chat).latency.count == 1
+
+
+@pytest.mark.asyncio
+async def test_resize_rehashes_connections(manager, mock_websocket):
+    connection = await manager.connect("chat1", "user1", mock_websocket)
+
+    await manager.resize(3)
+
+    assert len(manager.shards) == 3
+    assert manager.shard_for("chat1").connections["chat1"]["user1"] is connection
+    manager.disconnect("chat1", "user1")
+    assert "chat1" not in manager.active_connections
+
+
+def new_message():
+    return EventFrame({"type": "NEW_MESSAGE", "data": {"message_id": uuid4()}})
+
+
+@pytest.mark.asyncio
+async def test_resize_keeps_replay_buffers(manager):
+    frames = [new_message() for _ in range(3)]
+    for frame in frames:
+        await manager.send_to_chat("chat1", frame)
+    await manager.flush()
+
+    await manager.resize(3)
+
+    assert manager.replay_since("chat1", frames[0].message_id) == frames[1:]
+
+
+@pytest.mark.asyncio
+async def test_full_shard_queue_drops_frame_without_waiting(manager, mock_websocket):
+    manager.shards = [ChatShard(queue_size=1)]
+    mock_websocket.close = AsyncMock()
+    first = new_message()
+    await manager.send_to_chat("chat1", first)
+    await manager.flush()
+    connection = await manager.connect("chat1", "user1", mock_websocket)
+
+    await manager.send_to_chat("chat1", new_message())
+    await manager.send_to_chat("chat1", new_message())
+
+    assert connection.closed
+    assert manager.stats()["shards"][0]["dropped_frames"] == 1
+    assert manager.replay_since("chat1", first.message_id) is None
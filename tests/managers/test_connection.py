@@ -0,0 +1,120 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.ws.frames import EventFrame
+from app.ws.managers.connection import Connection
+
+
+@pytest.fixture
+def mock_websocket():
+    ws = MagicMock()
+    ws.send_text = AsyncMock()
+    ws.close = AsyncMock()
+    return ws
+
+
+@pytest.mark.asyncio
+async def test_send_preserves_order(mock_websocket):
+    connection = Connection(mock_websocket)
+
+    for i in range(5):
+        connection.send(EventFrame({"n": i}))
+    await connection.flush()
+
+    sent = [call.args[0] for call in mock_websocket.send_text.await_args_list]
+    assert sent == [f'{{"n":{i}}}' for i in range(5)]
+    connection.close()
+
+
+@pytest.mark.asyncio
+async def test_queue_overflow_closes_connection(mock_websocket):
+    closed = []
+    connection = Connection(mock_websocket, max_queue_size=2, on_close=closed.append)
+
+    assert connection.send(EventFrame({"n": 1}))
+    assert connection.send(EventFrame({"n": 2}))
+    assert connection.send(EventFrame({"n": 3})) is False
+
+    await asyncio.sleep(0)
+
+    assert connection.closed
+    assert closed == [connection]
+    mock_websocket.close.assert_awaited_once()
+    assert connection.send(EventFrame({"n": 4})) is False
+
+
+@pytest.mark.asyncio
+async def test_send_failure_closes_connection(mock_websocket):
+    mock_websocket.send_text.side_effect = RuntimeError("broken pipe")
+    closed = []
+    connection = Connection(mock_websocket, on_close=closed.append)
+
+    connection.send(EventFrame({"n": 1}))
+    await connection.flush()
+
+    assert connection.closed
+    assert closed == [connection]
+
+
+@pytest.mark.asyncio
+async def test_batching_coalesces_events_into_one_frame(mock_websocket):
+    connection = Connection(mock_websocket, batch_window=0.01)
+
+    for i in range(3):
+        connection.send(EventFrame({"n": i}))
+    await connection.flush()
+
+    mock_websocket.send_text.assert_awaited_once_with('[{"n":0},{"n":1},{"n":2}]')
+    connection.close()
+
+
+@pytest.mark.asyncio
+async def test_batching_splits_at_max_events(mock_websocket):
+    connection = Connection(mock_websocket, batch_window=0.01, batch_max_events=2)
+
+    for i in range(5):
+        connection.send(EventFrame({"n": i}))
+    await connection.flush()
+
+    sent = [call.args[0] for call in mock_websocket.send_text.await_args_list]
+    assert sent == ['[{"n":0},{"n":1}]', '[{"n":2},{"n":3}]', '[{"n":4}]']
+    connection.close()
+
+
+@pytest.mark.asyncio
+async def test_release_sends_replay_before_live_without_duplicates(mock_websocket):
+    connection = Connection(mock_websocket)
+    connection.hold()
+    missed = EventFrame({"type": "NEW_MESSAGE", "data": {"message_id": "m1"}})
+    both = EventFrame({"type": "NEW_MESSAGE", "data": {"message_id": "m2"}})
+    live = EventFrame({"type": "NEW_MESSAGE", "data": {"message_id": "m3"}})
+
+    connection.send(both)
+    connection.send(live)
+    await asyncio.sleep(0)
+    mock_websocket.send_text.assert_not_awaited()
+
+    connection.release([missed, both])
+    await connection.flush()
+
+    sent = [call.args[0] for call in mock_websocket.send_text.await_args_list]
+    assert sent == [missed.text, both.text, live.text]
+    connection.close()
+
+
+@pytest.mark.asyncio
+async def test_release_skips_replayed_messages_arriving_live(mock_websocket):
+    connection = Connection(mock_websocket)
+    connection.hold()
+    replayed = EventFrame({"type": "NEW_MESSAGE", "data": {"message_id": "m1"}})
+
+    connection.release([replayed], skip={"m1"})
+    assert connection.send(
+        EventFrame({"type": "NEW_MESSAGE", "data": {"message_id": "m1"}})
+    )
+    await connection.flush()
+
+    mock_websocket.send_text.assert_awaited_once_with(replayed.text)
+    connection.close()
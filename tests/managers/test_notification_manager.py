@@ -1,50 +1,85 @@
+import asyncio
 from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 
+from app.ws.frames import EventFrame
 from app.ws.managers.notification_manager import NotificationManager
 
 
 @pytest.fixture
-def manager():
+async def manager():
     NotificationManager._instances.clear()
-    return NotificationManager()
+    manager = NotificationManager()
+    yield manager
+    for connections in list(manager.active_connections.values()):
+        for connection in list(connections):
+            connection.close()
+    await asyncio.sleep(0)
 
 
-@pytest.fixture
-def mock_websocket():
+def make_websocket():
     ws = MagicMock()
     ws.accept = AsyncMock()
-    ws.send_json = AsyncMock()
+    ws.send_text = AsyncMock()
     return ws
 
 
+@pytest.fixture
+def mock_websocket():
+    return make_websocket()
+
+
 @pytest.mark.asyncio
 async def test_connect(manager, mock_websocket):
-    await manager.connect("user123", mock_websocket)
+    connection = await manager.connect("user123", mock_websocket)
 
     assert "user123" in manager.active_connections
-    assert manager.active_connections["user123"] is mock_websocket
+    assert manager.active_connections["user123"] == {connection}
+    assert connection.websocket is mock_websocket
     mock_websocket.accept.assert_awaited_once()
 
 
-def test_disconnect(manager, mock_websocket):
-    manager.active_connections["user123"] = mock_websocket
+@pytest.mark.asyncio
+async def test_disconnect(manager, mock_websocket):
+    await manager.connect("user123", mock_websocket)
     manager.disconnect("user123")
 
     assert "user123" not in manager.active_connections
 
 
 @pytest.mark.asyncio
-async def test_send_to_user(manager, mock_websocket):
-    manager.active_connections["user123"] = mock_websocket
+async def test_multiple_devices(manager):
+    phone, desktop = make_websocket(), make_websocket()
+    phone_conn = await manager.connect("user123", phone)
+    desktop_conn = await manager.connect("user123", desktop)
 
-    msg = {"type": "notification", "data": "test"}
-    await manager.send_to_user("user123", msg)
+    frame = EventFrame({"type": "notification", "data": "test"})
+    await manager.send_to_user("user123", frame)
+    await phone_conn.flush()
+    await desktop_conn.flush()
 
-    mock_websocket.send_json.assert_awaited_once_with(msg)
+    phone.send_text.assert_awaited_once_with(frame.text)
+    desktop.send_text.assert_awaited_once_with(frame.text)
+
+    manager.disconnect("user123", phone_conn)
+    assert manager.active_connections["user123"] == {desktop_conn}
+
+    manager.disconnect("user123", desktop_conn)
+    assert "user123" not in manager.active_connections
+
+
+@pytest.mark.asyncio
+async def test_failed_send_removes_connection(manager, mock_websocket):
+    mock_websocket.send_text.side_effect = RuntimeError("gone")
+    connection = await manager.connect("user123", mock_websocket)
+
+    await manager.send_to_user("user123", EventFrame({"data": "test"}))
+    await connection.flush()
+
+    assert "user123" not in manager.active_connections
 
 
 @pytest.mark.asyncio
 async def test_send_to_user_user_not_connected(manager):
-    await manager.send_to_user("unknown_user", {"data": "noop"})
+    await manager.send_to_user("unknown_user", EventFrame({"data": "noop"}))
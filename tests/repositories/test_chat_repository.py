@@ -1,11 +1,15 @@
-from datetime import datetime
+from datetime import datetime, timedelta
 from uuid import uuid4
 
 import pytest
 
 from app.models import Chat, Message
 from app.models.chat import ChatType
-from app.repositories.chat_repository import ChatRepository
+from app.repositories.chat_repository import (
+    PREVIEW_LENGTH,
+    ChatRepository,
+    private_pair_key,
+)
 
 
 @pytest.mark.asyncio
@@ -45,28 +49,39 @@ async def test_get_by_ids(db_session):
     assert {c.id for c in result} == {chat1.id, chat2.id}
 
 
+async def create_private_chat(repo, user1, user2):
+    chat = Chat(
+        name="private", type=ChatType.private, pair_key=private_pair_key(user1, user2)
+    )
+    assert await repo.create_private_chat(chat, {user1, user2})
+    return chat
+
+
 @pytest.mark.asyncio
 async def test_get_private_chat_between_users(db_session):
     repo = ChatRepository(db_session)
+    user1, user2 = uuid4(), uuid4()
+
+    chat = await create_private_chat(repo, user1, user2)
 
-    chat = await repo.create(Chat(name="private", type=ChatType.private))
+    assert (await repo.get_private_chat_between_users(user1, user2)).id == chat.id
+    assert (await repo.get_private_chat_between_users(user2, user1)).id == chat.id
+    assert await repo.get_private_chat_between_users(user1, uuid4()) is None
+
+
+@pytest.mark.asyncio
+async def test_create_private_chat_once_per_pair(db_session):
+    repo = ChatRepository(db_session)
     user1, user2 = uuid4(), uuid4()
+    chat = await create_private_chat(repo, user1, user2)
 
-    db_session.add_all(
-        [
-            Message(
-                chat_id=chat.id, sender_id=user1, text="hi", timestamp=datetime.now()
-            ),
-            Message(
-                chat_id=chat.id, sender_id=user2, text="yo", timestamp=datetime.now()
-            ),
-        ]
+    duplicate = Chat(
+        name="again", type=ChatType.private, pair_key=private_pair_key(user2, user1)
     )
-    await db_session.flush()
+    assert not await repo.create_private_chat(duplicate, {user1, user2})
 
-    result = await repo.get_private_chat_between_users(user1, user2)
-    assert result is not None
-    assert result.id == chat.id
+    assert (await repo.get_private_chat_between_users(user1, user2)).id == chat.id
+    assert await repo.get_by_id(duplicate.id) is None
 
 
 @pytest.mark.asyncio
@@ -74,13 +89,8 @@ async def test_get_user_private_chats(db_session):
     repo = ChatRepository(db_session)
 
     user_id = uuid4()
-    chat = await repo.create(Chat(name="pchat", type=ChatType.private))
-    db_session.add(
-        Message(
-            chat_id=chat.id, sender_id=user_id, text="ping", timestamp=datetime.now()
-        )
-    )
-    await db_session.flush()
+    chat = await create_private_chat(repo, user_id, uuid4())
+    await create_private_chat(repo, uuid4(), uuid4())
 
     result = await repo.get_user_private_chats(user_id)
     assert len(result) == 1
@@ -94,27 +104,91 @@ async def test_chat_to_dto(db_session):
     chat = await repo.create(Chat(name="dto", type=ChatType.private))
     now = datetime.now()
 
-    db_session.add(
-        Message(chat_id=chat.id, sender_id=uuid4(), text="last", timestamp=now)
-    )
+    message = Message(chat_id=chat.id, sender_id=uuid4(), text="last", timestamp=now)
+    db_session.add(message)
     await db_session.flush()
+    await repo.record_last_message(message)
 
-    dto = await repo.chat_to_dto(chat)
+    dto = repo.chat_to_dto(chat)
     assert dto.id == chat.id
     assert dto.last_message_timestamp == now
+    assert dto.last_message_id == message.id
+    assert dto.last_message_sender_id == message.sender_id
+    assert dto.last_message_preview == "last"
 
 
 @pytest.mark.asyncio
-async def test_is_user_in_private_chat(db_session):
+async def test_record_last_message_only_moves_forward(db_session):
     repo = ChatRepository(db_session)
+    chat = await repo.create(Chat(name="summary", type=ChatType.private))
+    now = datetime.now()
 
-    chat = await repo.create(Chat(name="check", type=ChatType.private))
-    user_id = uuid4()
-
-    db_session.add(
-        Message(chat_id=chat.id, sender_id=user_id, text="yo", timestamp=datetime.now())
+    newer = Message(chat_id=chat.id, sender_id=uuid4(), text="newer", timestamp=now)
+    older = Message(
+        chat_id=chat.id,
+        sender_id=uuid4(),
+        text="x" * 500,
+        timestamp=now - timedelta(seconds=1),
     )
+    db_session.add_all([newer, older])
     await db_session.flush()
 
+    assert await repo.record_last_message(older)
+    assert chat.last_message_preview == "x" * PREVIEW_LENGTH
+    assert await repo.record_last_message(newer)
+    assert not await repo.record_last_message(older)
+    assert chat.last_message_id == newer.id
+    assert chat.last_message_at == now
+
+
+@pytest.mark.asyncio
+async def test_backfill_summaries(db_session):
+    repo = ChatRepository(db_session)
+    now = datetime.now()
+
+    chats = [
+        await repo.create(Chat(name=f"chat {i}", type=ChatType.private))
+        for i in range(3)
+    ]
+    for i, chat in enumerate(chats[:2]):
+        db_session.add_all(
+            Message(
+                chat_id=chat.id,
+                sender_id=uuid4(),
+                text=f"{chat.name} #{n}",
+                timestamp=now + timedelta(seconds=n),
+            )
+            for n in range(i + 2)
+        )
+    await db_session.flush()
+
+    chat_ids = sorted(chat.id for chat in chats)
+
+    processed, after_id = [], None
+    while batch := await repo.backfill_summaries(after_id, limit=2):
+        processed += batch
+        after_id = batch[-1]
+    assert processed == sorted(processed)
+    assert set(chat_ids) <= set(processed)
+
+    db_session.expire_all()
+    summaries = {
+        chat.name: (chat.last_message_preview, chat.last_message_at)
+        for chat in await repo.get_by_ids(chat_ids)
+    }
+    assert summaries == {
+        "chat 0": ("chat 0 #1", now + timedelta(seconds=1)),
+        "chat 1": ("chat 1 #2", now + timedelta(seconds=2)),
+        "chat 2": (None, None),
+    }
+
+
+@pytest.mark.asyncio
+async def test_is_user_in_private_chat(db_session):
+    repo = ChatRepository(db_session)
+
+    user_id = uuid4()
+    chat = await create_private_chat(repo, user_id, uuid4())
+
     assert await repo.is_user_in_private_chat(chat.id, user_id) is True
     assert await repo.is_user_in_private_chat(chat.id, uuid4()) is False
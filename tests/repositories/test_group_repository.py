@@ -44,6 +44,28 @@ async def test_remove_member(db_session):
     assert await repo.is_member(group.id, user_id) is False
 
 
+@pytest.mark.asyncio
+async def test_add_and_remove_members_in_bulk(db_session, monkeypatch):
+    monkeypatch.setattr("app.core.chunks.DEFAULT_CHUNK_SIZE", 2)
+    repo = GroupRepository(db_session)
+
+    group = await repo.create(Group(name="bulk", owner_id=uuid4(), chat_id=uuid4()))
+    existing = uuid4()
+    await repo.add_member(group.id, existing)
+    user_ids = [uuid4() for _ in range(5)]
+
+    added = await repo.add_members(group.id, [existing, *user_ids, user_ids[0]])
+    assert sorted(added) == sorted(user_ids)
+
+    removed = await repo.remove_members(group.id, [existing, user_ids[0], uuid4()])
+    assert sorted(removed) == sorted([existing, user_ids[0]])
+
+    group = await repo.get_by_id(group.id)
+    await db_session.refresh(group)
+    assert group.member_count == 4
+    assert sorted(await repo.list_members_id(group.id)) == sorted(user_ids[1:])
+
+
 @pytest.mark.asyncio
 async def test_list_members_and_ids(db_session):
     repo = GroupRepository(db_session)
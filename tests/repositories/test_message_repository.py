@@ -1,10 +1,12 @@
-from datetime import UTC, datetime
+from datetime import UTC, datetime, timedelta
 from uuid import uuid4
 
 import pytest
 
-from app.models import Group, Message
+from app.core.pagination import decode_cursor
+from app.models import Group, Message, User
 from app.repositories.message_repository import MessageRepository
+from app.repositories.read_cursor_repository import ReadPosition, ReadRange
 
 
 @pytest.mark.asyncio
@@ -44,49 +46,27 @@ async def test_get_by_chat_id(db_session):
 
 
 @pytest.mark.asyncio
-async def test_is_duplicate_message(db_session):
+async def test_create_once_rejects_reused_client_message_id(db_session):
     repo = MessageRepository(db_session)
     chat_id = uuid4()
     sender_id = uuid4()
-    timestamp = datetime.now(UTC)
 
-    await repo.create(
-        Message(
-            chat_id=chat_id, sender_id=sender_id, text="duplicate", timestamp=timestamp
+    def message(text):
+        return Message(
+            chat_id=chat_id,
+            sender_id=sender_id,
+            text=text,
+            timestamp=datetime.now(UTC),
+            client_message_id="key-1",
         )
-    )
-
-    assert (
-        await repo.is_duplicate_message(chat_id, sender_id, "duplicate", timestamp)
-        is True
-    )
-    assert (
-        await repo.is_duplicate_message(chat_id, sender_id, "another", timestamp)
-        is False
-    )
 
+    first = message("first")
+    assert await repo.create_once(first) is True
+    assert await repo.create_once(message("retry")) is False
 
-@pytest.mark.asyncio
-async def test_save_read_status_and_readers(db_session):
-    repo = MessageRepository(db_session)
-
-    message = Message(
-        chat_id=uuid4(),
-        sender_id=uuid4(),
-        text="read test",
-        timestamp=datetime.now(UTC),
-    )
-    await repo.create(message)
-
-    user_id = uuid4()
-
-    assert await repo.has_user_read(message.id, user_id) is False
-
-    await repo.save_read_status(message.id, user_id)
-
-    assert await repo.has_user_read(message.id, user_id) is True
-    readers = await repo.get_readers(message.id)
-    assert user_id in readers
+    original = await repo.get_by_client_message_id(sender_id, "key-1")
+    assert original.id == first.id
+    assert await repo.get_by_client_message_id(uuid4(), "key-1") is None
 
 
 @pytest.mark.asyncio
@@ -115,3 +95,124 @@ async def test_get_by_group_id(db_session):
 
     messages = await repo.get_by_group_id(group.id)
     assert len(messages) == 2
+
+
+@pytest.mark.asyncio
+async def test_get_latest_after(db_session):
+    repo = MessageRepository(db_session)
+    chat_id = uuid4()
+    start = datetime(2025, 5, 17, 12, 0, 0)
+    messages = [
+        await repo.create(
+            Message(
+                chat_id=chat_id,
+                sender_id=uuid4(),
+                text=f"msg-{i}",
+                timestamp=start + timedelta(seconds=i),
+            )
+        )
+        for i in range(5)
+    ]
+
+    latest = await repo.get_latest_after(
+        chat_id, ReadPosition.of_message(messages[1]), limit=2
+    )
+
+    assert [m.id for m in latest] == [messages[3].id, messages[4].id]
+
+
+@pytest.mark.asyncio
+async def test_get_by_chat_id_with_keyset_cursors(db_session):
+    repo = MessageRepository(db_session)
+    chat_id = uuid4()
+    start = datetime(2025, 5, 17, 12, 0, 0)
+    # Two messages share a timestamp so the id has to break the tie.
+    messages = [
+        await repo.create(
+            Message(
+                chat_id=chat_id,
+                sender_id=uuid4(),
+                text=f"msg-{i}",
+                timestamp=start + timedelta(seconds=min(i, 3)),
+            )
+        )
+        for i in range(6)
+    ]
+    ordered = sorted(messages, key=lambda m: (m.timestamp, m.id))
+
+    newest_page = await repo.get_by_chat_id(
+        chat_id, limit=2, before=ReadPosition.of_message(ordered[4])
+    )
+    assert [m.id for m in newest_page] == [ordered[2].id, ordered[3].id]
+
+    after = await repo.get_by_chat_id(
+        chat_id, limit=10, after=ReadPosition.of_message(ordered[3])
+    )
+    assert [m.id for m in after] == [ordered[4].id, ordered[5].id]
+
+    between = await repo.get_by_chat_id(
+        chat_id,
+        before=ReadPosition.of_message(ordered[5]),
+        after=ReadPosition.of_message(ordered[1]),
+    )
+    assert [m.id for m in between] == [m.id for m in ordered[2:5]]
+
+
+@pytest.mark.asyncio
+async def test_dto_cursor_pages_back_without_gaps(db_session):
+    repo = MessageRepository(db_session)
+    user = User(id=uuid4(), name="Sender", email="keyset@t.com", password="pw")
+    db_session.add(user)
+    await db_session.flush()
+    chat_id = uuid4()
+    start = datetime(2025, 5, 17, 12, 0, 0)
+    for i in range(5):
+        await repo.create(
+            Message(
+                chat_id=chat_id,
+                sender_id=user.id,
+                text=f"msg-{i}",
+                timestamp=start + timedelta(seconds=i),
+            )
+        )
+
+    page = await repo.get_recent_dtos(chat_id, 2)
+    seen = [m.text for m in page]
+    while page:
+        before = ReadPosition(*decode_cursor(page[0].cursor))
+        # A message arriving between pages must not shift older pages.
+        await repo.create(
+            Message(
+                chat_id=chat_id,
+                sender_id=user.id,
+                text="late",
+                timestamp=datetime.now(),
+            )
+        )
+        page = await repo.get_dtos_by_chat_id(chat_id, limit=2, before=before)
+        seen = [m.text for m in page] + seen
+
+    assert seen == [f"msg-{i}" for i in range(5)]
+
+
+@pytest.mark.asyncio
+async def test_add_reader_never_passes_readers_needed(db_session):
+    repo = MessageRepository(db_session)
+    message = await repo.create(
+        Message(
+            chat_id=uuid4(),
+            sender_id=uuid4(),
+            text="capped",
+            timestamp=datetime(2025, 1, 1),
+            readers_needed=1,
+        )
+    )
+    read_range = ReadRange(None, ReadPosition.of_message(message))
+
+    first = await repo.add_reader(message.chat_id, uuid4(), read_range)
+    second = await repo.add_reader(message.chat_id, uuid4(), read_range)
+
+    assert first == [(message.id, message.sender_id)]
+    assert second == []
+    await db_session.refresh(message)
+    assert message.read_count == 1
@@ -0,0 +1,106 @@
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+import pytest
+
+from app.models import Message
+from app.repositories.message_repository import MessageRepository
+from app.repositories.read_cursor_repository import ReadCursorRepository
+
+
+async def create_messages(db_session, chat_id, count, sender_id=None):
+    repo = MessageRepository(db_session)
+    start = datetime(2025, 5, 17, 12, 0, 0)
+    return [
+        await repo.create(
+            Message(
+                chat_id=chat_id,
+                sender_id=sender_id or uuid4(),
+                text=f"msg-{i}",
+                timestamp=start + timedelta(seconds=i),
+            )
+        )
+        for i in range(count)
+    ]
+
+
+@pytest.mark.asyncio
+async def test_advance_creates_and_moves_cursor_forward(db_session):
+    repo = ReadCursorRepository(db_session)
+    chat_id, user_id = uuid4(), uuid4()
+    messages = await create_messages(db_session, chat_id, 3)
+
+    first = await repo.advance(user_id, messages[1])
+    assert first.after is None
+    assert first.up_to.message_id == messages[1].id
+    assert await repo.advance(user_id, messages[0]) is None
+    assert await repo.advance(user_id, messages[1]) is None
+    second = await repo.advance(user_id, messages[2])
+    assert second.after == first.up_to
+
+    cursor = await repo.get(chat_id, user_id)
+    assert cursor.last_read_message_id == messages[2].id
+
+
+@pytest.mark.asyncio
+async def test_get_reader_ids(db_session):
+    repo = ReadCursorRepository(db_session)
+    chat_id = uuid4()
+    messages = await create_messages(db_session, chat_id, 3)
+    early_reader, late_reader = uuid4(), uuid4()
+
+    await repo.advance(early_reader, messages[0])
+    await repo.advance(late_reader, messages[2])
+
+    assert set(await repo.get_reader_ids(messages[0])) == {early_reader, late_reader}
+    assert await repo.get_reader_ids(messages[1]) == [late_reader]
+
+
+@pytest.mark.asyncio
+async def test_count_unread_excludes_own_messages(db_session):
+    repo = ReadCursorRepository(db_session)
+    chat_id, user_id = uuid4(), uuid4()
+    messages = await create_messages(db_session, chat_id, 4)
+    await create_messages(db_session, chat_id, 2, sender_id=user_id)
+
+    assert await repo.count_unread(chat_id, user_id) == 4
+
+    await repo.advance(user_id, messages[1])
+
+    assert await repo.count_unread(chat_id, user_id) == 2
+
+
+@pytest.mark.asyncio
+async def test_move_to_latest(db_session):
+    repo = ReadCursorRepository(db_session)
+    chat_id, user_id = uuid4(), uuid4()
+    messages = await create_messages(db_session, chat_id, 3)
+
+    await repo.move_to_latest(chat_id, user_id)
+
+    assert await repo.count_unread(chat_id, user_id) == 0
+    assert (await repo.get(chat_id, user_id)).last_read_message_id == messages[-1].id
+
+
+@pytest.mark.asyncio
+async def test_advance_continues_from_cursor_created_concurrently(db_session):
+    repo = ReadCursorRepository(db_session)
+    chat_id, user_id = uuid4(), uuid4()
+    messages = await create_messages(db_session, chat_id, 3)
+    await repo.advance(user_id, messages[0])
+
+    # The other read created the cursor after this one looked for it.
+    get = repo.get
+    lookups = []
+
+    async def racing_get(*args, **kwargs):
+        lookups.append(args)
+        return None if len(lookups) == 1 else await get(*args, **kwargs)
+
+    repo.get = racing_get
+    read_range = await repo.advance(user_id, messages[2])
+
+    assert read_range.after.message_id == messages[0].id
+    assert read_range.up_to.message_id == messages[2].id
+    cursor = await get(chat_id, user_id)
+    assert cursor.last_read_message_id == messages[2].id
@@ -0,0 +1,80 @@
+from uuid import uuid4
+
+import pytest
+
+from app.infrastructure.jwt_service import JWTService, UserTokenPayload
+from app.models import User
+from app.services.auth_cache import AuthCache
+
+
+class CountingVerifier:
+    def __init__(self):
+        self.jwt = JWTService()
+        self.calls = 0
+
+    def __call__(self, token):
+        self.calls += 1
+        return self.jwt.verify_token(token)
+
+
+def make_user():
+    return User(id=uuid4(), name="Ann", email="ann@x.com", password="hash")
+
+
+@pytest.mark.asyncio
+async def test_cached_user_is_a_fresh_copy(make_loader):
+    cache = AuthCache()
+    user = make_user()
+    load = make_loader(user)
+
+    first = await cache.user(user.id, load)
+    second = await cache.user(user.id, load)
+
+    assert load.calls == 1
+    assert first is not second and second is not user
+    assert (second.id, second.name, second.email) == (user.id, "Ann", "ann@x.com")
+
+
+@pytest.mark.asyncio
+async def test_missing_user_is_not_cached(make_loader):
+    cache = AuthCache()
+    load = make_loader(None)
+    user_id = uuid4()
+
+    assert await cache.user(user_id, load) is None
+    assert await cache.user(user_id, load) is None
+    assert load.calls == 2
+
+
+def test_verified_tokens_are_reused():
+    cache = AuthCache()
+    verify = CountingVerifier()
+    token = verify.jwt.create_token(UserTokenPayload(sub=str(uuid4()), name="Ann"))
+
+    first = cache.verify(token, verify)
+    second = cache.verify(token, verify)
+
+    assert first == second
+    assert verify.calls == 1
+
+
+def test_cached_token_is_not_used_past_exp(clock):
+    cache = AuthCache(wall_clock=clock)
+    verify = CountingVerifier()
+    token = verify.jwt.create_token(UserTokenPayload(sub=str(uuid4()), name="Ann"))
+
+    payload = cache.verify(token, verify)
+    clock.now = payload.exp + 1
+    cache.verify(token, verify)
+
+    assert verify.calls == 2
+
+
+def test_invalid_token_is_not_cached():
+    cache = AuthCache()
+    verify = CountingVerifier()
+
+    for _ in range(2):
+        with pytest.raises(ValueError):
+            cache.verify("not-a-token", verify)
+    assert verify.calls == 2
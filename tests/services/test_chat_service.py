@@ -8,6 +8,7 @@ from app.models.chat import ChatType
 from app.models.group import group_members
 from app.repositories.message_repository import MessageRepository
 from app.services.chat_service import ChatService
+from app.services.membership_cache import MembershipCache
 
 
 @pytest.mark.asyncio
@@ -62,23 +63,28 @@ async def test_get_or_create_private_chat_create(db_session):
     assert chat2.id == chat.id
 
 
+@pytest.mark.asyncio
+async def test_get_or_create_private_chat_without_messages(db_session):
+    service = ChatService(db_session)
+
+    user1 = User(id=uuid4(), name="Carol", email="carol@test.com", password="123")
+    user2 = User(id=uuid4(), name="Dan", email="dan@test.com", password="456")
+
+    chat = await service.get_or_create_private_chat(user1, user2)
+    again = await service.get_or_create_private_chat(user2, user1)
+
+    assert again.id == chat.id
+    assert await service.has_access_to_chat(chat, user1.id)
+    assert await service.has_access_to_chat(chat, user2.id)
+
+
 @pytest.mark.asyncio
 async def test_get_user_private_chats(db_session):
     service = ChatService(db_session)
-    message_repo = MessageRepository(db_session)
 
     user = User(id=uuid4(), name="User", email="u@t.com", password="pass")
-    chat = await service.repo.create(Chat(name="priv", type=ChatType.private))
-
-    await message_repo.create(
-        Message(
-            id=uuid4(),
-            chat_id=chat.id,
-            sender_id=user.id,
-            text="hello",
-            timestamp=datetime.now(),
-        )
-    )
+    other = User(id=uuid4(), name="Other", email="o@t.com", password="pass")
+    chat = await service.get_or_create_private_chat(user, other)
 
     chats = await service.get_user_private_chats(user.id)
     assert len(chats) == 1
@@ -92,9 +98,10 @@ async def test_get_all_user_chats(db_session):
 
     user = User(id=uuid4(), name="Full", email="full@x.com", password="pw")
 
-    priv = await service.repo.create(Chat(name="private", type=ChatType.private))
+    other = User(id=uuid4(), name="Other", email="other@x.com", password="pw")
+    priv = await service.get_or_create_private_chat(user, other)
 
-    await message_repo.create(
+    priv_message = await message_repo.create(
         Message(
             id=uuid4(),
             chat_id=priv.id,
@@ -103,6 +110,7 @@ async def test_get_all_user_chats(db_session):
             timestamp=datetime.now() - timedelta(minutes=2),
         )
     )
+    await service.repo.record_last_message(priv_message)
 
     group_chat = await service.repo.create(Chat(name="group", type=ChatType.public))
     group = Group(name="grp", chat_id=group_chat.id, owner_id=uuid4())
@@ -113,7 +121,7 @@ async def test_get_all_user_chats(db_session):
         group_members.insert().values(group_id=group.id, user_id=user.id)
     )
 
-    await message_repo.create(
+    group_message = await message_repo.create(
         Message(
             id=uuid4(),
             chat_id=group_chat.id,
@@ -122,31 +130,36 @@ async def test_get_all_user_chats(db_session):
             timestamp=datetime.now(),
         )
     )
+    await service.repo.record_last_message(group_message)
+
+    quiet_chat = await service.repo.create(Chat(name="quiet", type=ChatType.public))
+    quiet = Group(name="quiet", chat_id=quiet_chat.id, owner_id=uuid4())
+    db_session.add(quiet)
+    await db_session.flush()
+    await db_session.execute(
+        group_members.insert().values(group_id=quiet.id, user_id=user.id)
+    )
 
     await db_session.commit()
 
     chats = await service.get_all_user_chats(user.id)
-    assert len(chats) == 2
-    assert chats[0].last_message_timestamp >= chats[1].last_message_timestamp
+    assert [chat.id for chat in chats] == [group_chat.id, priv.id, quiet_chat.id]
+    assert chats[0].last_message_preview == "group msg"
+    assert chats[2].last_message_timestamp is None
+
+    page = await service.get_all_user_chats(user.id, offset=1, limit=1)
+    assert [chat.id for chat in page] == [priv.id]
 
 
 @pytest.mark.asyncio
 async def test_has_access_to_chat(db_session):
     service = ChatService(db_session)
-    message_repo = MessageRepository(db_session)
 
-    user_id = uuid4()
+    user = User(id=uuid4(), name="Eve", email="eve@x.com", password="pw")
+    other = User(id=uuid4(), name="Fay", email="fay@x.com", password="pw")
+    user_id = user.id
 
-    priv = await service.repo.create(Chat(name="p", type=ChatType.private))
-    await message_repo.create(
-        Message(
-            id=uuid4(),
-            chat_id=priv.id,
-            sender_id=user_id,
-            text="yo",
-            timestamp=datetime.now(),
-        )
-    )
+    priv = await service.get_or_create_private_chat(user, other)
 
     group_chat = await service.repo.create(Chat(name="g", type=ChatType.public))
     group = Group(name="g2", chat_id=group_chat.id, owner_id=uuid4())
@@ -162,3 +175,24 @@ async def test_has_access_to_chat(db_session):
     assert await service.has_access_to_chat(priv, uuid4()) is False
     assert await service.has_access_to_chat(group_chat, user_id) is True
     assert await service.has_access_to_chat(group_chat, uuid4()) is False
+
+
+@pytest.mark.asyncio
+async def test_has_access_to_group_chat_uses_membership_cache(db_session):
+    membership = MembershipCache()
+    service = ChatService(db_session, membership)
+    user_id = uuid4()
+
+    group_chat = await service.repo.create(Chat(name="g", type=ChatType.public))
+    group = Group(name="cached", chat_id=group_chat.id, owner_id=uuid4())
+    db_session.add(group)
+    await db_session.flush()
+    await db_session.execute(
+        group_members.insert().values(group_id=group.id, user_id=user_id)
+    )
+    await db_session.commit()
+
+    assert await service.has_access_to_chat(group_chat, user_id) is True
+    assert await service.has_access_to_chat(group_chat, str(user_id)) is True
+    assert await service.has_access_to_chat(group_chat, uuid4()) is False
+    assert membership.stats()["hits"] == 2
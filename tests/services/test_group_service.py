@@ -1,9 +1,11 @@
+from datetime import datetime
 from uuid import uuid4
 
 import pytest
 
-from app.models import User
+from app.models import Message, User
 from app.services.group_service import GroupService
+from app.services.membership_cache import MembershipCache
 
 
 @pytest.mark.asyncio
@@ -101,3 +103,75 @@ async def test_get_by_id_and_chat_id(db_session):
 
     fetched2 = await service.get_by_chat_id(group.chat_id)
     assert fetched2.id == group.id
+
+
+@pytest.mark.asyncio
+async def test_member_count_follows_membership(db_session):
+    service = GroupService(db_session)
+    owner = User(id=uuid4(), name="Owner", email="c@x.com", password="pw")
+    group = await service.create_group("Counted", owner)
+    user_ids = [uuid4(), uuid4()]
+
+    for uid in user_ids:
+        await service.add_member(group.id, uid)
+    await service.add_member(group.id, user_ids[0])
+    await service.remove_member(group.id, user_ids[1])
+    await service.remove_member(group.id, user_ids[1])
+
+    group = await service.get_by_id(group.id)
+    assert group.member_count == 2
+
+
+@pytest.mark.asyncio
+async def test_add_members_moves_read_cursors_to_latest(db_session):
+    service = GroupService(db_session)
+    owner = User(id=uuid4(), name="Owner", email="d@x.com", password="pw")
+    group = await service.create_group("Bulk", owner)
+    message = await service.message_repo.create(
+        Message(
+            chat_id=group.chat_id,
+            sender_id=owner.id,
+            text="before joining",
+            timestamp=datetime.now(),
+        )
+    )
+    user_ids = [uuid4() for _ in range(3)]
+
+    added = await service.add_members(group.id, [owner.id, *user_ids])
+
+    assert sorted(added) == sorted(user_ids)
+    for user_id in user_ids:
+        cursor = await service.read_cursors.get(group.chat_id, user_id)
+        assert cursor.last_read_message_id == message.id
+        assert await service.read_cursors.count_unread(group.chat_id, user_id) == 0
+
+
+@pytest.mark.asyncio
+async def test_remove_members_keeps_owner(db_session):
+    service = GroupService(db_session)
+    owner = User(id=uuid4(), name="Owner", email="e@x.com", password="pw")
+    group = await service.create_group("Bulk", owner)
+    user_ids = [uuid4(), uuid4()]
+    await service.add_members(group.id, user_ids)
+
+    removed = await service.remove_members(group.id, [owner.id, *user_ids])
+
+    assert sorted(removed) == sorted(user_ids)
+    assert await service.list_members_id(group.id) == [owner.id]
+
+
+@pytest.mark.asyncio
+async def test_membership_changes_invalidate_cache(db_session):
+    service = GroupService(db_session, MembershipCache())
+    owner = User(id=uuid4(), name="Owner", email="f@x.com", password="pw")
+    group = await service.create_group("Cached", owner)
+    await service.publish_membership_changes()
+    user_id = uuid4()
+
+    assert await service.get_member_ids(group.chat_id) == {owner.id}
+
+    await service.add_members(group.id, [user_id])
+    assert await service.get_member_ids(group.chat_id) == {owner.id}
+
+    await service.publish_membership_changes()
+    assert await service.get_member_ids(group.chat_id) == {owner.id, user_id}
@@ -0,0 +1,35 @@
+from uuid import uuid4
+
+import pytest
+
+from app.services.membership_cache import MembershipCache
+
+
+@pytest.mark.asyncio
+async def test_members_expire_after_ttl(clock, make_loader):
+    cache = MembershipCache(ttl=10, clock=clock)
+    chat_id = uuid4()
+    load = make_loader([uuid4()])
+
+    await cache.members(chat_id, load)
+    clock.now = 11
+    await cache.members(chat_id, load)
+
+    assert load.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_fill_racing_an_invalidation_is_dropped(make_loader):
+    cache = MembershipCache()
+    chat_id = uuid4()
+    stale = [uuid4()]
+
+    async def load_while_member_leaves(_):
+        cache.apply(chat_id)
+        return stale
+
+    assert await cache.members(chat_id, load_while_member_leaves) == frozenset(stale)
+
+    load = make_loader([])
+    assert await cache.members(chat_id, load) == frozenset()
+    assert load.calls == 1
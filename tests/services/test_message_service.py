@@ -10,7 +10,10 @@ from app.repositories.chat_repository import ChatRepository
 from app.repositories.group_repository import GroupRepository
 from app.repositories.message_repository import MessageRepository
 from app.services.group_service import GroupService
+from app.services.membership_cache import MembershipCache
 from app.services.message_service import MessageService
+from app.services.recent_messages_cache import RecentMessagesCache
+from app.services.recent_sends_cache import RecentSendsCache
 from app.services.socket_event_service import SocketEventService
 from app.ws.enums import WebSocketEventType
 
@@ -18,10 +21,14 @@ from app.ws.enums import WebSocketEventType
 class FakeSocketService(SocketEventService):
     def __init__(self):
         self.sent = []
+        self.chat_events = []
 
     async def send_notification(self, user_id, event):
         self.sent.append((user_id, event))
 
+    async def send_chat_event_except_sender(self, chat_id, sender_id, event):
+        self.chat_events.append((chat_id, sender_id, event))
+
 
 @pytest.mark.asyncio
 async def test_create_message_success(db_session):
@@ -41,24 +48,116 @@ async def test_create_message_success(db_session):
 
 
 @pytest.mark.asyncio
-async def test_create_message_duplicate(db_session):
+async def test_create_message_updates_chat_summary(db_session):
     service = MessageService(
         db_session,
         group_service=GroupService(db_session),
         socket_service=FakeSocketService(),
     )
+    chat = await ChatRepository(db_session).create(
+        Chat(name="summary", type=ChatType.private)
+    )
 
-    msg = Message(
-        chat_id=uuid4(), sender_id=uuid4(), text="Duplicate", timestamp=datetime.now()
+    msg = await service.create_message(
+        Message(
+            chat_id=chat.id, sender_id=uuid4(), text="Latest", timestamp=datetime.now()
+        )
     )
 
-    await service.repo.create(msg)
+    assert chat.last_message_id == msg.id
+    assert chat.last_message_at == msg.timestamp
+    assert chat.last_message_sender_id == msg.sender_id
+    assert chat.last_message_preview == "Latest"
+
+
+@pytest.mark.asyncio
+async def test_create_message_duplicate(db_session):
+    service = MessageService(
+        db_session,
+        group_service=GroupService(db_session),
+        socket_service=FakeSocketService(),
+        sends=RecentSendsCache(),
+    )
+    chat_id, sender_id = uuid4(), uuid4()
+
+    msg = await service.create_message(
+        Message(
+            chat_id=chat_id,
+            sender_id=sender_id,
+            text="Duplicate",
+            timestamp=datetime.now(),
+        )
+    )
+    await service.publish_new_message(msg)
 
     with pytest.raises(HTTPException) as e:
-        await service.create_message(msg)
+        await service.create_message(
+            Message(
+                chat_id=chat_id,
+                sender_id=sender_id,
+                text="Duplicate",
+                timestamp=datetime.now(),
+            )
+        )
     assert e.value.status_code == 429
 
 
+@pytest.mark.asyncio
+async def test_create_message_retry_returns_original(db_session):
+    socket_service = FakeSocketService()
+    service = MessageService(
+        db_session,
+        group_service=GroupService(db_session),
+        socket_service=socket_service,
+        sends=RecentSendsCache(),
+    )
+    chat_id, sender_id = uuid4(), uuid4()
+
+    def attempt():
+        return Message(
+            chat_id=chat_id,
+            sender_id=sender_id,
+            text="Same",
+            timestamp=datetime.now(),
+            client_message_id="retry-1",
+        )
+
+    first = attempt()
+    assert await service.create_message(first) is first
+    await service.publish_new_message(first)
+
+    retry = attempt()
+    original = await service.create_message(retry)
+    assert original is not retry
+    assert original.id == first.id
+    assert service.sends.keys.stats()["hits"] == 1
+    assert len(socket_service.chat_events) == 1
+
+
+@pytest.mark.asyncio
+async def test_create_message_retry_falls_back_to_unique_key(db_session):
+    service = MessageService(
+        db_session,
+        group_service=GroupService(db_session),
+        socket_service=FakeSocketService(),
+    )
+    chat_id, sender_id = uuid4(), uuid4()
+
+    def attempt():
+        return Message(
+            chat_id=chat_id,
+            sender_id=sender_id,
+            text="Same",
+            timestamp=datetime.now(),
+            client_message_id="retry-2",
+        )
+
+    first = await service.create_message(attempt())
+    # Another worker, or a restart, has no cached key for the retry.
+    original = await service.create_message(attempt())
+    assert original.id == first.id
+
+
 @pytest.mark.asyncio
 async def test_get_chat_messages(db_session):
     service = MessageService(
@@ -130,42 +229,321 @@ async def test_mark_as_read_not_group(db_session):
     assert socket_service.sent[0][1].type == WebSocketEventType.MESSAGE_READ
 
 
-@pytest.mark.asyncio
-async def test_mark_as_read_by_all(db_session):
-    socket_service = FakeSocketService()
-    group_service = GroupService(db_session)
-    chat_repo = ChatRepository(db_session)
+async def create_group_chat(db_session, member_count):
+    chat = await ChatRepository(db_session).create(
+        Chat(name="chat", type=ChatType.public)
+    )
     group_repo = GroupRepository(db_session)
-    message_repo = MessageRepository(db_session)
-
-    chat = await chat_repo.create(Chat(name="chat", type=ChatType.public))
     group = await group_repo.create(Group(name="g", chat_id=chat.id, owner_id=uuid4()))
-
-    user_ids = [uuid4(), uuid4(), uuid4()]
+    user_ids = [uuid4() for _ in range(member_count)]
     for uid in user_ids:
         await group_repo.add_member(group.id, uid)
+    return group, user_ids
+
+
+@pytest.mark.asyncio
+async def test_mark_as_read_by_all(db_session):
+    socket_service = FakeSocketService()
+    group, user_ids = await create_group_chat(db_session, 25)
+    service = MessageService(
+        db_session,
+        group_service=GroupService(db_session),
+        socket_service=socket_service,
+    )
 
-    msg = await message_repo.create(
+    msg = await service.create_message(
         Message(
-            chat_id=chat.id,
+            chat_id=group.chat_id,
             sender_id=user_ids[0],
             text="readable",
             timestamp=datetime.now(),
         )
     )
+    assert msg.readers_needed == 24
+
+    for uid in user_ids[1:-1]:
+        await service.mark_as_read(msg.id, uid)
+    assert not socket_service.sent
+
+    await service.mark_as_read(msg.id, user_ids[-1])
+
+    assert len(socket_service.sent) == 1
+    assert socket_service.sent[0][0] == user_ids[0]
+    assert socket_service.sent[0][1].type == WebSocketEventType.MESSAGE_READ_BY_ALL
+
+    await service.mark_as_read(msg.id, user_ids[0])
+    assert len(socket_service.sent) == 1
 
+
+@pytest.mark.asyncio
+async def test_read_up_to_reports_every_fully_read_message(db_session):
+    socket_service = FakeSocketService()
+    group, (sender, reader) = await create_group_chat(db_session, 2)
+    service = MessageService(
+        db_session,
+        group_service=GroupService(db_session),
+        socket_service=socket_service,
+    )
+    messages = [
+        await service.create_message(
+            Message(
+                chat_id=group.chat_id,
+                sender_id=sender,
+                text=f"msg-{i}",
+                timestamp=datetime(2025, 1, 1, 12, 0, i),
+            )
+        )
+        for i in range(3)
+    ]
+
+    await service.mark_as_read(messages[-1].id, reader)
+
+    reported = {event.data.message_id for _, event in socket_service.sent}
+    assert reported == {m.id for m in messages}
+
+
+@pytest.mark.asyncio
+async def test_member_leaving_completes_read_by_all(db_session):
+    socket_service = FakeSocketService()
+    group, (sender, reader, leaver) = await create_group_chat(db_session, 3)
+    group_service = GroupService(db_session)
     service = MessageService(
         db_session, group_service=group_service, socket_service=socket_service
     )
+    msg = await service.create_message(
+        Message(
+            chat_id=group.chat_id,
+            sender_id=sender,
+            text="hello",
+            timestamp=datetime.now(),
+        )
+    )
 
-    for uid in user_ids[1:]:
-        await message_repo.save_read_status(msg.id, uid)
+    await group_service.remove_member(group.id, leaver)
+    await service.mark_as_read(msg.id, reader)
 
-    await service.mark_as_read(msg.id, user_ids[0])
+    assert socket_service.sent[-1][1].type == WebSocketEventType.MESSAGE_READ_BY_ALL
 
-    members = await group_service.list_members_id(group.id)
-    readers = await message_repo.get_readers(msg.id)
 
-    assert set(members).issubset(set(readers))
-    assert socket_service.sent
+@pytest.mark.asyncio
+async def test_last_unread_member_leaving_sends_read_by_all(db_session):
+    socket_service = FakeSocketService()
+    group, (sender, reader, leaver) = await create_group_chat(db_session, 3)
+    group_service = GroupService(db_session, socket_service=socket_service)
+    service = MessageService(
+        db_session, group_service=group_service, socket_service=socket_service
+    )
+    msgs = [
+        await service.create_message(
+            Message(
+                chat_id=group.chat_id,
+                sender_id=sender,
+                text=f"msg-{i}",
+                timestamp=datetime(2025, 1, 1, 12, 0, i),
+            )
+        )
+        for i in range(2)
+    ]
+    await service.mark_as_read(msgs[0].id, reader)
+    assert not socket_service.sent
+
+    await group_service.remove_member(group.id, leaver)
+    assert not socket_service.sent
+
+    await group_service.publish_membership_changes()
+    assert [
+        (user_id, event.type, event.data.message_id)
+        for user_id, event in socket_service.sent
+    ] == [(sender, WebSocketEventType.MESSAGE_READ_BY_ALL, msgs[0].id)]
+
+
+@pytest.mark.asyncio
+async def test_bulk_removal_releases_unread_messages(db_session):
+    group, (a, b, c, d, e) = await create_group_chat(db_session, 5)
+    group_service = GroupService(db_session)
+    service = MessageService(
+        db_session, group_service=group_service, socket_service=FakeSocketService()
+    )
+    messages = [
+        await service.create_message(
+            Message(
+                chat_id=group.chat_id,
+                sender_id=sender,
+                text=f"msg-{i}",
+                timestamp=datetime(2025, 1, 1, 12, 0, i),
+            )
+        )
+        for i, sender in enumerate([a, b, a])
+    ]
+    await service.mark_as_read(messages[1].id, c)
+    await service.mark_as_read(messages[2].id, d)
+
+    removed = await group_service.remove_members(group.id, [a, c, d, e, a])
+
+    assert sorted(removed) == sorted([a, c, d, e])
+    for message in messages:
+        await db_session.refresh(message)
+    # Same result as releasing the leavers one by one: a only for the message
+    # it did not send, c for what it had not read, d for nothing, e for all.
+    assert [m.readers_needed for m in messages] == [3, 2, 2]
+    assert [m.read_count for m in messages] == [2, 2, 1]
+
+
+@pytest.mark.asyncio
+async def test_publish_new_message_skips_sender(db_session):
+    socket_service = FakeSocketService()
+    service = MessageService(
+        db_session,
+        group_service=GroupService(db_session),
+        socket_service=socket_service,
+    )
+
+    msg = await service.create_message(
+        Message(chat_id=uuid4(), sender_id=uuid4(), text="hi", timestamp=datetime.now())
+    )
+    await service.publish_new_message(msg)
+
+    chat_id, sender_id, event = socket_service.chat_events[0]
+    assert (chat_id, sender_id) == (msg.chat_id, msg.sender_id)
+    assert event.type == WebSocketEventType.NEW_MESSAGE
+    assert event.data.message_id == msg.id
+
+
+@pytest.mark.asyncio
+async def test_mark_as_read_ignores_older_messages(db_session):
+    socket_service = FakeSocketService()
+    service = MessageService(
+        db_session,
+        group_service=GroupService(db_session),
+        socket_service=socket_service,
+    )
+    chat_id, reader_id = uuid4(), uuid4()
+    older = await service.repo.create(
+        Message(
+            chat_id=chat_id, sender_id=uuid4(), text="1", timestamp=datetime(2025, 1, 1)
+        )
+    )
+    newer = await service.repo.create(
+        Message(
+            chat_id=chat_id, sender_id=uuid4(), text="2", timestamp=datetime(2025, 1, 2)
+        )
+    )
+
+    await service.mark_as_read(newer.id, reader_id)
+    await service.mark_as_read(older.id, reader_id)
+
+    assert len(socket_service.sent) == 1
+    unread = await service.get_unread_count(chat_id, reader_id)
+    assert unread.unread_count == 0
+    assert unread.last_read_message_id == newer.id
+
+
+@pytest.mark.asyncio
+async def test_recent_messages_served_from_cache(db_session):
+    cache = RecentMessagesCache(size=3)
+    service = MessageService(
+        db_session,
+        group_service=GroupService(db_session),
+        socket_service=FakeSocketService(),
+        cache=cache,
+    )
+    user = User(id=uuid4(), name="Sender", email="cache@t.com", password="pw")
+    db_session.add(user)
+    await db_session.flush()
+
+    chat_id = uuid4()
+    for i in range(2):
+        await service.repo.create(
+            Message(
+                chat_id=chat_id,
+                sender_id=user.id,
+                text=f"m{i}",
+                timestamp=datetime(2024, 1, 1, 0, i),
+            )
+        )
+
+    assert [m.text for m in await service.get_recent_messages(chat_id, 3)] == [
+        "m0",
+        "m1",
+    ]
+    new = await service.create_message(
+        Message(
+            chat_id=chat_id,
+            sender_id=user.id,
+            text="m2",
+            timestamp=datetime(2024, 1, 1, 0, 2),
+        )
+    )
+    await service.publish_new_message(new, user.name)
+
+    assert [m.text for m in await service.get_chat_messages(chat_id)] == [
+        "m0",
+        "m1",
+        "m2",
+    ]
+    assert cache.stats()["misses"] == 1
+    assert cache.stats()["hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_first_page_of_long_chat_falls_back_to_db(db_session):
+    service = MessageService(
+        db_session,
+        group_service=GroupService(db_session),
+        socket_service=FakeSocketService(),
+        cache=RecentMessagesCache(size=2),
+    )
+    user = User(id=uuid4(), name="Sender", email="long@t.com", password="pw")
+    db_session.add(user)
+    await db_session.flush()
+
+    chat_id = uuid4()
+    for i in range(3):
+        await service.repo.create(
+            Message(
+                chat_id=chat_id,
+                sender_id=user.id,
+                text=f"m{i}",
+                timestamp=datetime(2024, 1, 1, 0, i),
+            )
+        )
+
+    assert [m.text for m in await service.get_recent_messages(chat_id, 2)] == [
+        "m1",
+        "m2",
+    ]
+    assert [m.text for m in await service.get_chat_messages(chat_id, 0, 2)] == [
+        "m0",
+        "m1",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_removed_member_read_does_not_count(db_session):
+    socket_service = FakeSocketService()
+    group, (sender, reader, waiting, leaver) = await create_group_chat(db_session, 4)
+    group_service = GroupService(db_session, MembershipCache())
+    service = MessageService(
+        db_session, group_service=group_service, socket_service=socket_service
+    )
+    msg = await service.create_message(
+        Message(
+            chat_id=group.chat_id,
+            sender_id=sender,
+            text="hello",
+            timestamp=datetime.now(),
+        )
+    )
+
+    await group_service.remove_member(group.id, leaver)
+    await group_service.publish_membership_changes()
+    await service.mark_as_read(msg.id, leaver)
+    await service.mark_as_read(msg.id, uuid4())
+    await service.mark_as_read(msg.id, reader)
+
+    assert not socket_service.sent
+    await db_session.refresh(msg)
+    assert (msg.read_count, msg.readers_needed) == (1, 2)
+
+    await service.mark_as_read(msg.id, waiting)
     assert socket_service.sent[-1][1].type == WebSocketEventType.MESSAGE_READ_BY_ALL
@@ -0,0 +1,52 @@
+import asyncio
+import threading
+
+import pytest
+
+from app.infrastructure.password_hasher import PasswordHasher, PasswordHasherBusy
+
+
+@pytest.mark.asyncio
+async def test_hash_and_verify():
+    hasher = PasswordHasher(workers=1)
+
+    hashed = await hasher.hash("secret")
+
+    assert hashed != "secret"
+    assert await hasher.verify("secret", hashed) is True
+    assert await hasher.verify("wrong", hashed) is False
+    stats = hasher.stats()
+    assert stats["hash_latency"]["count"] == 3
+    assert stats["pending"] == 0
+    hasher.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_hashing_does_not_block_event_loop():
+    hasher = PasswordHasher(workers=1)
+    release = threading.Event()
+    running = asyncio.create_task(hasher._run(release.wait, 5))
+
+    await asyncio.sleep(0.01)
+    assert not running.done()
+
+    release.set()
+    assert await running is True
+    hasher.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_full_queue_is_rejected():
+    hasher = PasswordHasher(workers=1, queue_limit=1)
+    release = threading.Event()
+    running = [asyncio.create_task(hasher._run(release.wait, 5)) for _ in range(2)]
+    await asyncio.sleep(0)
+
+    with pytest.raises(PasswordHasherBusy):
+        await hasher.hash("secret")
+
+    release.set()
+    await asyncio.gather(*running)
+    assert hasher.stats()["rejected"] == 1
+    assert hasher.stats()["pending"] == 0
+    hasher.shutdown()
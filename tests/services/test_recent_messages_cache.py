@@ -0,0 +1,130 @@
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+import pytest
+
+from app.core.cache import LRUCache
+from app.schemas.message import MessageDTO
+from app.services.recent_messages_cache import CachedChat, RecentMessagesCache
+from app.ws.backplane import LocalBackplane
+
+BASE = datetime(2024, 1, 1)
+
+
+def make_dto(chat_id, minute, text="hi"):
+    return MessageDTO(
+        id=uuid4(),
+        chat_id=chat_id,
+        sender_name="Sender",
+        text=text,
+        timestamp=BASE + timedelta(minutes=minute),
+        is_readed=False,
+    )
+
+
+def test_lru_cache_evicts_least_recently_used_over_byte_cap():
+    cache = LRUCache(max_bytes=30, size_of=len)
+    cache.set("a", "x" * 10)
+    cache.set("b", "x" * 10)
+    cache.get("a")
+    cache.set("c", "x" * 15)
+
+    assert "a" in cache and "c" in cache and "b" not in cache
+    assert cache.bytes == 25
+    assert cache.stats()["evictions"] == 1
+
+
+def test_lru_cache_counts_hits_and_misses():
+    cache = LRUCache(max_bytes=100, size_of=len)
+    cache.set("a", "x")
+    cache.get("a")
+    cache.get("b")
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["hit_ratio"]) == (1, 1, 0.5)
+
+
+def test_lru_cache_skips_values_larger_than_cap():
+    cache = LRUCache(max_bytes=5, size_of=len)
+    cache.set("a", "x" * 10)
+
+    assert len(cache) == 0 and cache.bytes == 0
+
+
+def test_append_adds_to_cached_chat_and_keeps_newest():
+    cache = RecentMessagesCache(size=2)
+    chat_id = uuid4()
+    first = make_dto(chat_id, 1)
+    cache.fill(chat_id, CachedChat((first,), True), cache.fill_token(chat_id))
+
+    second, third = make_dto(chat_id, 2), make_dto(chat_id, 3)
+    cache.append(second)
+    cache.append(second)
+    cache.append(third)
+
+    cached = cache.get(chat_id)
+    assert [m.id for m in cached.messages] == [second.id, third.id]
+    assert not cached.complete
+
+
+def test_append_ignores_uncached_chats():
+    cache = RecentMessagesCache(size=2)
+    message = make_dto(uuid4(), 1)
+    cache.append(message)
+
+    assert cache.get(message.chat_id) is None
+
+
+def test_fill_is_dropped_when_a_write_raced_it():
+    cache = RecentMessagesCache(size=2)
+    chat_id = uuid4()
+    token = cache.fill_token(chat_id)
+    cache.append(make_dto(chat_id, 1))
+    cache.fill(chat_id, CachedChat((), True), token)
+
+    assert cache.get(chat_id) is None
+
+
+@pytest.mark.asyncio
+async def test_add_goes_through_backplane():
+    backplane = LocalBackplane()
+    cache = RecentMessagesCache(size=5, backplane=backplane)
+    cache.subscribe_to(backplane)
+    chat_id = uuid4()
+    cache.fill(chat_id, CachedChat((), True), cache.fill_token(chat_id))
+
+    message = make_dto(chat_id, 1, text="over the wire")
+    await cache.add(message)
+
+    assert cache.get(chat_id).messages == (message,)
+
+
+@pytest.mark.asyncio
+async def test_invalidate_drops_chat_on_every_worker():
+    backplane = LocalBackplane()
+    caches = [RecentMessagesCache(size=5, backplane=backplane) for _ in range(2)]
+    chat_id = uuid4()
+    for cache in caches:
+        cache.subscribe_to(backplane)
+        cache.fill(chat_id, CachedChat((), True), cache.fill_token(chat_id))
+    token = caches[1].fill_token(chat_id)
+
+    await caches[0].invalidate([chat_id])
+
+    assert all(cache.get(chat_id) is None for cache in caches)
+    caches[1].fill(chat_id, CachedChat((), True), token)
+    assert caches[1].get(chat_id) is None
+
+
+def test_cached_chat_expires_after_ttl_even_when_updated(clock):
+    cache = RecentMessagesCache(size=5, ttl=10, clock=clock)
+    chat_id = uuid4()
+    cache.fill(chat_id, CachedChat((), True), cache.fill_token(chat_id))
+
+    clock.now = 9
+    cache.append(make_dto(chat_id, 1))
+    assert len(cache.get(chat_id).messages) == 1
+
+    clock.now = 10
+    assert cache.get(chat_id) is None
+    assert cache.stats()["entries"] == 0
@@ -0,0 +1,67 @@
+from datetime import datetime
+from uuid import uuid4
+
+from app.core.cache import TTLCache
+from app.models.message import Message
+from app.services.recent_sends_cache import RecentSendsCache
+
+
+def make_message(text="hi", client_message_id=None, sender_id=None, chat_id=None):
+    return Message(
+        id=uuid4(),
+        chat_id=chat_id or uuid4(),
+        sender_id=sender_id or uuid4(),
+        text=text,
+        timestamp=datetime.now(),
+        client_message_id=client_message_id,
+    )
+
+
+def test_ttl_cache_expires_entries(clock):
+    cache = TTLCache(ttl=10, max_entries=10, clock=clock)
+    cache.set("a", 1)
+    clock.now = 5
+    cache.set("b", 2)
+
+    clock.now = 10
+    assert cache.get("a") is None
+    assert cache.get("b") == 2
+    assert len(cache) == 1
+
+
+def test_ttl_cache_evicts_oldest_over_max_entries():
+    cache = TTLCache(ttl=10, max_entries=2)
+    for key in "abc":
+        cache.set(key, key)
+
+    assert cache.get("a") is None
+    assert cache.get("c") == "c"
+    stats = cache.stats()
+    assert (stats["entries"], stats["evictions"], stats["hit_ratio"]) == (2, 1, 0.5)
+
+
+def test_recent_sends_cache_maps_keys_per_sender():
+    sends = RecentSendsCache()
+    message = make_message(client_message_id="k1")
+    sends.record(message)
+
+    retry = make_message(client_message_id="k1", sender_id=message.sender_id)
+    other_sender = make_message(client_message_id="k1")
+    assert sends.original_id(retry) == message.id
+    assert sends.original_id(other_sender) is None
+    assert sends.original_id(make_message()) is None
+
+
+def test_recent_sends_cache_detects_same_text_within_window(clock):
+    sends = RecentSendsCache(duplicate_window=2)
+    sends.texts.clock = clock
+    message = make_message("hello")
+    sends.record(message)
+
+    same = make_message("hello", sender_id=message.sender_id, chat_id=message.chat_id)
+    other_chat = make_message("hello", sender_id=message.sender_id)
+    assert sends.is_duplicate_text(same)
+    assert not sends.is_duplicate_text(other_chat)
+
+    clock.now = 3
+    assert not sends.is_duplicate_text(same)
@@ -5,7 +5,7 @@ import pytest
 
 from app.schemas.base_event import WebSocketEvent
 from app.schemas.ws_payloads import ChatCreatedPayload
-from app.services.socket_event_service import SocketEventService
+from app.services.socket_event_service import NOTIFY_BATCH_SIZE, SocketEventService
 from app.ws.enums import WebSocketEventType
 
 
@@ -43,3 +43,42 @@ async def test_send_notification_calls_notification_manager():
 
     await service.send_notification(user_id, event)
     notification_manager.send_to_user.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_send_to_users_shares_one_frame():
+    chat_manager = AsyncMock()
+    notification_manager = AsyncMock()
+
+    service = SocketEventService(chat_manager, notification_manager)
+
+    event = WebSocketEvent(
+        type=WebSocketEventType.GROUP_UPDATED,
+        data={"chat_id": str(uuid4())},
+    )
+
+    await service.send_to_users([uuid4(), uuid4(), uuid4()], event)
+
+    frames = {
+        id(call.args[1]) for call in notification_manager.send_to_user.await_args_list
+    }
+    assert notification_manager.send_to_user.await_count == 3
+    assert len(frames) == 1
+
+
+@pytest.mark.asyncio
+async def test_send_to_users_publishes_in_batches():
+    backplane = AsyncMock()
+    service = SocketEventService(AsyncMock(), AsyncMock(), backplane)
+
+    event = WebSocketEvent(
+        type=WebSocketEventType.GROUP_UPDATED,
+        data={"chat_id": str(uuid4())},
+    )
+    user_ids = [uuid4() for _ in range(NOTIFY_BATCH_SIZE * 2 + 1)]
+
+    await service.send_to_users(user_ids, event)
+
+    batches = [call.args[1]["user_ids"] for call in backplane.publish.await_args_list]
+    assert [len(batch) for batch in batches] == [NOTIFY_BATCH_SIZE] * 2 + [1]
+    assert sum(batches, []) == [str(user_id) for user_id in user_ids]
@@ -1,12 +1,15 @@
 import pytest
 
+from app.repositories.user_repository import UserRepository
 from app.schemas.user import UserCreate
+from app.services.auth_cache import AuthCache
 from app.services.user_service import UserService
+from app.ws.backplane import LocalBackplane
 
 
 @pytest.mark.asyncio
-async def test_register_success(db_session):
-    service = UserService(db_session)
+async def test_register_success(db_session, password_hasher):
+    service = UserService(db_session, password_hasher)
     user_data = UserCreate(name="Test", email="test@example.com", password="secret")
 
     user = await service.register(user_data)
@@ -17,8 +20,8 @@ async def test_register_success(db_session):
 
 
 @pytest.mark.asyncio
-async def test_register_duplicate_email(db_session):
-    service = UserService(db_session)
+async def test_register_duplicate_email(db_session, password_hasher):
+    service = UserService(db_session, password_hasher)
     user_data = UserCreate(name="User", email="dupe@example.com", password="pw")
 
     await service.register(user_data)
@@ -28,8 +31,8 @@ async def test_register_duplicate_email(db_session):
 
 
 @pytest.mark.asyncio
-async def test_authenticate_success(db_session):
-    service = UserService(db_session)
+async def test_authenticate_success(db_session, password_hasher):
+    service = UserService(db_session, password_hasher)
     user_data = UserCreate(name="Auth", email="auth@example.com", password="mypassword")
 
     created = await service.register(user_data)
@@ -40,8 +43,8 @@ async def test_authenticate_success(db_session):
 
 
 @pytest.mark.asyncio
-async def test_authenticate_wrong_password(db_session):
-    service = UserService(db_session)
+async def test_authenticate_wrong_password(db_session, password_hasher):
+    service = UserService(db_session, password_hasher)
     user_data = UserCreate(
         name="WrongPW", email="wrongpw@example.com", password="rightpass"
     )
@@ -52,18 +55,44 @@ async def test_authenticate_wrong_password(db_session):
 
 
 @pytest.mark.asyncio
-async def test_authenticate_unknown_email(db_session):
-    service = UserService(db_session)
+async def test_authenticate_unknown_email(db_session, password_hasher):
+    service = UserService(db_session, password_hasher)
     user = await service.authenticate("notfound@example.com", "pw")
     assert user is None
 
 
 @pytest.mark.asyncio
-async def test_get_by_id(db_session):
-    service = UserService(db_session)
+async def test_get_by_id(db_session, password_hasher):
+    service = UserService(db_session, password_hasher)
     user_data = UserCreate(name="ById", email="byid@example.com", password="pw")
     user = await service.register(user_data)
 
     result = await service.get_by_id(user.id)
     assert result is not None
     assert result.id == user.id
+
+
+@pytest.mark.asyncio
+async def test_user_update_reaches_auth_cache_on_every_worker(
+    db_session, password_hasher
+):
+    backplane = LocalBackplane()
+    caches = [AuthCache(backplane=backplane) for _ in range(2)]
+    for cache in caches:
+        cache.subscribe_to(backplane)
+    service = UserService(db_session, password_hasher, caches[0])
+    user = await service.register(
+        UserCreate(name="Old", email="rename@example.com", password="pw")
+    )
+    # The same lookup get_current_user does on a cache miss.
+    load = UserRepository(db_session).get_by_id
+    for cache in caches:
+        await cache.user(user.id, load)
+
+    assert await service.update_name(user.id, "New") is True
+    assert await service.update_password(user.id, "new-pw") is True
+
+    for cache in caches:
+        cached = await cache.user(user.id, load)
+        assert cached.name == "New"
+        assert await password_hasher.verify("new-pw", cached.password)
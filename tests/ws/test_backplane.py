@@ -0,0 +1,95 @@
+import asyncio
+from datetime import datetime
+from unittest.mock import AsyncMock
+from uuid import uuid4
+
+import pytest
+
+from app.schemas.base_event import WebSocketEvent
+from app.services.socket_event_service import SocketEventService
+from app.ws.backplane import LocalBackplane, create_backplane
+from app.ws.backplane.postgres import (
+    MAX_NOTIFY_PAYLOAD,
+    PostgresBackplane,
+    split_payload,
+)
+from app.ws.backplane.serialization import dumps, loads
+from app.ws.enums import WebSocketEventType
+
+
+def test_serialization_round_trip():
+    message = {
+        "id": uuid4(),
+        "at": datetime(2025, 5, 17, 13, 7, 48),
+        "type": WebSocketEventType.NEW_MESSAGE,
+        "nested": [{"id": uuid4()}],
+    }
+
+    decoded = loads(dumps(message))
+
+    assert decoded["id"] == message["id"]
+    assert decoded["at"] == message["at"]
+    assert decoded["type"] == "NEW_MESSAGE"
+    assert decoded["nested"][0]["id"] == message["nested"][0]["id"]
+
+
+@pytest.mark.asyncio
+async def test_local_backplane_dispatches_to_subscribers():
+    backplane = LocalBackplane()
+    received = []
+    backplane.subscribe("topic", AsyncMock(side_effect=received.append))
+
+    await backplane.publish("topic", {"value": 1})
+    await backplane.publish("other", {"value": 2})
+
+    assert received == [{"value": 1}]
+
+
+@pytest.mark.asyncio
+async def test_socket_events_are_delivered_through_backplane():
+    backplane = LocalBackplane()
+    chat_manager = AsyncMock()
+    notification_manager = AsyncMock()
+
+    publisher = SocketEventService(AsyncMock(), AsyncMock(), backplane=backplane)
+    receiver = SocketEventService(chat_manager, notification_manager)
+    receiver.subscribe_to(backplane)
+
+    chat_id, sender_id = uuid4(), uuid4()
+    event = WebSocketEvent(
+        type=WebSocketEventType.NEW_MESSAGE, data={"chat_id": str(chat_id)}
+    )
+
+    await publisher.send_chat_event_except_sender(chat_id, sender_id, event)
+    await publisher.send_to_users([uuid4(), uuid4()], event)
+
+    args = chat_manager.send_to_others.await_args.args
+    assert args[:2] == (str(chat_id), str(sender_id))
+    assert args[2].payload["type"] == "NEW_MESSAGE"
+    assert notification_manager.send_to_user.await_count == 2
+    publisher.chat_manager.send_to_others.assert_not_awaited()
+
+
+def test_create_backplane_unknown_kind():
+    with pytest.raises(ValueError, match="Unknown backplane"):
+        create_backplane("redis")
+
+
+@pytest.mark.asyncio
+async def test_postgres_backplane_reassembles_chunked_payloads():
+    backplane = PostgresBackplane("postgresql://unused")
+    received = []
+    backplane.subscribe("topic", AsyncMock(side_effect=received.append))
+    message = {"text": "ё" * 5000, "id": uuid4()}
+
+    chunks = split_payload(dumps({"topic": "topic", "message": message}))
+    assert len(chunks) > 1
+    assert all(len(chunk.encode()) <= MAX_NOTIFY_PAYLOAD for chunk in chunks)
+
+    consumer = asyncio.create_task(backplane._consume())
+    for chunk in chunks:
+        backplane._on_notify(None, 0, "ws_backplane", chunk)
+    await asyncio.sleep(0.01)
+    consumer.cancel()
+
+    assert received == [message]
@@ -0,0 +1,111 @@
+import json
+from datetime import UTC, datetime
+from unittest.mock import AsyncMock, MagicMock
+from uuid import uuid4
+
+import msgpack
+import pytest
+from fastapi import WebSocketDisconnect
+
+from app.schemas.base_event import WebSocketEvent
+from app.schemas.ws_payloads import NewMessagePayload, TypingEventPayload
+from app.ws.codecs import json_codec, msgpack_codec, negotiate_codec
+from app.ws.enums import WebSocketEventType
+from app.ws.frames import EventFrame
+
+
+def make_event():
+    return WebSocketEvent[NewMessagePayload](
+        type=WebSocketEventType.NEW_MESSAGE,
+        data=NewMessagePayload(
+            message_id=uuid4(),
+            chat_id=uuid4(),
+            sender_id=uuid4(),
+            text="hello",
+            timestamp=datetime(2025, 5, 17, 13, 7, 48, 123000, tzinfo=UTC),
+        ),
+    )
+
+
+def make_websocket(subprotocols):
+    websocket = MagicMock()
+    websocket.scope = {"subprotocols": subprotocols}
+    return websocket
+
+
+def test_msgpack_encodes_uuid_as_bytes_and_timestamp_as_millis():
+    event = make_event()
+
+    decoded = msgpack.unpackb(EventFrame.from_event(event).encode(msgpack_codec))
+
+    assert decoded["type"] == "NEW_MESSAGE"
+    assert decoded["data"]["message_id"] == event.data.message_id.bytes
+    assert decoded["data"]["timestamp"] == 1747487268123
+
+
+def test_msgpack_payload_is_smaller_than_json():
+    frame = EventFrame.from_event(make_event())
+
+    assert len(frame.encode(msgpack_codec)) < len(frame.encode(json_codec).encode())
+
+
+def test_msgpack_round_trips_into_payload_models():
+    event = make_event()
+
+    decoded = msgpack_codec.decode(EventFrame.from_event(event).encode(msgpack_codec))
+    restored = WebSocketEvent[NewMessagePayload](**decoded)
+
+    assert restored.data == event.data
+
+
+def test_json_keeps_uuid_and_timestamp_as_strings():
+    event = make_event()
+
+    decoded = json.loads(EventFrame.from_event(event).encode(json_codec))
+
+    assert decoded["data"]["chat_id"] == str(event.data.chat_id)
+    assert decoded["data"]["timestamp"] == event.data.timestamp.isoformat()
+
+
+def test_decode_binary_uuid_into_payload():
+    chat_id = uuid4()
+    data = msgpack.packb({"chat_id": chat_id.bytes, "is_typing": True})
+
+    payload = TypingEventPayload(**msgpack_codec.decode(data))
+
+    assert payload.chat_id == chat_id
+
+
+@pytest.mark.parametrize(
+    "subprotocols, expected_codec, expected_subprotocol",
+    [
+        ([], json_codec, None),
+        (["msgpack"], msgpack_codec, "msgpack"),
+        (["unknown", "json"], json_codec, "json"),
+        (["msgpack", "json"], msgpack_codec, "msgpack"),
+    ],
+)
+def test_negotiate_codec(subprotocols, expected_codec, expected_subprotocol):
+    codec, subprotocol = negotiate_codec(make_websocket(subprotocols))
+
+    assert codec is expected_codec
+    assert subprotocol == expected_subprotocol
+
+
+@pytest.mark.asyncio
+async def test_receive_raises_disconnect():
+    websocket = MagicMock()
+    websocket.receive = AsyncMock(
+        return_value={"type": "websocket.disconnect", "code": 1001}
+    )
+
+    with pytest.raises(WebSocketDisconnect):
+        await msgpack_codec.receive(websocket)
+
+
+def test_msgpack_batch_is_an_array_of_events():
+    frames = [EventFrame({"n": i}) for i in range(3)]
+
+    data = msgpack_codec.encode_batch([f.encode(msgpack_codec) for f in frames])
+
+    assert msgpack.unpackb(data) == [{"n": 0}, {"n": 1}, {"n": 2}]
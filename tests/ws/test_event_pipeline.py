@@ -0,0 +1,118 @@
+import asyncio
+
+import pytest
+
+from app.ws.event_pipeline import EventPipeline
+
+
+@pytest.fixture
+async def pipeline():
+    pipeline = EventPipeline(workers=4, queue_size=8)
+    yield pipeline
+    await pipeline.stop()
+
+
+@pytest.mark.asyncio
+async def test_slow_event_does_not_block_the_next_one(pipeline):
+    release = asyncio.Event()
+    done = []
+
+    async def slow():
+        await release.wait()
+        done.append("slow")
+
+    async def fast():
+        done.append("fast")
+
+    await pipeline.submit(slow)
+    await pipeline.submit(fast)
+    await asyncio.sleep(0.01)
+
+    assert done == ["fast"]
+    release.set()
+    await pipeline.drain()
+    assert done == ["fast", "slow"]
+
+
+@pytest.mark.asyncio
+async def test_ordered_lane_runs_one_event_at_a_time(pipeline):
+    done = []
+
+    def job(n: int):
+        async def run():
+            await asyncio.sleep(0.005 * (3 - n))
+            done.append(n)
+
+        return run
+
+    for n in range(3):
+        await pipeline.submit(job(n), lane="conn")
+    await pipeline.drain()
+
+    assert done == [0, 1, 2]
+    assert pipeline.stats()["queued"] == 0
+
+
+@pytest.mark.asyncio
+async def test_submit_blocks_when_pipeline_is_full():
+    pipeline = EventPipeline(workers=1, queue_size=2)
+    release = asyncio.Event()
+
+    async def blocked():
+        await release.wait()
+
+    await pipeline.submit(blocked)
+    await pipeline.submit(blocked)
+    third = asyncio.create_task(pipeline.submit(blocked))
+    await asyncio.sleep(0.01)
+
+    assert not third.done()
+    release.set()
+    await third
+    await pipeline.drain()
+    await pipeline.stop()
+
+
+@pytest.mark.asyncio
+async def test_failed_event_keeps_worker_alive(pipeline):
+    done = []
+
+    async def broken():
+        raise RuntimeError("boom")
+
+    async def ok():
+        done.append(True)
+
+    await pipeline.submit(broken, lane="conn")
+    await pipeline.submit(ok, lane="conn")
+    await pipeline.drain()
+
+    assert done == [True]
+    assert pipeline.stats()["failed"] == 1
+
+
+@pytest.mark.asyncio
+async def test_flooding_source_does_not_block_other_sources():
+    pipeline = EventPipeline(workers=4, queue_size=8, per_source=2)
+    release = asyncio.Event()
+    done = []
+
+    async def blocked():
+        await release.wait()
+
+    async def fast():
+        done.append("fast")
+
+    await pipeline.submit(blocked, source="flood")
+    await pipeline.submit(blocked, source="flood")
+    third = asyncio.create_task(pipeline.submit(blocked, source="flood"))
+    await pipeline.submit(fast, source="other")
+    await asyncio.sleep(0.01)
+
+    assert not third.done()
+    assert done == ["fast"]
+    release.set()
+    await third
+    await pipeline.drain()
+    assert pipeline._sources == {}
+    await pipeline.stop()
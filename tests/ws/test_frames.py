@@ -0,0 +1,36 @@
+import json
+from datetime import datetime
+from uuid import uuid4
+
+from app.schemas.base_event import WebSocketEvent
+from app.schemas.ws_payloads import NewMessagePayload
+from app.ws.enums import WebSocketEventType
+from app.ws.frames import EventFrame
+
+
+def test_from_event_encodes_json():
+    message_id = uuid4()
+    timestamp = datetime(2025, 5, 17, 13, 7, 48)
+    event = WebSocketEvent[NewMessagePayload](
+        type=WebSocketEventType.NEW_MESSAGE,
+        data=NewMessagePayload(
+            message_id=message_id,
+            chat_id=uuid4(),
+            sender_id=uuid4(),
+            text="привет",
+            timestamp=timestamp,
+        ),
+    )
+
+    decoded = json.loads(EventFrame.from_event(event).text)
+
+    assert decoded["type"] == "NEW_MESSAGE"
+    assert decoded["data"]["message_id"] == str(message_id)
+    assert decoded["data"]["timestamp"] == timestamp.isoformat()
+    assert decoded["data"]["text"] == "привет"
+
+
+def test_text_is_encoded_once():
+    frame = EventFrame({"type": "READ", "data": {"message_id": uuid4()}})
+
+    assert frame.text is frame.text
@@ -0,0 +1,63 @@
+import asyncio
+import json
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.ws.heartbeat import HeartbeatReaper
+from app.ws.managers.chat_manager import ChatManager
+from app.ws.managers.notification_manager import NotificationManager
+
+
+def make_websocket():
+    ws = MagicMock()
+    ws.accept = AsyncMock()
+    ws.send_text = AsyncMock()
+    ws.close = AsyncMock()
+    return ws
+
+
+@pytest.fixture
+def managers():
+    ChatManager._instances.clear()
+    NotificationManager._instances.clear()
+    return ChatManager(), NotificationManager()
+
+
+@pytest.mark.asyncio
+async def test_run_once_pings_live_and_evicts_stale(managers):
+    chat_manager, notification_manager = managers
+    reaper = HeartbeatReaper(managers, interval=1, timeout=30)
+
+    live_ws, stale_chat_ws, stale_device_ws = (make_websocket() for _ in range(3))
+    live = await chat_manager.connect("chat1", "user1", live_ws)
+    stale_chat = await chat_manager.connect("chat1", "user2", stale_chat_ws)
+    stale_device = await notification_manager.connect("user3", stale_device_ws)
+    stale_chat.last_seen -= 60
+    stale_device.last_seen -= 60
+
+    assert reaper.run_once() == 2
+    await live.flush()
+    await asyncio.sleep(0)
+
+    assert list(chat_manager.active_connections["chat1"]) == ["user1"]
+    assert notification_manager.active_connections == {}
+    assert json.loads(live_ws.send_text.await_args.args[0])["type"] == "PING"
+    stale_chat_ws.close.assert_awaited_once()
+    stale_device_ws.close.assert_awaited_once()
+    assert reaper.stats()["evicted"] == 2
+    live.close()
+
+
+@pytest.mark.asyncio
+async def test_touch_keeps_connection_alive(managers):
+    chat_manager, _ = managers
+    reaper = HeartbeatReaper(managers, interval=1, timeout=30)
+
+    connection = await chat_manager.connect("chat1", "user1", make_websocket())
+    connection.last_seen -= 60
+    connection.touch()
+
+    assert reaper.run_once() == 0
+    assert chat_manager.stats()["connections"] == 1
+    connection.close()
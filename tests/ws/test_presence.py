@@ -0,0 +1,206 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+from uuid import uuid4
+
+import pytest
+
+from app.ws.backplane import LocalBackplane
+from app.ws.enums import WebSocketEventType
+from app.ws.managers.notification_manager import NotificationManager
+from app.ws.presence import PresenceTracker
+
+WATCHER, FRIEND, FLAPPY, LEAVER, USER = (str(uuid4()) for _ in range(5))
+
+
+def make_websocket():
+    ws = MagicMock()
+    ws.scope = {}
+    ws.query_params = {}
+    ws.accept = AsyncMock()
+    ws.send_text = AsyncMock()
+    return ws
+
+
+def make_tracker(backplane=None, grace=0.05):
+    NotificationManager._instances.clear()
+    manager = NotificationManager()
+    tracker = PresenceTracker(manager, backplane=backplane, offline_grace=grace)
+    tracker.attach()
+    return manager, tracker
+
+
+async def settle(*trackers):
+    for tracker in trackers:
+        await tracker.flush()
+    await asyncio.sleep(0)
+
+
+def presence_events(ws):
+    return [
+        call.args[0]
+        for call in ws.send_text.await_args_list
+        if WebSocketEventType.PRESENCE.value in call.args[0]
+    ]
+
+
+@pytest.fixture
+async def local():
+    manager, tracker = make_tracker()
+    yield manager, tracker
+    for connection in list(manager.connections()):
+        connection.close()
+    await tracker.stop()
+
+
+@pytest.mark.asyncio
+async def test_watchers_are_told_when_user_comes_online(local):
+    manager, tracker = local
+    watcher_ws = make_websocket()
+    await manager.connect(WATCHER, watcher_ws)
+    tracker.watch(WATCHER, [FRIEND])
+
+    await manager.connect(FRIEND, make_websocket())
+    await settle(tracker)
+
+    assert tracker.lookup([FRIEND])[0].online
+    events = presence_events(watcher_ws)
+    assert len(events) == 1 and '"online":true' in events[0]
+
+
+@pytest.mark.asyncio
+async def test_reconnect_within_grace_publishes_nothing(local):
+    manager, tracker = local
+    connection = await manager.connect(FLAPPY, make_websocket())
+    await settle(tracker)
+
+    for _ in range(5):
+        connection.close()
+        connection = await manager.connect(FLAPPY, make_websocket())
+    await asyncio.sleep(0.1)
+    await settle(tracker)
+
+    assert tracker.published == 1
+    assert tracker.lookup([FLAPPY])[0].online
+
+
+@pytest.mark.asyncio
+async def test_user_goes_offline_after_grace(local):
+    manager, tracker = local
+    connection = await manager.connect(LEAVER, make_websocket())
+    await settle(tracker)
+
+    connection.close()
+    await settle(tracker)
+    assert tracker.lookup([LEAVER])[0].online
+
+    await asyncio.sleep(0.1)
+    await settle(tracker)
+    assert not tracker.lookup([LEAVER])[0].online
+
+
+@pytest.mark.asyncio
+async def test_watch_is_capped_and_dropped_when_subscriber_leaves(local):
+    manager, tracker = local
+    connection = await manager.connect(WATCHER, make_websocket())
+
+    added = tracker.watch(WATCHER, [str(uuid4()) for _ in range(1500)])
+    assert len(added) == 1000
+    assert tracker.watch(WATCHER, [str(uuid4())]) == []
+
+    connection.close()
+    assert tracker.stats()["watched_users"] == 0
+
+
+@pytest.mark.asyncio
+async def test_presence_is_shared_across_workers():
+    backplane = LocalBackplane()
+    manager, worker_a = make_tracker(backplane)
+    worker_b = PresenceTracker(manager, backplane=backplane, offline_grace=0.05)
+    for tracker in (worker_a, worker_b):
+        tracker.subscribe_to(backplane)
+
+    # Two workers announce the same user; it stays online until both drop it.
+    worker_a._announce(USER, True)
+    worker_b._announce(USER, True)
+    await settle(worker_a, worker_b)
+    worker_a._announce(USER, False)
+    await settle(worker_a)
+    assert worker_b.lookup([USER])[0].online
+
+    worker_b._announce(USER, False)
+    await settle(worker_b)
+    assert not worker_a.lookup([USER])[0].online
+    await worker_a.stop()
+    await worker_b.stop()
+
+
+async def settle_rounds(*trackers, rounds=3):
+    for _ in range(rounds):
+        await settle(*trackers)
+
+
+def make_worker(manager, backplane, clock=None):
+    tracker = PresenceTracker(
+        manager,
+        backplane=backplane,
+        offline_grace=0.05,
+        heartbeat_interval=3600,
+        worker_timeout=30,
+        clock=clock or (lambda: 0.0),
+    )
+    tracker.subscribe_to(backplane)
+    return tracker
+
+
+@pytest.mark.asyncio
+async def test_late_worker_learns_who_is_online():
+    backplane = LocalBackplane()
+    manager, _ = make_tracker()
+    worker_a = make_worker(manager, backplane)
+    worker_a._announce(USER, True)
+    await settle(worker_a)
+
+    worker_b = make_worker(manager, backplane)
+    worker_b.start()
+    await settle_rounds(worker_a, worker_b)
+
+    assert worker_b.lookup([USER])[0].online
+    await worker_a.stop()
+    await worker_b.stop()
+
+
+@pytest.mark.asyncio
+async def test_users_of_a_silent_worker_go_offline(clock):
+    backplane = LocalBackplane()
+    manager, _ = make_tracker()
+    crashed = make_worker(manager, backplane, clock)
+    survivor = make_worker(manager, backplane, clock)
+    crashed._announce(USER, True)
+    await settle(crashed)
+    crashed._task.cancel()
+    assert survivor.lookup([USER])[0].online
+
+    clock.now = 31
+    await survivor.run_once()
+    await settle(survivor)
+
+    assert not survivor.lookup([USER])[0].online
+    assert survivor.stats()["workers"] == 0
+    await survivor.stop()
+
+
+@pytest.mark.asyncio
+async def test_heartbeat_mismatch_triggers_resync():
+    backplane = LocalBackplane()
+    manager, _ = make_tracker()
+    worker_a = make_worker(manager, backplane)
+    worker_b = make_worker(manager, backplane)
+    # The announcement for this user never made it over the backplane.
+    worker_a._announced.add(USER)
+
+    await worker_a.run_once()
+    await settle_rounds(worker_a, worker_b)
+
+    assert worker_b.lookup([USER])[0].online
+    await worker_a.stop()
+    await worker_b.stop()
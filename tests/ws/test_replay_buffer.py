@@ -0,0 +1,48 @@
+from uuid import uuid4
+
+from app.ws.frames import EventFrame
+from app.ws.replay_buffer import ReplayBuffer
+
+
+def new_message(message_id=None):
+    return EventFrame(
+        {"type": "NEW_MESSAGE", "data": {"message_id": message_id or uuid4()}}
+    )
+
+
+def test_since_returns_newer_messages():
+    buffer = ReplayBuffer(size=10)
+    frames = [new_message() for _ in range(4)]
+    for frame in frames:
+        buffer.record("chat1", frame)
+
+    assert buffer.since("chat1", frames[1].message_id) == frames[2:]
+    assert buffer.since("chat1", frames[-1].message_id) == []
+
+
+def test_since_unknown_message_returns_none():
+    buffer = ReplayBuffer(size=2)
+    frames = [new_message() for _ in range(3)]
+    for frame in frames:
+        buffer.record("chat1", frame)
+
+    assert buffer.since("chat1", frames[0].message_id) is None
+    assert buffer.since("chat2", frames[0].message_id) is None
+
+
+def test_only_new_messages_are_recorded():
+    buffer = ReplayBuffer()
+    buffer.record("chat1", EventFrame({"type": "USER_TYPING", "data": {}}))
+
+    assert buffer.recent("chat1") == []
+
+
+def test_least_recently_used_chat_is_evicted():
+    buffer = ReplayBuffer(max_chats=2)
+    buffer.record("chat1", new_message())
+    buffer.record("chat2", new_message())
+    buffer.record("chat1", new_message())
+    buffer.record("chat3", new_message())
+
+    assert len(buffer.recent("chat1")) == 2
+    assert buffer.recent("chat2") == []
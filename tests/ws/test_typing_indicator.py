@@ -0,0 +1,46 @@
+import asyncio
+
+import pytest
+
+from app.ws.typing_indicator import TypingThrottler
+
+
+@pytest.fixture
+def emitted():
+    return []
+
+
+@pytest.fixture
+def throttler(emitted):
+    async def emit(chat_id, user_id, is_typing):
+        emitted.append((chat_id, user_id, is_typing))
+
+    return TypingThrottler(emit=emit, window=0.05)
+
+
+@pytest.mark.asyncio
+async def test_first_event_is_sent_immediately(throttler, emitted):
+    await throttler.submit("chat1", "user1", True)
+
+    assert emitted == [("chat1", "user1", True)]
+
+
+@pytest.mark.asyncio
+async def test_burst_is_coalesced_into_latest_state(throttler, emitted):
+    for is_typing in (True, True, True, False, True, False):
+        await throttler.submit("chat1", "user1", is_typing)
+
+    assert emitted == [("chat1", "user1", True)]
+
+    await asyncio.sleep(0.08)
+
+    assert emitted == [("chat1", "user1", True), ("chat1", "user1", False)]
+
+
+@pytest.mark.asyncio
+async def test_users_are_throttled_independently(throttler, emitted):
+    await throttler.submit("chat1", "user1", True)
+    await throttler.submit("chat1", "user2", True)
+    await throttler.submit("chat2", "user1", True)
+
+    assert len(emitted) == 3